@@ -0,0 +1,43 @@
+"""notificationlogs queued index
+
+Revision ID: 0b7e4c2d9a51
+Revises: f2a9d41c6b38
+Create Date: 2026-03-02 10:41:17.302518
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4c2d9a51'
+down_revision: Union[str, Sequence[str], None] = 'f2a9d41c6b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notificationlogs_queued',
+            'notificationlogs',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'QUEUED'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notificationlogs_queued',
+            table_name='notificationlogs',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
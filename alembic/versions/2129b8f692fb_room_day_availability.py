@@ -0,0 +1,53 @@
+"""room day availability
+
+Revision ID: 2129b8f692fb
+Revises: c43f877e954a
+Create Date: 2026-02-16 18:34:12.907531
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2129b8f692fb'
+down_revision: Union[str, Sequence[str], None] = 'c43f877e954a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('room_day_availability',
+    sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total_slots', sa.Integer(), nullable=False),
+    sa.Column('free_slots', sa.Integer(), nullable=False),
+    sa.Column('min_price', sa.DECIMAL(), nullable=True),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('room_id', 'day', name='uq_room_day_availability_room_day')
+    )
+    # backfill from existing timeslots
+    op.execute("""
+        INSERT INTO room_day_availability (room_id, day, total_slots, free_slots, min_price)
+        SELECT ts.room_id,
+               date(timezone('UTC', ts.start_datetime)),
+               count(*),
+               count(*) FILTER (WHERE ts.status = 'AVAILABLE' AND b.id IS NULL),
+               min(ts.base_price) FILTER (WHERE ts.status = 'AVAILABLE' AND b.id IS NULL)
+        FROM timeslots ts
+        LEFT JOIN bookings b
+               ON b.timeslot_id = ts.id AND b.status IN ('PENDING_PAYMENTS', 'PAID')
+        GROUP BY ts.room_id, date(timezone('UTC', ts.start_datetime))
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('room_day_availability')
@@ -0,0 +1,59 @@
+"""hot query indexes
+
+Revision ID: 74a6e45dfbad
+Revises: ca8c3b832bac
+Create Date: 2026-01-12 11:02:41.530117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '74a6e45dfbad'
+down_revision: Union[str, Sequence[str], None] = 'ca8c3b832bac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    # timeslots(room_id, start_datetime) is already served by the btree behind
+    # uq_timeslot_unique_range (room_id, start_datetime, end_datetime).
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_bookings_user_id_created_at',
+            'bookings',
+            ['user_id', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_bookings_pending_expires_at',
+            'bookings',
+            ['expires_at'],
+            postgresql_include=['room_id'],
+            postgresql_where=sa.text("status = 'PENDING_PAYMENTS'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_bookings_pending_expires_at',
+            table_name='bookings',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_bookings_user_id_created_at',
+            table_name='bookings',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,66 @@
+"""payment webhook events
+
+Revision ID: 9c3d5e7f1a20
+Revises: 0b7e4c2d9a51
+Create Date: 2026-03-09 14:27:03.118342
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3d5e7f1a20'
+down_revision: Union[str, Sequence[str], None] = '0b7e4c2d9a51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    paymentstatus = postgresql.ENUM(name='paymentstatus', create_type=False)
+    op.create_table('payment_webhook_events',
+    sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('external_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', paymentstatus, nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('processed_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', name='uq_payment_webhook_events_event_id')
+    )
+    op.create_index(
+        'ix_payment_webhook_events_unprocessed',
+        'payment_webhook_events',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('processed_at IS NULL'),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_external_id',
+            'payments',
+            ['external_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_payments_external_id',
+            table_name='payments',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_index('ix_payment_webhook_events_unprocessed', table_name='payment_webhook_events', postgresql_where=sa.text('processed_at IS NULL'))
+    op.drop_table('payment_webhook_events')
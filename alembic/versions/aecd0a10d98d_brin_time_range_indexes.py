@@ -0,0 +1,61 @@
+"""brin time range indexes
+
+Revision ID: aecd0a10d98d
+Revises: 74a6e45dfbad
+Create Date: 2026-01-19 15:47:03.218844
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aecd0a10d98d'
+down_revision: Union[str, Sequence[str], None] = '74a6e45dfbad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Declarative partitioning is not possible here: bookings/payments/notificationlogs
+    # reference timeslots.id/bookings.id, and Postgres requires the partition key in every
+    # unique and exclusion constraint (timeslot_no_overlap_per_room, uq_bookings_timeslot_active).
+    # BRIN indexes give block-range pruning for the append-mostly time columns instead.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'brin_timeslots_start_datetime',
+            'timeslots',
+            ['start_datetime'],
+            postgresql_using='brin',
+            postgresql_with={'autosummarize': 'on'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'brin_bookings_created_at',
+            'bookings',
+            ['created_at'],
+            postgresql_using='brin',
+            postgresql_with={'autosummarize': 'on'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'brin_bookings_created_at',
+            table_name='bookings',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'brin_timeslots_start_datetime',
+            table_name='timeslots',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
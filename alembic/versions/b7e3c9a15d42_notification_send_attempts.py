@@ -0,0 +1,34 @@
+"""notification send attempts
+
+Revision ID: b7e3c9a15d42
+Revises: d4e8b2f61c93
+Create Date: 2026-10-19 15:20:07.318224
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9a15d42'
+down_revision: Union[str, Sequence[str], None] = 'd4e8b2f61c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('notificationlogs', 'notificationlogs_archive'):
+        op.add_column(table, sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False))
+        op.add_column(table, sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    # archived rows always carry their value over
+    op.alter_column('notificationlogs_archive', 'attempts', server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('notificationlogs_archive', 'notificationlogs'):
+        op.drop_column(table, 'next_attempt_at')
+        op.drop_column(table, 'attempts')
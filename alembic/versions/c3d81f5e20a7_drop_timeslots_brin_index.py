@@ -0,0 +1,46 @@
+"""drop timeslots brin index
+
+Revision ID: c3d81f5e20a7
+Revises: e9f14c2b7a60
+Create Date: 2026-10-19 10:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d81f5e20a7'
+down_revision: Union[str, Sequence[str], None] = 'e9f14c2b7a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # timeslots.start_datetime is not correlated with heap order (slots are created ahead
+    # of time in any order, and archived space is reused), so the BRIN ranges overlap and
+    # prune nothing; uq_timeslot_unique_range (room_id, start_datetime, ...) and the
+    # timeslot_no_overlap_per_room GiST index already serve the time-range lookups.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'brin_timeslots_start_datetime',
+            table_name='timeslots',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'brin_timeslots_start_datetime',
+            'timeslots',
+            ['start_datetime'],
+            postgresql_using='brin',
+            postgresql_with={'autosummarize': 'on'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -0,0 +1,91 @@
+"""archive tables
+
+Revision ID: c43f877e954a
+Revises: aecd0a10d98d
+Create Date: 2026-02-02 10:21:55.604127
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c43f877e954a'
+down_revision: Union[str, Sequence[str], None] = 'aecd0a10d98d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    ]
+
+
+def _archived_at() -> sa.Column:
+    return sa.Column('archived_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bookingstatus = postgresql.ENUM(name='bookingstatus', create_type=False)
+    timeslotstatus = postgresql.ENUM(name='timeslotstatus', create_type=False)
+    paymentstatus = postgresql.ENUM(name='paymentstatus', create_type=False)
+    notificationlogtype = postgresql.ENUM(name='notificationlogtype', create_type=False)
+    notificationlogstatus = postgresql.ENUM(name='notificationlogstatus', create_type=False)
+
+    op.create_table('bookings_archive',
+    *_base_columns(),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('timeslot_id', sa.Integer(), nullable=False),
+    sa.Column('status', bookingstatus, nullable=False),
+    sa.Column('total_price', sa.DECIMAL(), nullable=False),
+    sa.Column('paid_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('canceled_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    _archived_at(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('timeslots_archive',
+    *_base_columns(),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('start_datetime', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('end_datetime', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('base_price', sa.DECIMAL(), nullable=False),
+    sa.Column('status', timeslotstatus, nullable=False),
+    _archived_at(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('payments_archive',
+    *_base_columns(),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('external_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', paymentstatus, nullable=False),
+    _archived_at(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('notificationlogs_archive',
+    *_base_columns(),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('type', notificationlogtype, nullable=False),
+    sa.Column('status', notificationlogstatus, nullable=False),
+    _archived_at(),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notificationlogs_archive')
+    op.drop_table('payments_archive')
+    op.drop_table('timeslots_archive')
+    op.drop_table('bookings_archive')
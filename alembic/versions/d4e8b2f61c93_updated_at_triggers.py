@@ -0,0 +1,58 @@
+"""updated_at triggers
+
+Revision ID: d4e8b2f61c93
+Revises: 9c3d5e7f1a20
+Create Date: 2026-10-19 11:02:41.503917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8b2f61c93'
+down_revision: Union[str, Sequence[str], None] = '9c3d5e7f1a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# BaseSQLModel.updated_at is declared server_onupdate, but nothing in the database
+# maintained it. clock_timestamp() rather than now(): a row updated twice in one
+# transaction, or by a transaction that started earlier, still moves forward.
+UPDATED_AT_TABLES = (
+    'users',
+    'locations',
+    'rooms',
+    'features',
+    'images',
+    'timeslots',
+    'bookings',
+    'payments',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at();"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(UPDATED_AT_TABLES):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at();")
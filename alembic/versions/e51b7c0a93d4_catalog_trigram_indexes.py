@@ -0,0 +1,56 @@
+"""catalog trigram indexes
+
+Revision ID: e51b7c0a93d4
+Revises: 2129b8f692fb
+Create Date: 2026-02-19 10:47:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e51b7c0a93d4'
+down_revision: Union[str, Sequence[str], None] = '2129b8f692fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = (
+    ('ix_rooms_name_trgm', 'rooms', 'name'),
+    ('ix_rooms_description_trgm', 'rooms', 'description'),
+    ('ix_locations_name_trgm', 'locations', 'name'),
+    ('ix_locations_address_trgm', 'locations', 'address'),
+    ('ix_locations_description_trgm', 'locations', 'description'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm;")
@@ -0,0 +1,28 @@
+"""outbox next_attempt_at
+
+Revision ID: e9f14c2b7a60
+Revises: b7e3c9a15d42
+Create Date: 2026-10-19 16:41:52.907135
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9f14c2b7a60'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c9a15d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('outbox_events', sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('outbox_events', 'next_attempt_at')
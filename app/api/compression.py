@@ -0,0 +1,105 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.compression import StreamCompressor, compress, negotiate_encoding, stream_compressor
+
+_UNCOMPRESSED_STATUSES = {204, 304}
+
+
+def _compressible(status: int, headers: MutableHeaders) -> bool:
+    if status < 200 or status in _UNCOMPRESSED_STATUSES:
+        return False
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith("text/") or "json" in content_type
+
+
+def request_encoding(request: Request) -> str | None:
+    """Coding to ask a cache for a precompressed body in, None when compression is off or not accepted."""
+    if not settings.COMPRESSION_ENABLED:
+        return None
+    return negotiate_encoding(request.headers.get("accept-encoding"))
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the client's preferred Accept-Encoding coding
+    (app.utils.compression: gzip, plus br/zstd when installed).
+
+    JSON and text bodies of at least COMPRESSION_MINIMUM_SIZE bytes are compressed;
+    smaller ones are not worth the CPU and the header overhead. Streaming responses
+    (several body messages, e.g. the admin exports) are compressed chunk by chunk
+    and keep streaming. Responses that already carry Content-Encoding - bodies
+    precompressed next to their cache entry - pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int | None = None) -> None:
+        self.app = app
+        self._minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding, self._minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._passthrough = False
+        self._stream: StreamCompressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._stream is not None:
+            body = self._stream.compress(body) if body else b""
+            if not more_body:
+                body += self._stream.finish()
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        # first body message: decide for the whole response
+        headers = MutableHeaders(raw=self._start["headers"])
+        if not _compressible(self._start["status"], headers) or (not more_body and len(body) < self._minimum_size):
+            self._passthrough = True
+            await self._send(self._start)
+            await self._send(message)
+            return
+
+        headers["content-encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            # the encoded bytes differ from the identity representation
+            headers["etag"] = f"W/{etag}"
+        if more_body:
+            del headers["content-length"]
+            self._stream = stream_compressor(self._encoding)
+            body = self._stream.compress(body) if body else b""
+        else:
+            body = compress(body, self._encoding)
+            headers["content-length"] = str(len(body))
+
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.schemas.version import SResourceVersion
+
+
+def version_headers(version: SResourceVersion | None, private: bool = False) -> dict[str, str]:
+    """
+    ETag / Last-Modified / Cache-Control for a representation: clients may keep it
+    but revalidate before every use. Weak ETag: the compression middleware may
+    change the bytes, never the data.
+    """
+    if version is None:
+        return {}
+    headers = {
+        "ETag": f'W/"{version.tag}"',
+        "Cache-Control": "private, no-cache" if private else "no-cache",
+    }
+    if version.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(version.last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _etag_matches(if_none_match: str, tag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == f'"{tag}"':
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(request: Request, version: SResourceVersion | None, private: bool = False) -> Response | None:
+    """
+    304 Not Modified when the request's validators match `version`, None when the
+    full response has to be built. If-None-Match takes precedence over
+    If-Modified-Since (RFC 9110).
+    """
+    if version is None:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, version.tag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        matched = (
+                if_modified_since is not None
+                and version.last_modified is not None
+                and _not_modified_since(if_modified_since, version.last_modified)
+        )
+
+    if not matched:
+        return None
+    return Response(status_code=304, headers=version_headers(version, private=private))
@@ -0,0 +1,251 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any
+
+from jose import JWTError, jwt
+from redis.asyncio import Redis
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.cache import keys
+from app.utils.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# POST endpoints that may be retried by clients
+IDEMPOTENT_ROUTES = (
+    re.compile(r"^/bookings$"),
+    re.compile(r"^/bookings/batch$"),
+    re.compile(r"^/bookings/\d+/payments$"),
+    re.compile(r"^/payments/\d+/confirm$"),
+)
+
+_IN_FLIGHT = "in_flight"
+_DONE = "done"
+# replayed as stored; content-length is recomputed
+_SKIPPED_HEADERS = {"content-length", "set-cookie"}
+
+
+def _owner(headers: Headers) -> str | None:
+    """
+    User id from a valid bearer token: keys are scoped per user, so one user
+    can never replay another user's response by guessing a key.
+    """
+    scheme, _, credentials = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return None
+    try:
+        payload = jwt.decode(credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    sub = payload.get("sub")
+    return str(sub) if sub is not None else None
+
+
+class IdempotencyMiddleware:
+    """
+    `Idempotency-Key` support for the POST endpoints in IDEMPOTENT_ROUTES.
+
+    The first request with a key marks it in flight in Redis (SET NX) and runs
+    normally; its response is stored for IDEMPOTENCY_TTL_SECONDS. A retry with the
+    same key and body gets the stored response back without reaching the handler
+    or Postgres. A duplicate that arrives while the first one is still running
+    waits up to IDEMPOTENCY_WAIT_SECONDS for its result, then gets 409. Reusing a
+    key for a different request is a 422. 5xx responses and crashed requests are
+    not stored, so the client can retry them.
+
+    Requests without a key or a valid bearer token, and all requests while Redis is
+    unavailable, pass through unchanged.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            ttl_seconds: int | None = None,
+            in_flight_ttl_seconds: int | None = None,
+            wait_seconds: float | None = None,
+            redis_client: Redis | None = None,
+    ) -> None:
+        self.app = app
+        self._ttl = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
+        self._in_flight_ttl = in_flight_ttl_seconds or settings.IDEMPOTENCY_IN_FLIGHT_TTL_SECONDS
+        self._wait_seconds = settings.IDEMPOTENCY_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        self._redis_client = redis_client
+
+    async def _client(self) -> Redis | None:
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            return await get_redis()
+        except Exception:
+            return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+                scope["type"] != "http"
+                or scope["method"] != "POST"
+                or not any(route.match(scope["path"]) for route in IDEMPOTENT_ROUTES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        owner = _owner(headers)
+        if not idempotency_key or owner is None:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"}, status_code=400
+            )(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        replay_receive = self._replay_body(body, receive)
+        fingerprint = hashlib.sha256(
+            b"\n".join([scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+        redis_key = f"{settings.REDIS_CACHE_PREFIX}{keys.idempotency(owner, idempotency_key)}"
+
+        client = await self._client()
+        try:
+            claimed = client is not None and await client.set(
+                redis_key,
+                json.dumps({"state": _IN_FLIGHT, "fingerprint": fingerprint}),
+                nx=True,
+                ex=self._in_flight_ttl,
+            )
+            existing = None if claimed or client is None else await self._wait_for_result(client, redis_key, fingerprint)
+        except Exception:
+            logger.warning("idempotency store unavailable, processing request without it", exc_info=True)
+            client, claimed, existing = None, False, None
+
+        if client is None:
+            await self.app(scope, replay_receive, send)
+            return
+
+        if not claimed:
+            await self._respond_existing(existing, fingerprint)(scope, receive, send)
+            return
+
+        await self._run_and_store(scope, replay_receive, send, client, redis_key, fingerprint)
+
+    async def _wait_for_result(self, client: Redis, redis_key: str, fingerprint: str) -> dict[str, Any] | None:
+        deadline = time.monotonic() + self._wait_seconds
+        delay = 0.02
+        while True:
+            raw = await client.get(redis_key)
+            record = json.loads(raw) if raw is not None else None
+            if record is None or record["state"] == _DONE or record["fingerprint"] != fingerprint:
+                return record
+            if time.monotonic() >= deadline:
+                return record
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    @staticmethod
+    def _respond_existing(record: dict[str, Any] | None, fingerprint: str) -> Response:
+        if record is None:
+            # the first request failed and released the key while we were waiting
+            return JSONResponse({"detail": "Previous request with this Idempotency-Key failed, retry"},
+                                status_code=409)
+        if record["fingerprint"] != fingerprint:
+            return JSONResponse({"detail": "Idempotency-Key was already used for a different request"},
+                                status_code=422)
+        if record["state"] != _DONE:
+            return JSONResponse({"detail": "A request with this Idempotency-Key is still being processed"},
+                                status_code=409)
+
+        response = Response(content=base64.b64decode(record["body"]), status_code=record["status"])
+        for name, value in record["headers"]:
+            response.headers.append(name, value)
+        response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    async def _run_and_store(
+            self,
+            scope: Scope,
+            receive: Receive,
+            send: Send,
+            client: Redis,
+            redis_key: str,
+            fingerprint: str,
+    ) -> None:
+        captured: dict[str, Any] = {"status": None, "headers": [], "body": bytearray()}
+
+        async def capture_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.decode("latin-1").lower() not in _SKIPPED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture_send)
+        except BaseException:
+            await self._forget(client, redis_key)
+            raise
+
+        if captured["status"] is None or captured["status"] >= 500:
+            await self._forget(client, redis_key)
+            return
+
+        record = {
+            "state": _DONE,
+            "fingerprint": fingerprint,
+            "status": captured["status"],
+            "headers": captured["headers"],
+            "body": base64.b64encode(bytes(captured["body"])).decode("ascii"),
+        }
+        try:
+            await client.set(redis_key, json.dumps(record), ex=self._ttl)
+        except Exception:
+            logger.warning("failed to store idempotent response for %s", redis_key, exc_info=True)
+
+    @staticmethod
+    async def _forget(client: Redis, redis_key: str) -> None:
+        try:
+            await client.delete(redis_key)
+        except Exception:
+            logger.warning("failed to release idempotency key %s", redis_key, exc_info=True)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    @staticmethod
+    def _replay_body(body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                # body already consumed: further messages (disconnect) come from the client
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay
@@ -0,0 +1,40 @@
+from typing import Any, Mapping
+
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse
+
+from app.schemas import RawJSON
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON rendered by pydantic-core in one pass.
+
+    Accepts DTOs (and lists/dicts of them) directly, so a route that already built
+    its response from BaseSchema models can return `FastJSONResponse(dtos)` and
+    skip FastAPI's response_model re-validation and jsonable_encoder walk; keep
+    `response_model` on the route for the OpenAPI schema. The output is byte-for-byte
+    what the default path produces for the same DTOs.
+
+    Only return it with trusted DTOs: nothing filters the fields, so an ORM object
+    passed here would be serialized as is. RawJSON content is sent unchanged, or
+    as its precompressed bytes with Content-Encoding when it carries them.
+    """
+
+    def __init__(
+            self,
+            content: Any,
+            status_code: int = 200,
+            headers: Mapping[str, str] | None = None,
+            media_type: str | None = None,
+            background: BackgroundTask | None = None,
+    ) -> None:
+        if isinstance(content, RawJSON) and content.encoded is not None:
+            headers = {**(headers or {}), "Content-Encoding": content.content_encoding, "Vary": "Accept-Encoding"}
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, RawJSON):
+            return content.encoded if content.encoded is not None else content.encode("utf-8")
+        return to_json(content)
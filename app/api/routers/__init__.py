@@ -1,5 +1,6 @@
 from .auth import router as auth_router
 from .bookings import router as bookings_router
+from .exports import router as exports_router
 from .locations import router as locations_router
 from .payments import router as payments_router
 from .rooms import router as rooms_router
@@ -11,5 +12,6 @@ __all__ = [
     rooms_router,
     timeslots_router,
     bookings_router,
-    payments_router
+    payments_router,
+    exports_router,
 ]
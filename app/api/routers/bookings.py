@@ -2,10 +2,15 @@ from typing import List
 
 from fastapi import APIRouter, Depends
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
+from app.api.conditional import not_modified, version_headers
 from app.api.deps import UserDepends
+from app.api.responses import FastJSONResponse
+from app.config import settings
 from app.models.booking import BookingStatus
-from app.schemas.booking import SBookingCreate, SBookingOutAfterCreate, SBookingOutWithTimeslots, \
+from app.schemas.booking import SBookingBatchCreate, SBookingCreate, SBookingOutAfterCreate, SBookingOutWithTimeslots, \
     SBookingFilters
 from app.schemas.payment import SPaymentOut
 from app.schemas.timeslot import STimeSlotFilters
@@ -28,37 +33,65 @@ async def create_booking_route(
     return await BookingsBusinessService(token_data=token_data).create_booking(booking_data)
 
 
+@router.post(
+    path="/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=List[SBookingOutAfterCreate],
+    description="Book several timeslots at once, all or nothing",
+)
+async def create_bookings_route(
+        booking_data: SBookingBatchCreate,
+        token_data: UserDepends
+) -> List[SBookingOutAfterCreate]:
+    return await BookingsBusinessService(token_data=token_data).create_bookings(booking_data)
+
+
 @router.get(
     path="",
     status_code=status.HTTP_200_OK,
     response_model=List[SBookingOutWithTimeslots],
+    response_class=FastJSONResponse,
     description="Get all user bookings with optional filters", )
 async def get_all_user_bookings(
         token_data: UserDepends,
         room_id: int | None = None,
         status: BookingStatus | None = None,
         timeslot_filters: STimeSlotFilters = Depends()
-) -> List[SBookingOutWithTimeslots]:
+) -> FastJSONResponse:
     booking_filters = SBookingFilters(
         room_id=room_id,
         status=status,
     )
-    return await BookingsBusinessService(token_data).get_my_bookings(
-        booking_filters=booking_filters,
-        timeslot_filters=timeslot_filters,
-    )
+    service = BookingsBusinessService(token_data)
+    if settings.POSTGRES_JSON_LISTS:
+        bookings = await service.get_my_bookings_json(
+            booking_filters=booking_filters,
+            timeslot_filters=timeslot_filters,
+        )
+    else:
+        bookings = await service.get_my_bookings(
+            booking_filters=booking_filters,
+            timeslot_filters=timeslot_filters,
+        )
+    return FastJSONResponse(bookings)
 
 
 @router.get(
     path="/{booking_id}",
     status_code=status.HTTP_200_OK,
     response_model=SBookingOutWithTimeslots,
+    response_class=FastJSONResponse,
     description="Get booking by ID", )
 async def get_booking_by_id_route(
+        request: Request,
         token_data: UserDepends,
         booking_id: int,
-) -> SBookingOutWithTimeslots:
-    return await BookingsBusinessService(token_data).get_booking_by_id(booking_id)
+) -> Response:
+    service = BookingsBusinessService(token_data)
+    version = await service.get_booking_version(booking_id)
+    if (unchanged := not_modified(request, version, private=True)) is not None:
+        return unchanged
+    return FastJSONResponse(await service.get_booking_by_id(booking_id), headers=version_headers(version, private=True))
 
 
 @router.post(
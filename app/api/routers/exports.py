@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Query
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from app.api.deps import AdminDepends
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.business.exports import ExportBusinessService
+
+router = APIRouter(prefix="/admin/exports", tags=["Exports"])
+
+_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+@router.get(
+    path="/{entity}",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Stream all bookings, payments or timeslots as NDJSON or CSV", )
+async def export_route(
+        entity: ExportEntity,
+        token_data: AdminDepends,
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        created_from: datetime | None = Query(None),
+        created_to: datetime | None = Query(None),
+) -> StreamingResponse:
+    chunks = ExportBusinessService(token_data).stream(
+        entity, export_format, created_from=created_from, created_to=created_to
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{export_format.value}"'},
+    )
@@ -2,8 +2,12 @@ from typing import List
 
 from fastapi import APIRouter
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
+from app.api.conditional import not_modified, version_headers
 from app.api.deps import AdminDepends
+from app.api.responses import FastJSONResponse
 from app.schemas.location import SLocationOut, SLocationCreate, SLocationUpdate
 from app.schemas.room import SRoomOut, SRoomCreate
 from app.services.business.locations import LocationBusinessService
@@ -15,10 +19,15 @@ router = APIRouter(prefix="/locations", tags=["Locations"])
 @router.get(
     path='',
     response_model=List[SLocationOut],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     description="Return all locations", )
-async def get_all_locations_route() -> List[SLocationOut]:
-    return await LocationBusinessService().get_all()
+async def get_all_locations_route(request: Request) -> Response:
+    service = LocationBusinessService()
+    version = await service.get_all_version()
+    if (unchanged := not_modified(request, version)) is not None:
+        return unchanged
+    return FastJSONResponse(await service.get_all(), headers=version_headers(version))
 
 
 @router.get(
@@ -60,11 +69,12 @@ async def delete_location_route(location_id: int, token_data: AdminDepends) -> N
 @router.get(
     path="/{location_id}/rooms",
     response_model=List[SRoomOut],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     description="Return all rooms by location id",
 )
-async def get_all_rooms_by_location_id_route(location_id: int) -> List[SRoomOut]:
-    return await LocationBusinessService().get_rooms_by_location_id(location_id=location_id)
+async def get_all_rooms_by_location_id_route(location_id: int) -> FastJSONResponse:
+    return FastJSONResponse(await LocationBusinessService().get_rooms_by_location_id(location_id=location_id))
 
 
 @router.post(
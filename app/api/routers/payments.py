@@ -1,12 +1,36 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from pydantic import ValidationError
 from starlette import status
 
 from app.api.deps import UserDepends
-from app.schemas.payment import SPaymentOut
+from app.schemas.payment import SPaymentOut, SPaymentWebhook, SPaymentWebhookAck
 from app.services.business.payments import PaymentBusinessService
+from app.utils.err.base.bad_request import BadRequestException
+from app.utils.err.payment import InvalidWebhookSignature
+from app.utils.security import verify_webhook_signature
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
+WEBHOOK_SIGNATURE_HEADER = "X-Webhook-Signature"
+
+
+@router.post(
+    path="/webhook",
+    response_model=SPaymentWebhookAck,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Provider payment callback",
+    description="Verify the HMAC signature, store the callback and acknowledge; it is applied asynchronously",
+)
+async def payment_webhook_route(request: Request) -> SPaymentWebhookAck:
+    body = await request.body()
+    if not verify_webhook_signature(body, request.headers.get(WEBHOOK_SIGNATURE_HEADER)):
+        raise InvalidWebhookSignature()
+    try:
+        event = SPaymentWebhook.model_validate_json(body)
+    except ValidationError:
+        raise BadRequestException("Invalid webhook payload")
+    return await PaymentBusinessService().accept_webhook(event)
+
 
 @router.post(
     path="/{payment_id}/confirm",
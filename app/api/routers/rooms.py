@@ -3,11 +3,25 @@ from typing import List
 
 from fastapi import APIRouter, Query
 from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
 
+from app.api.compression import request_encoding
+from app.api.conditional import not_modified, version_headers
 from app.api.deps import AdminDepends
-from app.schemas.room import SRoomOut, SRoomUpdate, SRoomOutWithLocation
-from app.schemas.timeslot import STimeSlotOut, STimeSlotDateRange, STimeSlotOutWithBookingStatus, STimeSlotCreate
+from app.api.responses import FastJSONResponse
+from app.config import settings
+from app.schemas.room import SRoomOut, SRoomUpdate, SRoomOutWithLocation, SRoomSearchPage
+from app.schemas.room_availability import SRoomDayAvailabilityOut
+from app.schemas.timeslot import (
+    SRoomTimeSlots,
+    STimeSlotCreate,
+    STimeSlotDateRange,
+    STimeSlotOut,
+    STimeSlotOutWithBookingStatus,
+)
 from app.services.business.rooms import RoomBusinessService
+from app.services.room import SEARCH_MIN_LENGTH
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
@@ -16,19 +30,57 @@ router = APIRouter(prefix="/rooms", tags=["Rooms"])
 @router.get(
     path='',
     response_model=list[SRoomOutWithLocation],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     description="Return all rooms", )
-async def get_all_rooms_route() -> list[SRoomOutWithLocation]:
-    return await RoomBusinessService().get_all_with_location()
+async def get_all_rooms_route(request: Request) -> Response:
+    service = RoomBusinessService()
+    version = await service.get_all_with_location_version()
+    if (unchanged := not_modified(request, version)) is not None:
+        return unchanged
+    return FastJSONResponse(await service.get_all_with_location(), headers=version_headers(version))
+
+
+@router.get(
+    path='/search',
+    response_model=SRoomSearchPage,
+    status_code=status.HTTP_200_OK,
+    description="Search active rooms by room and location name, address and description", )
+async def search_rooms_route(
+        q: str = Query(..., min_length=SEARCH_MIN_LENGTH, max_length=100),
+        page: int = Query(1, ge=1),
+        size: int = Query(20, ge=1, le=100),
+) -> SRoomSearchPage:
+    return await RoomBusinessService().search(query=q, page=page, size=size)
+
+
+@router.get(
+    path='/timeslots',
+    response_model=List[SRoomTimeSlots],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+    description="Return timeslots of several rooms by one date range", )
+async def get_rooms_timeslots_route(
+        room_ids: List[int] = Query(..., min_length=1, max_length=100),
+        date_from: datetime = Query(...),
+        date_to: datetime = Query(...),
+) -> FastJSONResponse:
+    date_range = STimeSlotDateRange(date_from=date_from, date_to=date_to)
+    return FastJSONResponse(await RoomBusinessService().get_timeslots_by_rooms_and_date_range(room_ids, date_range))
 
 
 @router.get(
     path='/{room_id}',
     response_model=SRoomOut,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     description="Return room by id", )
-async def get_room_by_id_route(room_id: int) -> SRoomOut:
-    return await RoomBusinessService().get_by_id(room_id=room_id)
+async def get_room_by_id_route(request: Request, room_id: int) -> Response:
+    service = RoomBusinessService()
+    version = await service.get_version(room_id)
+    if (unchanged := not_modified(request, version)) is not None:
+        return unchanged
+    return FastJSONResponse(await service.get_by_id(room_id=room_id), headers=version_headers(version))
 
 
 @router.patch(
@@ -51,15 +103,28 @@ async def delete_room_route(room_id: int, token_data: AdminDepends) -> None:
 @router.get(
     path='/{room_id}/timeslots',
     response_model=List[STimeSlotOutWithBookingStatus],
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     description="Return room timeslots by date range", )
 async def get_room_timeslots_route(
+        request: Request,
         room_id: int,
         date_from: datetime = Query(...),
         date_to: datetime = Query(...),
-) -> List[STimeSlotOutWithBookingStatus]:
+) -> Response:
     date_range = STimeSlotDateRange(date_from=date_from, date_to=date_to)
-    return await RoomBusinessService().get_timeslots_by_date_range_with_booking_flag(room_id, date_range)
+    version = await RoomBusinessService.get_timeslots_version(room_id, date_range)
+    if (unchanged := not_modified(request, version)) is not None:
+        return unchanged
+    if settings.POSTGRES_JSON_LISTS:
+        rendered = await RoomBusinessService().get_timeslots_json_by_date_range(
+            room_id, date_range, content_encoding=request_encoding(request)
+        )
+        return FastJSONResponse(rendered, headers=version_headers(version))
+    rendered = await RoomBusinessService().get_timeslots_body_by_date_range(
+        room_id, date_range, content_encoding=request_encoding(request)
+    )
+    return FastJSONResponse(rendered, headers=version_headers(version))
 
 
 @router.post(
@@ -69,3 +134,17 @@ async def get_room_timeslots_route(
     description="Create new room timeslot", )
 async def create_room_timeslot(room_id: int, timeslot_data: STimeSlotCreate, admin_data: AdminDepends) -> STimeSlotOut:
     return await RoomBusinessService().create_timeslot(room_id, timeslot_data)
+
+
+@router.get(
+    path='/{room_id}/calendar',
+    response_model=List[SRoomDayAvailabilityOut],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+    description="Return per-day availability summary of a room for one month", )
+async def get_room_calendar_route(
+        room_id: int,
+        year: int = Query(..., ge=2000, le=2100),
+        month: int = Query(..., ge=1, le=12),
+) -> FastJSONResponse:
+    return FastJSONResponse(await RoomBusinessService().get_month_availability(room_id, year, month))
@@ -1,13 +1,44 @@
-from fastapi import APIRouter
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+from fastapi import APIRouter, Query
 from starlette import status
 
 from app.api.deps import AdminDepends
-from app.schemas.timeslot import STimeSlotOut, STimeSlotUpdate
+from app.api.responses import FastJSONResponse
+from app.models.room import RoomType
+from app.schemas.timeslot import STimeSlotOut, STimeSlotSearch, STimeSlotSearchOut, STimeSlotUpdate
 from app.services.business.timeslots import TimeSlotBusinessService
 
 router = APIRouter(prefix="/timeslots", tags=["TimeSlots"])
 
 
+@router.get(
+    path='/search',
+    response_model=List[STimeSlotSearchOut],
+    response_class=FastJSONResponse,
+    status_code=status.HTTP_200_OK,
+    description="Return free timeslots across all matching rooms in a time window", )
+async def search_free_timeslots(
+        date_from: datetime = Query(...),
+        date_to: datetime = Query(...),
+        location_id: int | None = Query(None),
+        min_capacity: int | None = Query(None, ge=1),
+        room_type: RoomType | None = Query(None),
+        max_price: Decimal | None = Query(None, ge=0),
+) -> FastJSONResponse:
+    search = STimeSlotSearch(
+        date_from=date_from,
+        date_to=date_to,
+        location_id=location_id,
+        min_capacity=min_capacity,
+        room_type=room_type,
+        max_price=max_price,
+    )
+    return FastJSONResponse(await TimeSlotBusinessService().search_free_timeslots(search))
+
+
 @router.patch(
     path='/{timeslot_id}',
     response_model=STimeSlotOut,
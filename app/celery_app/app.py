@@ -38,6 +38,41 @@ def create_celery_app() -> Celery:
     )
     celery.conf.task_default_queue = "default"
     celery.conf.task_routes = {"app.celery_app.tasks.*": {"queue": "default"}}
+    celery.conf.beat_schedule = {
+        "archive-old-rows": {
+            "task": "app.maintenance.archive_old_rows",
+            "schedule": settings.ARCHIVE_INTERVAL_SECONDS,
+        },
+        "reconcile-room-availability": {
+            "task": "app.maintenance.reconcile_room_availability",
+            "schedule": settings.AVAILABILITY_RECONCILE_INTERVAL_SECONDS,
+            "options": {"expires": settings.AVAILABILITY_RECONCILE_INTERVAL_SECONDS},
+        },
+    }
+    celery.conf.beat_schedule["apply-payment-webhooks"] = {
+        "task": "app.payments.apply_webhooks",
+        "schedule": settings.PAYMENT_WEBHOOK_APPLY_INTERVAL_SECONDS,
+        "options": {"expires": settings.PAYMENT_WEBHOOK_APPLY_INTERVAL_SECONDS},
+    }
+    if settings.BOOKING_EXPIRY_ENGINE == "sweeper":
+        celery.conf.beat_schedule["sweep-expired-bookings"] = {
+            "task": "app.bookings.sweep_expired_bookings",
+            "schedule": settings.BOOKING_EXPIRY_SWEEP_INTERVAL_SECONDS,
+            # a missed run is covered by the next one
+            "options": {"expires": settings.BOOKING_EXPIRY_SWEEP_INTERVAL_SECONDS},
+        }
+    if settings.OUTBOX_ENABLED:
+        celery.conf.beat_schedule["relay-outbox"] = {
+            "task": "app.outbox.relay",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+            "options": {"expires": settings.OUTBOX_RELAY_INTERVAL_SECONDS},
+        }
+    if settings.NOTIFICATIONS_ENABLED:
+        celery.conf.beat_schedule["dispatch-notifications"] = {
+            "task": "app.notifications.dispatch",
+            "schedule": settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS,
+            "options": {"expires": settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS},
+        }
     return celery
 
 
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from celery import Task
+
+from app.celery_app.app import celery_app
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# sentinel that tells the publisher thread to exit after draining the queue
+_STOP = object()
+
+
+class PublishQueueFull(Exception):
+    """
+    The publish queue stayed full for the whole enqueue timeout.
+    """
+
+
+@dataclass
+class _Message:
+    task: Task
+    args: tuple | list | None
+    kwargs: dict | None
+    options: dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class TaskPublisher:
+    """
+    Publishes Celery messages from a dedicated thread.
+
+    Async request handlers only put a message on a bounded in-process queue; the
+    thread drains it in batches and sends them through one pooled kombu producer
+    per batch, so broker I/O never runs on the event loop or inside a request's DB
+    transaction. When the queue is full, `publish()` waits (asynchronously) for
+    room up to `enqueue_timeout` and then raises PublishQueueFull: a stalled broker
+    slows producers down instead of growing memory without bound.
+
+    A message the pooled producer fails to send is retried on a fresh connection
+    `publish_retries` times with exponential backoff before it is counted as
+    failed; dropped messages are logged with their task arguments, so an expiry or
+    a notification that never reached the broker can be replayed by hand.
+
+    Until `start()` is called, `publish()` falls back to a direct apply_async().
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 10_000,
+            enqueue_timeout: float = 1.0,
+            batch_size: int = 100,
+            publish_retries: int = 3,
+            retry_backoff: float = 0.2,
+    ) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._enqueue_timeout = enqueue_timeout
+        self._batch_size = batch_size
+        self._publish_retries = publish_retries
+        self._retry_backoff = retry_backoff
+        self._thread: threading.Thread | None = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "published": 0,
+            "retried": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_depth": 0,
+            "max_lag_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="celery-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Publish what is still queued, then stop the thread.
+        """
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    async def publish(self, task: Task, args: tuple | list | None = None, kwargs: dict | None = None,
+                      **options: Any) -> None:
+        """
+        Queue `task.apply_async(args, kwargs, **options)` for the publisher thread.
+        """
+        if not self.running:
+            task.apply_async(args=args, kwargs=kwargs, **options)
+            return
+
+        message = _Message(task=task, args=args, kwargs=kwargs, options=options)
+        deadline = time.monotonic() + self._enqueue_timeout
+        delay = 0.001
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                break
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    self._count("rejected")
+                    raise PublishQueueFull(f"publish queue is full ({self._queue.maxsize} messages)")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {**self._stats, "depth": self._queue.qsize(), "running": self.running}
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def _next_batch(self) -> tuple[list[_Message], bool]:
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return [], False
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        stop = False
+        while len(batch) < self._batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _publish_batch(self, batch: list[_Message]) -> None:
+        remaining = list(batch)
+        try:
+            with celery_app.producer_or_acquire() as producer:
+                while remaining:
+                    self._publish_one(remaining[0], producer)
+                    remaining.pop(0)
+        except Exception:
+            # the pooled producer is unusable: let apply_async open its own connection
+            logger.exception("producer pool failed, publishing %s messages one by one", len(remaining))
+            for message in remaining:
+                self._publish_with_retry(message)
+
+    def _publish_with_retry(self, message: _Message) -> None:
+        for attempt in range(self._publish_retries + 1):
+            if attempt:
+                self._count("retried")
+                time.sleep(self._retry_backoff * 2 ** (attempt - 1))
+            try:
+                self._publish_one(message, None)
+                return
+            except Exception:
+                logger.warning("failed to publish %s (attempt %s)", message.task.name, attempt + 1, exc_info=True)
+
+        self._count("failed")
+        logger.error(
+            "dropped %s after %s attempts: args=%r kwargs=%r options=%r",
+            message.task.name, self._publish_retries + 1, message.args, message.kwargs, message.options,
+        )
+
+    def _publish_one(self, message: _Message, producer) -> None:
+        message.task.apply_async(args=message.args, kwargs=message.kwargs, producer=producer, **message.options)
+        lag_ms = (time.monotonic() - message.enqueued_at) * 1000
+        with self._stats_lock:
+            self._stats["published"] += 1
+            self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], lag_ms)
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._publish_batch(batch)
+            if stop:
+                return
+
+
+task_publisher = TaskPublisher(
+    maxsize=settings.CELERY_PUBLISH_QUEUE_SIZE,
+    enqueue_timeout=settings.CELERY_PUBLISH_ENQUEUE_TIMEOUT_SECONDS,
+    publish_retries=settings.CELERY_PUBLISH_RETRIES,
+    retry_backoff=settings.CELERY_PUBLISH_RETRY_BACKOFF_SECONDS,
+)
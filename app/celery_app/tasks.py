@@ -1,16 +1,49 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Any
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
 
 from sqlalchemy import update
 
 from app.celery_app.app import celery_app
+from app.celery_app.worker_loop import worker_loop
+from app.config import settings
 from app.db import base as db_base
 from app.models.booking import Booking, BookingStatus
-from app.utils.cache.cache_service import CacheService
-from app.utils.cache import keys as cache_keys
+from app.models.notificationlog import NotificationLogType
+from app.models.outbox import OutboxTopic
+from app.models.payment import PaymentStatus
+from app.repositories.archive import ArchiveRepository
+from app.repositories.booking import BookingRepository
+from app.services.booking import BookingService
+from app.services.notificationlog import NotificationLogService
+from app.services.outbox import OutboxService
+from app.services.payment import PaymentService
+from app.services.payment_webhook import PaymentWebhookService
+from app.services.room_availability import (
+    RoomAvailabilityService,
+    recompute_room_days,
+    refresh_room_days,
+    room_days_from_payload,
+)
+from app.utils.cache import invalidate_room_timeslots
+from app.utils.notifications import NotificationTransport, get_notification_transport
+
+logger = logging.getLogger(__name__)
+
+
+async def _queue_expired_notifications(session, bookings: list[tuple[int, int]]) -> None:
+    """
+    Write BOOKING_EXPIRED notifications for (booking_id, user_id) pairs in one INSERT.
+    """
+    if not settings.NOTIFICATIONS_ENABLED:
+        return
+    notifications = NotificationLogService(session)
+    for booking_id, user_id in bookings:
+        notifications.queue(NotificationLogType.BOOKING_EXPIRED, user_id=user_id, booking_id=booking_id)
+    await notifications.flush()
 
 
 async def _expire_booking(booking_id: int) -> dict[str, Any]:
@@ -34,7 +67,7 @@ async def _expire_booking(booking_id: int) -> dict[str, Any]:
                 .where(Booking.status == BookingStatus.PENDING_PAYMENTS)
                 .where(Booking.expires_at <= datetime.now(timezone.utc))
                 .values(status=BookingStatus.EXPIRED)
-                .returning(Booking.id, Booking.room_id, Booking.status)
+                .returning(Booking.id, Booking.room_id, Booking.timeslot_id, Booking.status, Booking.user_id)
             )
             res = await session.execute(stmt)
             row = res.one_or_none()
@@ -42,11 +75,17 @@ async def _expire_booking(booking_id: int) -> dict[str, Any]:
                 await session.rollback()
                 return {"booking_id": booking_id, "status": "skipped_not_pending_or_not_expired"}
 
+            booking_id_db, room_id, timeslot_id, status, user_id = row
+            room_availability = RoomAvailabilityService(session)
+            room_days = await room_availability.get_days_for_timeslots([timeslot_id])
+            queued = await room_availability.queue_refresh(room_days)
+            await _queue_expired_notifications(session, [(booking_id_db, user_id)])
             await session.commit()
-            booking_id_db, room_id, status = row
 
+            if not queued:
+                await refresh_room_days(room_days)
             # Invalidate cached timeslots for the room
-            await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(room_id))
+            await invalidate_room_timeslots(room_id)
 
             return {"booking_id": booking_id_db, "status": status}
         except Exception as exc:
@@ -57,10 +96,501 @@ async def _expire_booking(booking_id: int) -> dict[str, Any]:
             return {"booking_id": booking_id, "status": "error", "detail": str(exc)}
 
 
+async def _expire_bookings(booking_ids: list[int]) -> dict[str, Any]:
+    """
+    Expire the bookings of one multi-slot request together: one UPDATE, one
+    availability refresh and one cache invalidation per room. Bookings that were
+    paid or canceled in the meantime are left alone.
+    """
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"booking_ids": booking_ids, "status": "skipped_no_engine"}
+
+    async with db_base.async_session_maker() as session:
+        try:
+            stmt = (
+                update(Booking)
+                .where(Booking.id.in_(booking_ids))
+                .where(Booking.status == BookingStatus.PENDING_PAYMENTS)
+                .where(Booking.expires_at <= datetime.now(timezone.utc))
+                .values(status=BookingStatus.EXPIRED)
+                .returning(Booking.room_id, Booking.timeslot_id, Booking.id, Booking.user_id)
+            )
+            rows = (await session.execute(stmt)).all()
+            room_availability = RoomAvailabilityService(session)
+            room_days = await room_availability.get_days_for_timeslots([row.timeslot_id for row in rows])
+            queued = await room_availability.queue_refresh(room_days)
+            if rows:
+                await _queue_expired_notifications(session, [(row.id, row.user_id) for row in rows])
+            await session.commit()
+        except Exception as exc:
+            try:
+                await session.rollback()
+            except Exception:
+                pass
+            return {"booking_ids": booking_ids, "status": "error", "detail": str(exc)}
+
+    if not queued:
+        await refresh_room_days(room_days)
+    room_ids = sorted({row.room_id for row in rows})
+    for room_id in room_ids:
+        await invalidate_room_timeslots(room_id)
+
+    return {"booking_ids": booking_ids, "status": "ok", "expired": len(rows), "rooms": room_ids}
+
+
+async def _sweep_expired_bookings(
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+) -> dict[str, Any]:
+    """
+    Sweeper expiry engine: expire every overdue PENDING_PAYMENTS booking in bounded
+    batches (one UPDATE ... RETURNING each, committed separately), then invalidate
+    the timeslot cache once per affected room.
+    """
+    batch_size = batch_size or settings.BOOKING_EXPIRY_SWEEP_BATCH_SIZE
+    max_batches = max_batches or settings.BOOKING_EXPIRY_SWEEP_MAX_BATCHES
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    expired = 0
+    batches = 0
+    room_ids: set[int] = set()
+    drained = False
+    while batches < max_batches:
+        async with db_base.async_session_maker() as session:
+            rows = await BookingRepository(session).expire_due_bookings(
+                now=datetime.now(timezone.utc), batch_size=batch_size
+            )
+            room_availability = RoomAvailabilityService(session)
+            room_days = await room_availability.get_days_for_timeslots(
+                [timeslot_id for _, timeslot_id, _, _ in rows]
+            )
+            queued = await room_availability.queue_refresh(room_days)
+            if rows:
+                await _queue_expired_notifications(
+                    session, [(booking_id, user_id) for _, _, booking_id, user_id in rows]
+                )
+            await session.commit()
+        if not queued:
+            await refresh_room_days(room_days)
+        batches += 1
+        expired += len(rows)
+        room_ids.update(room_id for room_id, _, _, _ in rows)
+        if len(rows) < batch_size:
+            drained = True
+            break
+
+    for room_id in sorted(room_ids):
+        await invalidate_room_timeslots(room_id)
+
+    if expired:
+        logger.info("expired %s bookings in %s batches across %s rooms", expired, batches, len(room_ids))
+    status = "ok" if drained else "partial"
+    return {"status": status, "expired": expired, "rooms": sorted(room_ids)}
+
+
+async def _publish_expire_booking(payload: dict[str, Any]) -> None:
+    await asyncio.to_thread(
+        expire_booking.apply_async,
+        args=[payload["booking_id"]],
+        eta=datetime.fromisoformat(payload["eta"]),
+    )
+
+
+async def _publish_expire_bookings(payload: dict[str, Any]) -> None:
+    await asyncio.to_thread(
+        expire_bookings.apply_async,
+        args=[payload["booking_ids"]],
+        eta=datetime.fromisoformat(payload["eta"]),
+    )
+
+
+async def _refresh_room_days(payload: dict[str, Any]) -> None:
+    await recompute_room_days(room_days_from_payload(payload))
+
+
+OUTBOX_HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[None]]] = {
+    OutboxTopic.EXPIRE_BOOKING.value: _publish_expire_booking,
+    OutboxTopic.EXPIRE_BOOKINGS.value: _publish_expire_bookings,
+    OutboxTopic.REFRESH_ROOM_DAYS.value: _refresh_room_days,
+}
+
+
+async def _relay_outbox(
+        batch_size: int | None = None,
+        max_batches: int = 50,
+) -> dict[str, Any]:
+    """
+    Perform side effects recorded in the outbox, oldest first, one batch per transaction.
+    Delivery is at-least-once: an event is marked published in the same transaction
+    that claimed it, so a crash before commit replays it. Handlers must be idempotent
+    (expire_booking is). A failing event keeps its place with attempts + 1 until
+    OUTBOX_MAX_ATTEMPTS, and is not claimed again before its exponential backoff
+    (OUTBOX_RETRY_BACKOFF_SECONDS doubled per attempt) has passed.
+    """
+    batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    published = 0
+    failed = 0
+    for _ in range(max_batches):
+        async with db_base.async_session_maker() as session:
+            outbox = OutboxService(session)
+            events = await outbox.claim_batch(batch_size=batch_size, max_attempts=settings.OUTBOX_MAX_ATTEMPTS)
+            done: list[int] = []
+            for event in events:
+                handler = OUTBOX_HANDLERS.get(event.topic)
+                try:
+                    if handler is None:
+                        raise LookupError(f"no outbox handler for topic {event.topic!r}")
+                    await handler(event.payload)
+                except Exception as exc:
+                    logger.warning("outbox event %s (%s) failed: %s", event.id, event.topic, exc)
+                    await outbox.mark_failed(event.id, str(exc), settings.OUTBOX_RETRY_BACKOFF_SECONDS)
+                    failed += 1
+                else:
+                    done.append(event.id)
+            await outbox.mark_published(done)
+            await session.commit()
+        published += len(done)
+        if len(events) < batch_size:
+            return {"status": "ok", "published": published, "failed": failed}
+
+    return {"status": "partial", "published": published, "failed": failed}
+
+
+async def _reconcile_room_availability(
+        days_ahead: int | None = None,
+        batch_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Recompute the availability summary of every (room, day) from today to
+    days_ahead, batch_size pairs per transaction. Repairs days a lost after-commit
+    refresh left stale; with the outbox enabled it is a safety net only.
+    """
+    days_ahead = settings.AVAILABILITY_RECONCILE_DAYS_AHEAD if days_ahead is None else days_ahead
+    batch_size = batch_size or settings.AVAILABILITY_RECONCILE_BATCH_SIZE
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    today = datetime.now(timezone.utc).date()
+    async with db_base.async_session_maker() as session:
+        room_days = await RoomAvailabilityService(session).get_days_between(today, today + timedelta(days=days_ahead))
+
+    for start in range(0, len(room_days), batch_size):
+        await recompute_room_days(room_days[start:start + batch_size])
+
+    return {"status": "ok", "days": len(room_days)}
+
+
+async def _dispatch_notifications(
+        batch_size: int | None = None,
+        max_batches: int = 50,
+        transport: NotificationTransport | None = None,
+) -> dict[str, Any]:
+    """
+    Send QUEUED notifications batch by batch: lease a batch in a short transaction
+    (SKIP LOCKED), send it through the transport with at most
+    NOTIFICATION_SEND_CONCURRENCY sends in flight and no transaction open, then
+    record the outcome in a second one: SENT, or back to the queue with backoff
+    until NOTIFICATION_MAX_ATTEMPTS, then FAILED.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+    transport = transport or get_notification_transport()
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    semaphore = asyncio.Semaphore(settings.NOTIFICATION_SEND_CONCURRENCY)
+
+    async def send(notification) -> bool:
+        async with semaphore:
+            try:
+                await transport.send(notification)
+            except Exception as exc:
+                logger.warning("notification %s (%s) failed: %s", notification.id, notification.type, exc)
+                return False
+            return True
+
+    sent = 0
+    retried = 0
+    failed = 0
+    for _ in range(max_batches):
+        async with db_base.async_session_maker() as session:
+            batch = await NotificationLogService(session).claim_queued(
+                batch_size, lease_seconds=settings.NOTIFICATION_LEASE_SECONDS
+            )
+            await session.commit()
+
+        results = await asyncio.gather(*(send(notification) for notification in batch))
+        ok = [notification.id for notification, result in zip(batch, results) if result]
+        bad = [notification.id for notification, result in zip(batch, results) if not result]
+
+        async with db_base.async_session_maker() as session:
+            notifications = NotificationLogService(session)
+            await notifications.mark_sent(ok)
+            gave_up = await notifications.mark_failed(
+                bad,
+                max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+                backoff_seconds=settings.NOTIFICATION_RETRY_BACKOFF_SECONDS,
+            )
+            await session.commit()
+        sent += len(ok)
+        retried += len(bad) - gave_up
+        failed += gave_up
+        if len(batch) < batch_size:
+            return {"status": "ok", "sent": sent, "retried": retried, "failed": failed}
+
+    return {"status": "partial", "sent": sent, "retried": retried, "failed": failed}
+
+
+async def _apply_payment_webhooks(
+        batch_size: int | None = None,
+        max_batches: int = 20,
+) -> dict[str, Any]:
+    """
+    Apply queued provider callbacks batch by batch, each batch in one transaction:
+    - keep the latest callback per Payment.external_id (redeliveries collapse)
+    - one UPDATE ... FROM (VALUES ...) for the payments, one for the bookings paid
+      before they expired
+    - BOOKING_PAID notifications, then the batch is marked processed
+    Callbacks for already final payments are marked processed as well. A callback
+    whose payment is not there yet (it can overtake the commit that stores it) is
+    left for later runs until PAYMENT_WEBHOOK_UNMATCHED_MAX_AGE_SECONDS, then dropped.
+    A SUCCESS for a booking that has expired meanwhile is logged for a refund.
+    """
+    batch_size = batch_size or settings.PAYMENT_WEBHOOK_APPLY_BATCH_SIZE
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    processed = 0
+    deferred = 0
+    payments = 0
+    paid = 0
+    late = 0
+    last_id = 0
+    for _ in range(max_batches):
+        async with db_base.async_session_maker() as session:
+            webhooks = PaymentWebhookService(session)
+            events = await webhooks.claim_batch(batch_size, after_id=last_id)
+
+            known = await PaymentService(session).get_known_external_ids(
+                list({event.external_id for event in events})
+            )
+            give_up_before = datetime.now(timezone.utc) - timedelta(
+                seconds=settings.PAYMENT_WEBHOOK_UNMATCHED_MAX_AGE_SECONDS
+            )
+            done = [event for event in events if event.external_id in known or event.created_at < give_up_before]
+
+            latest = {event.external_id: event for event in done if event.external_id in known}  # last one wins
+            updated = await PaymentService(session).apply_provider_statuses([
+                (event.external_id, event.status, event.created_at) for event in latest.values()
+            ])
+            succeeded = {
+                booking_id: received_at
+                for booking_id, status, received_at in updated
+                if status == PaymentStatus.SUCCESS
+            }
+            paid_bookings = await BookingService(session).set_bookings_paid(list(succeeded.items()))
+            if settings.NOTIFICATIONS_ENABLED and paid_bookings:
+                notifications = NotificationLogService(session)
+                for booking_id, user_id in paid_bookings:
+                    notifications.queue(NotificationLogType.BOOKING_PAID, user_id=user_id, booking_id=booking_id)
+                await notifications.flush()
+            await webhooks.mark_processed([event.id for event in done])
+            await session.commit()
+
+        late_bookings = sorted(succeeded.keys() - {booking_id for booking_id, _ in paid_bookings})
+        for booking_id in late_bookings:
+            logger.warning("booking %s was paid after it expired: the payment needs a refund", booking_id)
+        for event in done:
+            if event.external_id not in known:
+                logger.warning("dropped payment callback %s: no payment %s", event.event_id, event.external_id)
+
+        processed += len(done)
+        deferred += len(events) - len(done)
+        payments += len(updated)
+        paid += len(paid_bookings)
+        late += len(late_bookings)
+        result = {"processed": processed, "deferred": deferred, "payments": payments, "paid": paid, "late": late}
+        if len(events) < batch_size:
+            return {"status": "ok", **result}
+        last_id = events[-1].id
+
+    return {"status": "partial", **result}
+
+
+async def _archive_old_rows(
+        horizon_days: int | None = None,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        pause_seconds: float | None = None,
+) -> dict[str, Any]:
+    """
+    Move rows older than the horizon into the archive tables, batch by batch:
+    - CANCELED/EXPIRED bookings (with their payments and notification logs)
+    - past timeslots no booking points to anymore
+    - SENT/FAILED notification logs
+    and delete (no archive copy) outbox events published or given up more than
+    OUTBOX_RETENTION_DAYS ago and payment callbacks processed more than
+    PAYMENT_WEBHOOK_RETENTION_DAYS ago.
+
+    Each batch commits on its own, so an interrupted run loses nothing and the next
+    run simply continues. The pause between batches keeps replication lag and lock
+    pressure on the hot tables low. Every step gets its own max_batches budget, so a
+    backlog of bookings does not starve the other tables; the run is "partial" when
+    a step used up its budget before draining.
+    """
+    horizon_days = settings.ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    max_batches = max_batches or settings.ARCHIVE_MAX_BATCHES_PER_RUN
+    pause_seconds = settings.ARCHIVE_BATCH_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+
+    if db_base.async_session_maker is None:
+        db_base.init_engine(echo=False)
+
+    if db_base.async_session_maker is None:
+        return {"status": "skipped_no_engine"}
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=horizon_days)
+    outbox_older_than = datetime.now(timezone.utc) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    totals = {"bookings": 0, "payments": 0, "notificationlogs": 0, "timeslots": 0}
+    webhooks_processed_before = datetime.now(timezone.utc) - timedelta(days=settings.PAYMENT_WEBHOOK_RETENTION_DAYS)
+    purged = {"outbox_events": 0, "payment_webhook_events": 0}
+    batches = 0
+    pending: list[str] = []
+
+    async def run_batches(step, primary: str, counts: dict[str, int]) -> None:
+        nonlocal batches
+        for _ in range(max_batches):
+            async with db_base.async_session_maker() as session:
+                moved = await step(ArchiveRepository(session))
+                await session.commit()
+            batches += 1
+            for table, count in moved.items():
+                counts[table] += count
+            logger.info("archive batch %s: %s (totals %s, purged %s)", batches, moved, totals, purged)
+            if moved[primary] < batch_size:
+                return
+            await asyncio.sleep(pause_seconds)
+        # the last batch was full: there may be more left for the next run
+        pending.append(primary)
+
+    async def bookings_step(repo: ArchiveRepository) -> dict[str, int]:
+        return await repo.archive_dead_bookings(older_than, batch_size)
+
+    async def timeslots_step(repo: ArchiveRepository) -> dict[str, int]:
+        archived, room_days = await repo.archive_past_timeslots(older_than, batch_size)
+        # drops the summary rows of days that have no timeslot left
+        await RoomAvailabilityService(repo.session).refresh_days(room_days)
+        return {"timeslots": archived}
+
+    async def notificationlogs_step(repo: ArchiveRepository) -> dict[str, int]:
+        return {"notificationlogs": await repo.archive_notification_logs(older_than, batch_size)}
+
+    async def outbox_step(repo: ArchiveRepository) -> dict[str, int]:
+        return {"outbox_events": await repo.purge_outbox_events(
+            outbox_older_than, settings.OUTBOX_MAX_ATTEMPTS, batch_size
+        )}
+
+    async def webhooks_step(repo: ArchiveRepository) -> dict[str, int]:
+        return {"payment_webhook_events": await repo.purge_payment_webhook_events(
+            webhooks_processed_before, batch_size
+        )}
+
+    # bookings first: archiving them releases past timeslots
+    await run_batches(bookings_step, "bookings", totals)
+    await run_batches(timeslots_step, "timeslots", totals)
+    await run_batches(notificationlogs_step, "notificationlogs", totals)
+    await run_batches(outbox_step, "outbox_events", purged)
+    await run_batches(webhooks_step, "payment_webhook_events", purged)
+
+    status = "partial" if pending else "ok"
+    return {"status": status, "batches": batches, "archived": totals, "purged": purged, "pending": pending}
+
+
 @celery_app.task(name="app.bookings.expire_booking")
 def expire_booking(booking_id: int) -> dict[str, Any]:
     """
     Celery entrypoint for expiring bookings according to the spec.
     """
-    payload = asyncio.run(_expire_booking(booking_id))
-    return payload
+    return worker_loop.run(_expire_booking(booking_id))
+
+
+@celery_app.task(name="app.bookings.expire_bookings")
+def expire_bookings(booking_ids: list[int]) -> dict[str, Any]:
+    """
+    Celery entrypoint for expiring the bookings of one multi-slot request.
+    """
+    return worker_loop.run(_expire_bookings(booking_ids))
+
+
+@celery_app.task(name="app.bookings.sweep_expired_bookings")
+def sweep_expired_bookings() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for the sweeper expiry engine.
+    """
+    return worker_loop.run(_sweep_expired_bookings())
+
+
+@celery_app.task(name="app.maintenance.reconcile_room_availability")
+def reconcile_room_availability() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for recomputing the upcoming availability summary.
+    """
+    return worker_loop.run(_reconcile_room_availability())
+
+
+@celery_app.task(name="app.notifications.dispatch")
+def dispatch_notifications() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for the notification dispatcher.
+    """
+    return worker_loop.run(_dispatch_notifications())
+
+
+@celery_app.task(name="app.payments.apply_webhooks")
+def apply_payment_webhooks() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for applying queued payment provider callbacks.
+    """
+    return worker_loop.run(_apply_payment_webhooks())
+
+
+@celery_app.task(name="app.maintenance.archive_old_rows")
+def archive_old_rows() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for the retention/archival job.
+    """
+    return worker_loop.run(_archive_old_rows())
+
+
+@celery_app.task(name="app.outbox.relay")
+def relay_outbox() -> dict[str, Any]:
+    """
+    Celery beat entrypoint for the transactional outbox relay.
+    """
+    return worker_loop.run(_relay_outbox())
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Coroutine, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.config import settings
+from app.db import base as db_base
+from app.utils import redis as redis_utils
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def _drain_slow_query_log(coro: Awaitable[T]) -> T:
+    """
+    Await the task body and let pending slow query EXPLAIN captures finish
+    before asyncio.run() tears the loop down.
+    """
+    try:
+        return await coro
+    finally:
+        if db_base.slow_query_logger is not None:
+            await db_base.slow_query_logger.drain()
+
+
+class WorkerLoop:
+    """
+    One long-lived event loop per worker process, running in a daemon thread.
+
+    The DB engine pool and the Redis client are created on this loop once and reused
+    by every task, instead of being rebuilt (and bound to a dead loop) by a fresh
+    asyncio.run() per task. Sync Celery tasks hand their coroutine over with
+    run_coroutine_threadsafe() and block on the result.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        # a loop inherited through fork() belongs to the parent's thread, not to us
+        return self._loop is not None and self._pid == os.getpid() and self._loop.is_running()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="celery-worker-loop", daemon=True)
+            thread.start()
+            started.wait()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+
+        self.run(self._open_resources())
+        logger.info("worker event loop started in process %s", self._pid)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_resources(), loop).result(timeout)
+            except Exception:
+                logger.exception("failed to close worker resources")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+            self._loop = self._thread = self._pid = None
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine to completion from sync code.
+        Uses the persistent loop when it runs in this process, asyncio.run() otherwise
+        (eager mode, scripts, tests).
+        """
+        if not self.running:
+            return asyncio.run(_drain_slow_query_log(coro))
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @staticmethod
+    async def _open_resources() -> None:
+        db_base.init_engine(echo=False)
+        await redis_utils.init_redis()
+
+    @staticmethod
+    async def _close_resources() -> None:
+        await db_base.dispose_engine()
+        await redis_utils.close_redis()
+
+
+worker_loop = WorkerLoop()
+
+
+@worker_process_init.connect
+def _start_worker_loop(**kwargs: Any) -> None:
+    if settings.CELERY_PERSISTENT_LOOP:
+        worker_loop.start()
+
+
+@worker_process_shutdown.connect
+def _stop_worker_loop(**kwargs: Any) -> None:
+    worker_loop.stop()
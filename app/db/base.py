@@ -1,14 +1,23 @@
 import contextlib
 import functools
+import logging
 from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Hashable
 
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, AsyncSession, create_async_engine
 
 from app.config import settings
+from app.db.slow_query import SlowQueryLogger
+
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT_KEY = "after_commit"
+_BEFORE_COMMIT_KEY = "before_commit"
 
 _engine: AsyncEngine | None = None
 async_session_maker: async_sessionmaker[AsyncSession] | None = None
+slow_query_logger: SlowQueryLogger | None = None
 
 
 def init_engine(echo: bool = False) -> None:
@@ -17,24 +26,100 @@ def init_engine(echo: bool = False) -> None:
     :param echo:
     :return:
     """
-    global _engine, async_session_maker
+    global _engine, async_session_maker, slow_query_logger
     if _engine is not None:
         return
     _engine = create_async_engine(settings.DATABASE_URL, future=True, echo=echo)
     async_session_maker = async_sessionmaker(_engine, expire_on_commit=False)
 
+    if settings.SLOW_QUERY_THRESHOLD_MS is not None:
+        slow_query_logger = SlowQueryLogger(
+            _engine,
+            threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+            explain=settings.SLOW_QUERY_EXPLAIN,
+            max_explains_per_minute=settings.SLOW_QUERY_EXPLAIN_MAX_PER_MINUTE,
+        )
+        slow_query_logger.install()
+
 
 async def dispose_engine() -> None:
     """
     Dispose the database engine
     :return:
     """
-    global _engine
+    global _engine, slow_query_logger
+    if slow_query_logger is not None:
+        await slow_query_logger.drain()
+        slow_query_logger.uninstall()
+        slow_query_logger = None
     if _engine is not None:
         await _engine.dispose()
         _engine = None
 
 
+def run_after_commit(
+        session: AsyncSession,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        key: Hashable | None = None,
+) -> None:
+    """
+    Schedule `await func(*args)` for after the session's transaction commits
+    (get_session/new_session only). Callbacks run in registration order and are
+    dropped on rollback. A callback registered twice under the same key - by default
+    (func, args) - runs once, so repeated invalidations collapse per transaction.
+    :param session:
+    :param func: async callable
+    :param args: positional arguments for func
+    :param key: deduplication key
+    :return:
+    """
+    callbacks: dict[Hashable, tuple[Callable[..., Awaitable[Any]], tuple]] = session.info.setdefault(
+        _AFTER_COMMIT_KEY, {}
+    )
+    callbacks.setdefault((func, args) if key is None else key, (func, args))
+
+
+def run_before_commit(
+        session: AsyncSession,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        key: Hashable | None = None,
+) -> None:
+    """
+    Schedule `await func(*args)` right before the session's transaction commits
+    (get_session/new_session only), inside the transaction: a failing callback rolls
+    it back. Deduplicated like run_after_commit, so buffered writes can register
+    their flush on every call.
+    :param session:
+    :param func: async callable
+    :param args: positional arguments for func
+    :param key: deduplication key
+    :return:
+    """
+    callbacks: dict[Hashable, tuple[Callable[..., Awaitable[Any]], tuple]] = session.info.setdefault(
+        _BEFORE_COMMIT_KEY, {}
+    )
+    callbacks.setdefault((func, args) if key is None else key, (func, args))
+
+
+async def _run_before_commit(session: AsyncSession) -> None:
+    # callbacks may register further callbacks (e.g. a flush emitting more buffered rows)
+    while callbacks := session.info.pop(_BEFORE_COMMIT_KEY, {}):
+        for func, args in callbacks.values():
+            await func(*args)
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    callbacks = session.info.pop(_AFTER_COMMIT_KEY, {})
+    for func, args in callbacks.values():
+        try:
+            await func(*args)
+        except Exception:
+            # the transaction is already committed: a failing side effect must not turn into an error
+            logger.exception("after-commit callback %r failed", func)
+
+
 @asynccontextmanager
 async def get_session(*, readonly: bool = False):
     """
@@ -57,12 +142,16 @@ async def get_session(*, readonly: bool = False):
             try:
                 yield session
                 if session.in_transaction():
+                    await _run_before_commit(session)
                     await session.commit()
             except Exception:
+                session.info.pop(_BEFORE_COMMIT_KEY, None)
+                session.info.pop(_AFTER_COMMIT_KEY, None)
                 with contextlib.suppress(InvalidRequestError):
                     if session.in_transaction():
                         await session.rollback()
                 raise
+            await _run_after_commit(session)
 
 
 def new_session(*, readonly: bool = False):
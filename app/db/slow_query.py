@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SlowQuerySink = Callable[[dict[str, Any]], None]
+
+_START_STACK_KEY = "slow_query_started_at"
+_SKIP_OPTION = "slow_query_skip"
+_EXPLAINABLE_PREFIXES = ("select", "insert", "update", "delete", "with")
+_PARAMS_REPR_LIMIT = 1000
+
+
+def _log_sink(record: dict[str, Any]) -> None:
+    logger.warning("slow query: %s", json.dumps(record, default=str))
+
+
+class SlowQueryLogger:
+    """
+    Engine-level slow query log.
+
+    Every statement slower than `threshold_ms` is reported to `sink` together with
+    its parameters. For DML statements an `EXPLAIN (ANALYZE off, FORMAT JSON)` plan
+    is captured in a background task on a separate pooled connection, so the
+    original request never waits for it.
+
+    Plan capture is rate limited (`max_explains_per_minute`, one capture per distinct
+    statement per minute, `max_in_flight` concurrent captures) so a burst of slow
+    queries cannot turn into a burst of extra load on the database.
+
+    Usage:
+        slow_log = SlowQueryLogger(engine, threshold_ms=200)
+        slow_log.install()
+        ...
+        await slow_log.drain()  # wait for pending plan captures (e.g. before loop shutdown)
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            threshold_ms: float,
+            explain: bool = True,
+            max_explains_per_minute: int = 6,
+            max_in_flight: int = 2,
+            sink: SlowQuerySink | None = None,
+    ) -> None:
+        self._engine = engine
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.max_explains_per_minute = max_explains_per_minute
+        self.max_in_flight = max_in_flight
+        self._sink = sink or _log_sink
+
+        self._explain_times: deque[float] = deque()
+        self._recent_statements: dict[str, float] = {}
+        self._pending: set[asyncio.Task] = set()
+        self._installed = False
+
+    # ------------------------- lifecycle -----------------------
+
+    def install(self) -> None:
+        if self._installed:
+            return
+        sync_engine = self._engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+        self._installed = True
+
+    def uninstall(self) -> None:
+        if not self._installed:
+            return
+        sync_engine = self._engine.sync_engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(sync_engine, "handle_error", self._handle_error)
+        self._installed = False
+
+    async def drain(self, timeout: float = 5.0) -> None:
+        """
+        Wait for pending EXPLAIN captures (bounded by timeout).
+        """
+        pending = [task for task in self._pending if task.get_loop() is asyncio.get_running_loop()]
+        if not pending:
+            return
+        await asyncio.wait(pending, timeout=timeout)
+
+    # ------------------------- event hooks -----------------------
+
+    @staticmethod
+    def _is_skipped(context) -> bool:
+        return context is not None and bool(context.execution_options.get(_SKIP_OPTION))
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._is_skipped(context):
+            return
+        conn.info.setdefault(_START_STACK_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._is_skipped(context):
+            return
+        started = conn.info.get(_START_STACK_KEY)
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        record: dict[str, Any] = {
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement,
+            "parameters": repr(parameters)[:_PARAMS_REPR_LIMIT],
+            "executemany": executemany,
+            "plan": None,
+        }
+
+        if executemany or not self._should_explain(statement):
+            self._emit(record)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._emit(record)
+            return
+
+        task = loop.create_task(self._capture_plan(record, statement, parameters))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _handle_error(self, exception_context) -> None:
+        # after_cursor_execute does not run for a failed statement, so drop its start time
+        # here; otherwise the entry stays on the pooled connection for good.
+        conn = exception_context.connection
+        if conn is None or self._is_skipped(exception_context.execution_context):
+            return
+        started = conn.info.get(_START_STACK_KEY)
+        if started:
+            started.pop()
+
+    # ------------------------- internals -----------------------
+
+    def _should_explain(self, statement: str) -> bool:
+        if not self.explain or self._engine.dialect.name != "postgresql":
+            return False
+        if not statement.lstrip().lower().startswith(_EXPLAINABLE_PREFIXES):
+            return False
+        if len(self._pending) >= self.max_in_flight:
+            return False
+
+        now = time.monotonic()
+        while self._explain_times and now - self._explain_times[0] > 60:
+            self._explain_times.popleft()
+        if len(self._explain_times) >= self.max_explains_per_minute:
+            return False
+
+        last_seen = self._recent_statements.get(statement)
+        if last_seen is not None and now - last_seen < 60:
+            return False
+
+        self._recent_statements = {
+            key: seen for key, seen in self._recent_statements.items() if now - seen < 60
+        }
+        self._recent_statements[statement] = now
+        self._explain_times.append(now)
+        return True
+
+    async def _capture_plan(self, record: dict[str, Any], statement: str, parameters: Any) -> None:
+        try:
+            async with self._engine.connect() as conn:
+                res = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}",
+                    parameters or None,
+                    execution_options={_SKIP_OPTION: True},
+                )
+                plan = res.scalar_one()
+                await conn.rollback()
+            record["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as exc:
+            record["plan_error"] = str(exc)
+        self._emit(record)
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        try:
+            self._sink(record)
+        except Exception:
+            logger.exception("slow query sink failed")
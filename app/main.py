@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -5,8 +6,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 
 from app.api import routers
+from app.api.compression import CompressionMiddleware
+from app.api.idempotency import IdempotencyMiddleware
+from app.api.responses import FastJSONResponse
+from app.celery_app.publisher import task_publisher
 from app.db.base import init_engine, dispose_engine
 from app.config import settings
+from app.utils.payment_gateway import close_payment_gateway
 from app.utils.redis import init_redis, close_redis
 
 
@@ -14,22 +20,33 @@ from app.utils.redis import init_redis, close_redis
 async def lifespan(app: FastAPI):
     init_engine(echo=settings.SQL_ECHO)
     await init_redis(app)
+    if settings.CELERY_PUBLISHER_ENABLED:
+        task_publisher.start()
     try:
         yield
     finally:
+        await asyncio.to_thread(task_publisher.stop)
+        await close_payment_gateway()
         await close_redis(app)
         await dispose_engine()
 
 
 def add_debug_routes(app: FastAPI) -> None:
     app.get("/debug/ip")(debug_ip)
+    app.get("/debug/publisher")(debug_publisher)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Pet 1", lifespan=lifespan)
+    app = FastAPI(title="Pet 1", lifespan=lifespan, default_response_class=FastJSONResponse)
     for r in routers.__all__:
         app.include_router(r)
 
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(IdempotencyMiddleware)
+    if settings.COMPRESSION_ENABLED:
+        # outside idempotency: stored responses stay uncompressed and are encoded per client
+        app.add_middleware(CompressionMiddleware)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["https://itouch-pet-project.ru.tuna.am"],
@@ -67,6 +84,11 @@ async def debug_ip(request: Request) -> dict[str, str | None]:
     }
 
 
+
+async def debug_publisher() -> dict[str, object]:
+    return task_publisher.stats()
+
+
 app: FastAPI = create_app()
 
 
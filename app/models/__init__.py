@@ -8,6 +8,10 @@ from .timeslot import TimeSlot
 from .user import User
 from .image import Image
 from .feature import Feature
+from .room_availability import RoomDayAvailability
+from .outbox import OutboxEvent
+from .payment_webhook import PaymentWebhookEvent
+from .archive import bookings_archive, timeslots_archive, payments_archive, notificationlogs_archive
 
 __all__ = [
     "BaseSQLModel",
@@ -20,4 +24,11 @@ __all__ = [
     "NotificationLog",
     "Image",
     "Feature",
+    "RoomDayAvailability",
+    "OutboxEvent",
+    "PaymentWebhookEvent",
+    "bookings_archive",
+    "timeslots_archive",
+    "payments_archive",
+    "notificationlogs_archive",
 ]
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Table, TIMESTAMP, func
+
+from .base import BaseSQLModel
+from .booking import Booking
+from .notificationlog import NotificationLog
+from .payment import Payment
+from .timeslot import TimeSlot
+
+
+def _archive_table(source: Table) -> Table:
+    """
+    Build `<source>_archive`: same columns, no identity/defaults/FKs/constraints,
+    plus `archived_at`. Rows keep their original ids.
+    """
+    columns = [
+        Column(
+            column.name,
+            column.type.copy(),
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+        for column in source.columns
+    ]
+    columns.append(
+        Column("archived_at", TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    )
+    return Table(f"{source.name}_archive", BaseSQLModel.metadata, *columns)
+
+
+bookings_archive = _archive_table(Booking.__table__)
+timeslots_archive = _archive_table(TimeSlot.__table__)
+payments_archive = _archive_table(Payment.__table__)
+notificationlogs_archive = _archive_table(NotificationLog.__table__)
@@ -43,4 +43,20 @@ class Booking(BaseSQLModel, table=True):
                 "status IN ('PENDING_PAYMENTS', 'PAID')"
             ),
         ),
+        # GET /bookings: WHERE user_id = ? ORDER BY created_at
+        Index("ix_bookings_user_id_created_at", "user_id", "created_at"),
+        # expiry: pending bookings ordered by expires_at, room_id for cache invalidation
+        Index(
+            "ix_bookings_pending_expires_at",
+            "expires_at",
+            postgresql_include=["room_id"],
+            postgresql_where=text("status = 'PENDING_PAYMENTS'"),
+        ),
+        # block-range index: created_at grows with insertion order
+        Index(
+            "brin_bookings_created_at",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"autosummarize": "on"},
+        ),
     )
@@ -1,5 +1,6 @@
 from typing import List, TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Relationship
 
 from .base import BaseSQLModel
@@ -15,3 +16,16 @@ class Location(BaseSQLModel, table=True):
     description: str
 
     rooms: List["Room"] = Relationship(back_populates="location")
+
+    __table_args__ = (
+        # trigram indexes for catalog search (ILIKE '%q%' and word similarity)
+        Index("ix_locations_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_locations_address_trgm", "address",
+            postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_locations_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
@@ -1,6 +1,7 @@
+from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Enum as SAEnum, JSON
+from sqlalchemy import Enum as SAEnum, Index, JSON, TIMESTAMP, text
 from sqlmodel import Field
 
 from .base import BaseSQLModel
@@ -38,5 +39,16 @@ class NotificationLog(BaseSQLModel, table=True):
         nullable=False,
     )
 
+    # send attempts so far; a QUEUED row is due again once next_attempt_at has passed
+    # (lease of the dispatcher sending it, or the backoff after a failed send)
+    attempts: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": text("0")})
+    next_attempt_at: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True), nullable=True)
+
     __table_args__ = (
+        # the dispatcher only ever scans queued rows, oldest first
+        Index(
+            "ix_notificationlogs_queued",
+            "id",
+            postgresql_where=text("status = 'QUEUED'"),
+        ),
     )
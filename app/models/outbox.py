@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import JSON, TIMESTAMP, Index, text
+from sqlmodel import Field
+
+from .base import BaseSQLModel
+
+
+class OutboxTopic(str, Enum):
+    EXPIRE_BOOKING = "booking.expire"
+    EXPIRE_BOOKINGS = "bookings.expire"
+    REFRESH_ROOM_DAYS = "room_availability.refresh"
+
+
+class OutboxEvent(BaseSQLModel, table=True):
+    __tablename__ = "outbox_events"
+
+    topic: str = Field(nullable=False)
+    payload: dict = Field(sa_type=JSON, nullable=False)
+
+    published_at: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True), nullable=True)
+    attempts: int = Field(default=0, nullable=False)
+    last_error: str | None = Field(default=None, nullable=True)
+    # set after a failed attempt: the relay leaves the event alone until then
+    next_attempt_at: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # the relay only ever scans unpublished events, oldest first
+        Index(
+            "ix_outbox_events_unpublished",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
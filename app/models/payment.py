@@ -1,7 +1,7 @@
 from enum import Enum
 
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field
 
 from .base import BaseSQLModel
@@ -17,7 +17,7 @@ class Payment(BaseSQLModel, table=True):
     __tablename__ = "payments"
 
     booking_id: int = Field(foreign_key="bookings.id", nullable=False, unique=True)
-    external_id: str  # fake ID from "payment service"
+    external_id: str  # payment id issued by the provider (app.utils.payment_gateway)
 
     status: PaymentStatus = Field(
         sa_type=SAEnum(PaymentStatus, name="paymentstatus"),
@@ -30,4 +30,6 @@ class Payment(BaseSQLModel, table=True):
             "booking_id",
             name="uq_payment_booking_id",
         ),
+        # provider callbacks are matched by external_id
+        Index("ix_payments_external_id", "external_id"),
     )
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import Enum as SAEnum, JSON, TIMESTAMP, Index, UniqueConstraint, text
+from sqlmodel import Field
+
+from .base import BaseSQLModel
+from .payment import PaymentStatus
+
+
+class PaymentWebhookEvent(BaseSQLModel, table=True):
+    """
+    Provider callback accepted by POST /payments/webhook, applied later in batches.
+    """
+    __tablename__ = "payment_webhook_events"
+
+    event_id: str = Field(nullable=False)  # provider's delivery id, retries reuse it
+    external_id: str = Field(nullable=False)  # Payment.external_id
+    status: PaymentStatus = Field(
+        sa_type=SAEnum(PaymentStatus, name="paymentstatus"),
+        nullable=False,
+    )
+    payload: dict = Field(sa_type=JSON, nullable=False)
+
+    processed_at: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("event_id", name="uq_payment_webhook_events_event_id"),
+        # the applier only ever scans unprocessed events, oldest first
+        Index(
+            "ix_payment_webhook_events_unprocessed",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
@@ -3,7 +3,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlmodel import Field, Relationship
-from sqlalchemy import Enum as SAEnum, DECIMAL
+from sqlalchemy import Enum as SAEnum, DECIMAL, Index
 from .base import BaseSQLModel
 
 class RoomType(str, Enum):
@@ -40,3 +40,12 @@ class Room(BaseSQLModel, table=True):
     )
     hour_price: Decimal = Field(sa_type=DECIMAL, nullable=False)
     is_active: bool
+
+    __table_args__ = (
+        # trigram indexes for catalog search (ILIKE '%q%' and word similarity)
+        Index("ix_rooms_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_rooms_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
@@ -0,0 +1,29 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, UniqueConstraint
+from sqlmodel import Field
+
+from .base import BaseSQLModel
+
+
+class RoomDayAvailability(BaseSQLModel, table=True):
+    """
+    Per-room, per-day (UTC) availability summary maintained on every booking/timeslot mutation.
+    `free_slots` counts AVAILABLE timeslots without an active booking, `min_price` is the
+    cheapest of them (None when nothing is free).
+    """
+    __tablename__ = "room_day_availability"
+
+    room_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
+    )
+    day: date = Field(nullable=False)
+
+    total_slots: int = Field(default=0, nullable=False)
+    free_slots: int = Field(default=0, nullable=False)
+    min_price: Decimal | None = Field(default=None, sa_type=DECIMAL, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("room_id", "day", name="uq_room_day_availability_room_day"),
+    )
@@ -0,0 +1,184 @@
+from datetime import date, datetime
+
+from sqlalchemy import Table, delete, exists, func, insert, or_, select, CTE
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Booking, NotificationLog, OutboxEvent, Payment, PaymentWebhookEvent, TimeSlot
+from app.models.archive import (
+    bookings_archive,
+    notificationlogs_archive,
+    payments_archive,
+    timeslots_archive,
+)
+from app.models.booking import BookingStatus
+from app.models.notificationlog import NotificationLogStatus
+from app.repositories.room_availability import timeslot_day
+
+DEAD_BOOKING_STATUSES = (BookingStatus.CANCELED, BookingStatus.EXPIRED)
+DONE_NOTIFICATION_STATUSES = (NotificationLogStatus.SENT, NotificationLogStatus.FAILED)
+
+
+class ArchiveRepository:
+    """
+    Moves old rows from the hot tables into their `*_archive` copies.
+
+    Every method handles one batch in one statement: the batch is picked with
+    `FOR UPDATE SKIP LOCKED`, removed with `DELETE ... RETURNING` and inserted into
+    the archive table from the returned rows (data-modifying CTEs). Dependent rows
+    are moved in the same statement, so foreign keys stay consistent.
+
+    `purge_*` methods delete delivery bookkeeping rows that have no archive copy.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _move(source: Table, archive: Table, where, name: str) -> tuple[CTE, CTE]:
+        columns = [column.name for column in source.columns]
+        moved = delete(source).where(where).returning(*source.columns).cte(f"moved_{name}")
+        archived = (
+            insert(archive)
+            .from_select(columns, select(*[moved.c[column] for column in columns]))
+            .returning(archive.c.id)
+            .cte(f"archived_{name}")
+        )
+        return moved, archived
+
+    @staticmethod
+    def _count(cte: CTE):
+        return select(func.count()).select_from(cte).scalar_subquery()
+
+    async def archive_dead_bookings(self, older_than: datetime, batch_size: int) -> dict[str, int]:
+        """
+        Archive one batch of CANCELED/EXPIRED bookings created before `older_than`,
+        together with their payments and notification logs.
+        :return: {"bookings": n, "payments": n, "notificationlogs": n}
+        """
+        picked = (
+            select(Booking.id)
+            .where(Booking.status.in_(DEAD_BOOKING_STATUSES))
+            .where(Booking.created_at < older_than)
+            .order_by(Booking.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        picked_ids = select(picked.c.id)
+
+        moved_logs, archived_logs = self._move(
+            NotificationLog.__table__, notificationlogs_archive,
+            NotificationLog.booking_id.in_(picked_ids), "notificationlogs",
+        )
+        moved_payments, archived_payments = self._move(
+            Payment.__table__, payments_archive,
+            Payment.booking_id.in_(picked_ids), "payments",
+        )
+        moved_bookings, archived_bookings = self._move(
+            Booking.__table__, bookings_archive,
+            Booking.id.in_(picked_ids), "bookings",
+        )
+
+        stmt = select(
+            self._count(archived_bookings).label("bookings"),
+            self._count(archived_payments).label("payments"),
+            self._count(archived_logs).label("notificationlogs"),
+        ).add_cte(moved_logs, archived_logs, moved_payments, archived_payments, moved_bookings, archived_bookings)
+
+        row = (await self.session.execute(stmt)).one()
+        return dict(row._mapping)
+
+    async def archive_past_timeslots(
+            self,
+            older_than: datetime,
+            batch_size: int,
+    ) -> tuple[int, set[tuple[int, date]]]:
+        """
+        Archive one batch of timeslots that ended before `older_than` and are no longer
+        referenced by any booking.
+        :return: number of archived timeslots and the (room_id, day) pairs they were on,
+            whose availability summary has to be refreshed
+        """
+        picked = (
+            select(TimeSlot.id)
+            .where(TimeSlot.end_datetime < older_than)
+            .where(~exists().where(Booking.timeslot_id == TimeSlot.id))
+            .order_by(TimeSlot.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        moved, archived = self._move(
+            TimeSlot.__table__, timeslots_archive,
+            TimeSlot.id.in_(select(picked.c.id)), "timeslots",
+        )
+        day_expr = timeslot_day(moved.c.start_datetime)
+        stmt = (
+            select(moved.c.room_id, day_expr, func.count())
+            .group_by(moved.c.room_id, day_expr)
+            .add_cte(moved, archived)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return sum(count for _, _, count in rows), {(room_id, day) for room_id, day, _ in rows}
+
+    async def archive_notification_logs(self, older_than: datetime, batch_size: int) -> int:
+        """
+        Archive one batch of SENT/FAILED notification logs created before `older_than`.
+        QUEUED rows are left for the dispatcher.
+        :return: number of archived notification logs
+        """
+        picked = (
+            select(NotificationLog.id)
+            .where(NotificationLog.status.in_(DONE_NOTIFICATION_STATUSES))
+            .where(NotificationLog.created_at < older_than)
+            .order_by(NotificationLog.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        moved, archived = self._move(
+            NotificationLog.__table__, notificationlogs_archive,
+            NotificationLog.id.in_(select(picked.c.id)), "notificationlogs",
+        )
+        stmt = select(self._count(archived)).add_cte(moved, archived)
+        return (await self.session.execute(stmt)).scalar_one()
+
+    async def purge_outbox_events(self, older_than: datetime, max_attempts: int, batch_size: int) -> int:
+        """
+        Delete one batch of outbox events that were published, or used up their
+        max_attempts, before `older_than`. Pending events are left for the relay.
+        :return: number of deleted events
+        """
+        picked = (
+            select(OutboxEvent.id)
+            .where(or_(OutboxEvent.published_at.is_not(None), OutboxEvent.attempts >= max_attempts))
+            .where(OutboxEvent.updated_at < older_than)
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            delete(OutboxEvent).where(OutboxEvent.id.in_(picked)).returning(OutboxEvent.id)
+        )
+        return len(res.all())
+
+    async def purge_payment_webhook_events(self, processed_before: datetime, batch_size: int) -> int:
+        """
+        Delete one batch of provider callbacks processed before `processed_before`.
+        Until then their event_id keeps dropping redeliveries; unprocessed ones are
+        left for the applier.
+        :return: number of deleted callbacks
+        """
+        picked = (
+            select(PaymentWebhookEvent.id)
+            .where(PaymentWebhookEvent.processed_at < processed_before)
+            .order_by(PaymentWebhookEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            delete(PaymentWebhookEvent).where(PaymentWebhookEvent.id.in_(picked)).returning(PaymentWebhookEvent.id)
+        )
+        return len(res.all())
@@ -1,13 +1,69 @@
 from abc import ABC
-from typing import TypeVar, Generic, Type, List
-
-from sqlalchemy import insert, select, update, delete, Result
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, NamedTuple, TypeVar, Generic, Type, List, get_args
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import (
+    Text, case, cast, extract, func, insert, literal_column, select, update, delete, Result, Row, Select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.models.base import BaseSQLModel
 
 T = TypeVar("T", bound=BaseSQLModel)
+D = TypeVar("D")
+
+
+def _json_timestamp(column: ColumnElement) -> ColumnElement:
+    # same text as pydantic: UTC with "Z", microseconds only when non-zero
+    utc = func.timezone("UTC", column)
+    fraction = case(
+        (extract("microseconds", column) % 1_000_000 != 0, func.to_char(utc, ".US", type_=Text)),
+        else_="",
+    )
+    return func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text).concat(fraction).concat("Z")
+
+
+def dto_json_object(source: Any, dto_cls: Type[BaseModel]) -> ColumnElement:
+    """
+    `json_build_object(...)` with the DTO's fields in declaration order, taken from
+    same-named columns of `source` (a model class or `subquery.c`). Values are
+    rendered the way pydantic serializes them: timestamps as UTC ISO strings,
+    decimals as strings.
+    """
+    args = []
+    for name, field in dto_cls.model_fields.items():
+        column = getattr(source, name)
+        types = set(get_args(field.annotation)) or {field.annotation}
+        if datetime in types:
+            column = _json_timestamp(column)
+        elif Decimal in types:
+            column = cast(column, Text)
+        args.extend((literal_column(f"'{name}'"), column))
+    return func.json_build_object(*args)
+
+
+def json_array(element: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+    """
+    `json_agg(element ORDER BY ...)` as text, '[]' for no rows.
+    """
+    aggregated = func.json_agg(aggregate_order_by(element, *order_by)) if order_by else func.json_agg(element)
+    return cast(func.coalesce(aggregated, literal_column("'[]'::json")), Text)
+
+
+class TableVersion(NamedTuple):
+    """
+    Cheap fingerprint of a set of rows: changes when a row is added, deleted or updated
+    (updated_at is maintained by a trigger and only moves forward per row).
+    """
+    count: int
+    last_modified: datetime | None
+    checksum: Decimal | None  # exact sum of updated_at epochs
 
 
 # TODO нахуя тут ABC
@@ -17,6 +73,16 @@ class BaseRepository(Generic[T], ABC):
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _fetch_into(self, stmt: Select, adapter: TypeAdapter[list[D]]) -> list[D]:
+        """
+        Run a column select and validate the rows straight into DTOs in one pass:
+        no ORM instances, nothing added to the session identity map.
+        Column labels must match the DTO field names.
+        """
+        result = await self.session.execute(stmt)
+        keys = list(result.keys())
+        return adapter.validate_python([dict(zip(keys, row)) for row in result])
+
     async def create(self, **data) -> T:
         """
         Create a new object and return it.
@@ -27,6 +93,19 @@ class BaseRepository(Generic[T], ABC):
         res = await self.session.execute(query)
         return res.scalar_one()
 
+    async def create_many(self, rows: list[dict]) -> List[T]:
+        """
+        Create several objects with one multi-row INSERT and return them in input order
+        (RETURNING alone does not promise that: sort_by_parameter_order does).
+        :param rows: list of dicts with new object data
+        :return:
+        """
+        if not rows:
+            return []
+        query = insert(self._model_cls).returning(self._model_cls, sort_by_parameter_order=True)
+        res = await self.session.execute(query, rows)
+        return list(res.scalars().all())
+
     async def get_all(self,
                       desc: bool = True,
                       offset: int | None = None,
@@ -111,6 +190,48 @@ class BaseRepository(Generic[T], ABC):
             raise NoResultFound
         return res
 
+    async def get_version(self, **filters) -> TableVersion:
+        """
+        count / max(updated_at) / sum of updated_at epochs of the filtered rows in one
+        aggregate query, for ETags and Last-Modified without loading the rows.
+        :param filters: any filters
+        :return: TableVersion
+        """
+        updated_at = self._model_cls.updated_at
+        query = select(
+            func.count(),
+            func.max(updated_at),
+            func.sum(extract("epoch", updated_at)),
+        ).select_from(self._model_cls).filter_by(**filters)
+        res = await self.session.execute(query)
+        return TableVersion(*res.one())
+
+    def column_names(self) -> list[str]:
+        return [column.name for column in self._model_cls.__table__.columns]
+
+    async def stream_all(
+            self,
+            batch_size: int,
+            created_from: datetime | None = None,
+            created_to: datetime | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        All rows as plain tuples in column_names() order, by id, read from a server-side
+        cursor `batch_size` rows at a time: memory is bounded by one batch, not by the table.
+        :param created_from: optional lower bound of created_at (inclusive)
+        :param created_to: optional upper bound of created_at (exclusive)
+        """
+        table = self._model_cls.__table__
+        stmt = select(*table.columns).order_by(table.c.id)
+        if created_from is not None:
+            stmt = stmt.where(table.c.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(table.c.created_at < created_to)
+
+        result = await self.session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
     @property
     def model_cls(self) -> str:
         return self._model_cls.__tablename__
@@ -1,29 +1,125 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import select, update
+from pydantic import TypeAdapter
+from sqlalchemy import Integer, TIMESTAMP, Select, any_, column, func, literal_column, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models import Booking, TimeSlot
 from app.models.booking import BookingStatus
-from app.repositories.base import BaseRepository
-from app.schemas.booking import SBookingFilters
-from app.schemas.timeslot import STimeSlotFilters
+from app.repositories.base import BaseRepository, dto_json_object, json_array
+from app.schemas.booking import SBookingFilters, SBookingOut, SBookingOutWithTimeslots
+from app.schemas.timeslot import STimeSlotFilters, STimeSlotOut
+
+_BOOKING_FIELDS = tuple(SBookingOut.model_fields)
+_TIMESLOT_FIELDS = tuple(STimeSlotOut.model_fields)
+_BOOKINGS_WITH_TIMESLOTS = TypeAdapter(list[SBookingOutWithTimeslots])
 
 
 class BookingRepository(BaseRepository[Booking]):
     _model_cls = Booking
 
-    async def get_all_bookings_with_timeslots(
+    async def create_if_timeslot_free(self, **data) -> Booking | None:
+        """
+        Insert a booking unless the timeslot already has an active one.
+        ON CONFLICT targets the uq_bookings_timeslot_active partial index, so a
+        concurrent booker waits only for the competing insert, not for a timeslot row lock.
+        :return: the new Booking, or None if the timeslot is taken
+        """
+        stmt = (
+            insert(self._model_cls)
+            .values(**data)
+            .on_conflict_do_nothing(
+                index_elements=[self._model_cls.timeslot_id],
+                # must match the index predicate textually for conflict inference
+                index_where=text("status IN ('PENDING_PAYMENTS', 'PAID')"),
+            )
+            .returning(self._model_cls)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def create_many_if_timeslots_free(self, rows: list[dict]) -> list[Booking]:
+        """
+        create_if_timeslot_free for several bookings in one multi-row INSERT: rows whose
+        timeslot already has an active booking are skipped, the others are returned.
+        :param rows: list of dicts with new booking data
+        :return: created bookings
+        """
+        if not rows:
+            return []
+        stmt = (
+            insert(self._model_cls)
+            .values(rows)
+            .on_conflict_do_nothing(
+                index_elements=[self._model_cls.timeslot_id],
+                index_where=text("status IN ('PENDING_PAYMENTS', 'PAID')"),
+            )
+            .returning(self._model_cls)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def list_bookings_with_timeslots(
             self,
             user_id: int,
             booking_filters: SBookingFilters | None = None,
             timeslot_filters: STimeSlotFilters | None = None,
-    ) -> list[tuple[Booking, TimeSlot]]:
+    ) -> list[SBookingOutWithTimeslots]:
+        """
+        The user's bookings joined with their timeslots, for GET /bookings: selects
+        only the DTO columns and maps each row straight into the nested DTO.
+        """
         stmt = (
-            select(self._model_cls, TimeSlot)
+            select(
+                *(getattr(self._model_cls, name) for name in _BOOKING_FIELDS),
+                *(getattr(TimeSlot, name) for name in _TIMESLOT_FIELDS),
+            )
             .join(TimeSlot, self._model_cls.timeslot_id == TimeSlot.id)
             .where(self._model_cls.user_id == user_id)
         )
+        stmt = self._filter_bookings_with_timeslots(stmt, booking_filters, timeslot_filters)
+        stmt = stmt.order_by(self._model_cls.created_at)
 
+        res = await self.session.execute(stmt)
+        split = len(_BOOKING_FIELDS)
+        return _BOOKINGS_WITH_TIMESLOTS.validate_python([
+            {
+                "booking": dict(zip(_BOOKING_FIELDS, row[:split])),
+                "timeslot": dict(zip(_TIMESLOT_FIELDS, row[split:])),
+            }
+            for row in res
+        ])
+
+    async def get_json_bookings_with_timeslots(
+            self,
+            user_id: int,
+            booking_filters: SBookingFilters | None = None,
+            timeslot_filters: STimeSlotFilters | None = None,
+    ) -> str:
+        """
+        Same list as list_bookings_with_timeslots, rendered by Postgres with
+        json_agg(json_build_object(...)): the JSON array text, no Python objects per row.
+        """
+        item = func.json_build_object(
+            literal_column("'booking'"), dto_json_object(self._model_cls, SBookingOut),
+            literal_column("'timeslot'"), dto_json_object(TimeSlot, STimeSlotOut),
+        )
+        stmt = (
+            select(item.label("item"), self._model_cls.created_at)
+            .join(TimeSlot, self._model_cls.timeslot_id == TimeSlot.id)
+            .where(self._model_cls.user_id == user_id)
+        )
+        rows = self._filter_bookings_with_timeslots(stmt, booking_filters, timeslot_filters).subquery()
+
+        stmt = select(json_array(rows.c.item, rows.c.created_at))
+        return (await self.session.execute(stmt)).scalar_one()
+
+    def _filter_bookings_with_timeslots(
+            self,
+            stmt: Select,
+            booking_filters: SBookingFilters | None,
+            timeslot_filters: STimeSlotFilters | None,
+    ) -> Select:
         if booking_filters is not None:
             for column, value in booking_filters.model_dump(exclude_unset=True).items():
                 if value is not None:
@@ -35,11 +131,7 @@ class BookingRepository(BaseRepository[Booking]):
             if timeslot_filters.end_datetime is not None:
                 stmt = stmt.where(TimeSlot.start_datetime <= timeslot_filters.end_datetime)
 
-        stmt = stmt.order_by(self._model_cls.created_at)
-
-        res = await self.session.execute(stmt)
-
-        return [(booking, timeslot) for booking, timeslot in res.all()]
+        return stmt
 
     async def get_booking_with_timeslots_by_id(
             self,
@@ -62,6 +154,29 @@ class BookingRepository(BaseRepository[Booking]):
 
         return row[0], row[1]  # Booking, TimeSlot
 
+    async def get_booking_version(
+            self,
+            booking_id: int,
+            user_id: int,
+            is_admin: bool
+    ) -> tuple[datetime, datetime] | None:
+        """
+        updated_at of the booking and of its timeslot - everything GET /bookings/{id}
+        renders - with the same visibility rules as get_booking_with_timeslots_by_id.
+        """
+        stmt = (
+            select(self._model_cls.updated_at, TimeSlot.updated_at)
+            .join(TimeSlot, self._model_cls.timeslot_id == TimeSlot.id)
+            .where(self._model_cls.id == booking_id)
+        )
+
+        if not is_admin:
+            stmt = stmt.where(self._model_cls.user_id == user_id)
+
+        res = await self.session.execute(stmt)
+        row = res.one_or_none()
+        return None if row is None else (row[0], row[1])
+
     async def check_booking_status(self, booking_id: int, user_id: int, is_admin: bool) -> BookingStatus:
         stmt = (
             select(self._model_cls.status)
@@ -92,6 +207,31 @@ class BookingRepository(BaseRepository[Booking]):
         await self.session.refresh(booking)
         return booking
 
+    async def set_bookings_paid(self, paid: list[tuple[int, datetime]]) -> list[tuple[int, int]]:
+        """
+        Set-wise set_booking_paid for provider callbacks: a booking counts as paid if
+        the callback arrived before it expired, however late the batch runs.
+        :param paid: (booking_id, paid_at)
+        :return: list[tuple[booking_id, user_id]] of bookings marked PAID
+        """
+        if not paid:
+            return []
+        callbacks = values(
+            column("booking_id", Integer),
+            column("paid_at", TIMESTAMP(timezone=True)),
+            name="callbacks",
+        ).data(paid)
+        stmt = (
+            update(self._model_cls)
+            .where(self._model_cls.id == callbacks.c.booking_id)
+            .where(self._model_cls.status == BookingStatus.PENDING_PAYMENTS)
+            .where(self._model_cls.expires_at > callbacks.c.paid_at)
+            .values(status=BookingStatus.PAID, paid_at=callbacks.c.paid_at, updated_at=func.now())
+            .returning(self._model_cls.id, self._model_cls.user_id)
+        )
+        res = await self.session.execute(stmt)
+        return [tuple(row) for row in res.all()]
+
     async def cancel_booking(self, booking_id: int, user_id: int, is_admin: bool) -> Booking:
         stmt = (
             update(self._model_cls)
@@ -113,3 +253,34 @@ class BookingRepository(BaseRepository[Booking]):
         booking = res.scalar_one()
         await self.session.refresh(booking)
         return booking
+
+    async def expire_due_bookings(self, now: datetime, batch_size: int) -> list[tuple[int, int, int, int]]:
+        """
+        Expire one batch of PENDING_PAYMENTS bookings whose expires_at has passed.
+        The batch is picked oldest-first through the partial pending index and with
+        SKIP LOCKED, so concurrent sweepers and payment/cancel transactions don't wait
+        on each other. `id = ANY(ARRAY(...))` keeps the update itself a primary key
+        lookup instead of a semi-join against the whole table.
+        :return: list[tuple[room_id, timeslot_id, booking_id, user_id]] of expired bookings
+        """
+        due = (
+            select(self._model_cls.id)
+            .where(self._model_cls.status == BookingStatus.PENDING_PAYMENTS)
+            .where(self._model_cls.expires_at <= now)
+            .order_by(self._model_cls.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self._model_cls)
+            .where(self._model_cls.id == any_(func.array(due.scalar_subquery())))
+            .values(status=BookingStatus.EXPIRED)
+            .returning(
+                self._model_cls.room_id,
+                self._model_cls.timeslot_id,
+                self._model_cls.id,
+                self._model_cls.user_id,
+            )
+        )
+        res = await self.session.execute(stmt)
+        return [tuple(row) for row in res.all()]
@@ -1,6 +1,76 @@
-from app.models.notificationlog import NotificationLog
+from datetime import timedelta
+
+from sqlalchemy import case, func, literal, or_, select, update
+
+from app.models.notificationlog import NotificationLog, NotificationLogStatus
 from app.repositories.base import BaseRepository
 
 
 class NotificationLogRepository(BaseRepository[NotificationLog]):
     _model_cls = NotificationLog
+
+    async def claim_queued(self, batch_size: int, lease_seconds: float) -> list[NotificationLog]:
+        """
+        Lease the oldest due QUEUED notifications for one dispatcher batch: counts the
+        attempt and moves next_attempt_at past the lease, so the claim can commit right
+        away and the batch is sent outside any transaction. A dispatcher that dies
+        mid-batch only delays its rows until the lease runs out.
+        SKIP LOCKED lets several dispatchers claim side by side.
+        """
+        due = (
+            select(self._model_cls.id)
+            .where(self._model_cls.status == NotificationLogStatus.QUEUED)
+            .where(or_(self._model_cls.next_attempt_at.is_(None), self._model_cls.next_attempt_at <= func.now()))
+            .order_by(self._model_cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self._model_cls)
+            .where(self._model_cls.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=self._model_cls.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+            .returning(self._model_cls)
+        )
+        res = await self.session.execute(stmt)
+        return sorted(res.scalars().all(), key=lambda notification: notification.id)
+
+    async def set_status(self, notification_ids: list[int], status: NotificationLogStatus) -> None:
+        if not notification_ids:
+            return
+        await self.session.execute(
+            update(self._model_cls)
+            .where(self._model_cls.id.in_(notification_ids))
+            .values(status=status, updated_at=func.now())
+        )
+
+    async def retry_or_fail(self, notification_ids: list[int], max_attempts: int, backoff_seconds: float) -> int:
+        """
+        After failed sends: back to the queue with exponential backoff, or FAILED once
+        `max_attempts` attempts have been made.
+        :return: number of notifications marked FAILED
+        """
+        if not notification_ids:
+            return 0
+        exhausted = self._model_cls.attempts >= max_attempts
+        status_type = self._model_cls.__table__.c.status.type
+        stmt = (
+            update(self._model_cls)
+            .where(self._model_cls.id.in_(notification_ids))
+            .values(
+                status=case(
+                    (exhausted, literal(NotificationLogStatus.FAILED, status_type)),
+                    else_=literal(NotificationLogStatus.QUEUED, status_type),
+                ),
+                next_attempt_at=func.now()
+                + func.power(2, self._model_cls.attempts - 1) * timedelta(seconds=backoff_seconds),
+                updated_at=func.now(),
+            )
+            .returning(self._model_cls.status)
+        )
+        res = await self.session.execute(stmt)
+        return sum(status == NotificationLogStatus.FAILED for status in res.scalars().all())
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, or_, select, update
+
+from app.models.outbox import OutboxEvent
+from app.repositories.base import BaseRepository
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    _model_cls = OutboxEvent
+
+    async def claim_batch(self, batch_size: int, max_attempts: int) -> list[OutboxEvent]:
+        """
+        Lock the oldest unpublished events that are due (not backing off after a
+        failure) for this relay run.
+        SKIP LOCKED lets several relays drain the outbox side by side.
+        """
+        stmt = (
+            select(self._model_cls)
+            .where(self._model_cls.published_at.is_(None))
+            .where(self._model_cls.attempts < max_attempts)
+            .where(or_(self._model_cls.next_attempt_at.is_(None), self._model_cls.next_attempt_at <= func.now()))
+            .order_by(self._model_cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def mark_published(self, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+        await self.session.execute(
+            update(self._model_cls)
+            .where(self._model_cls.id.in_(event_ids))
+            .values(published_at=datetime.now(timezone.utc), updated_at=func.now())
+        )
+
+    async def mark_failed(self, event_id: int, error: str, backoff_seconds: float) -> None:
+        """
+        Count a failed attempt and hold the event back for backoff_seconds * 2^attempts.
+        """
+        await self.session.execute(
+            update(self._model_cls)
+            .where(self._model_cls.id == event_id)
+            .values(
+                attempts=self._model_cls.attempts + 1,
+                last_error=error[:1000],
+                next_attempt_at=func.now()
+                + func.power(2, self._model_cls.attempts) * timedelta(seconds=backoff_seconds),
+                updated_at=func.now(),
+            )
+        )
@@ -1,6 +1,49 @@
-from app.models.payment import Payment
+from datetime import datetime
+
+from sqlalchemy import Enum as SAEnum, String, TIMESTAMP, column, func, select, update, values
+
+from app.models.payment import Payment, PaymentStatus
 from app.repositories.base import BaseRepository
 
 
 class PaymentRepository(BaseRepository[Payment]):
     _model_cls = Payment
+
+    async def apply_provider_statuses(
+            self,
+            updates: list[tuple[str, PaymentStatus, datetime]],
+    ) -> list[tuple[int, PaymentStatus, datetime]]:
+        """
+        Set provider results on CREATED payments in one UPDATE ... FROM (VALUES ...).
+        Payments that already have a final status are left alone, so replays are no-ops.
+        :param updates: (external_id, status, received_at), one per external_id
+        :return: list[tuple[booking_id, status, received_at]] of updated payments
+        """
+        if not updates:
+            return []
+        provider = values(
+            column("external_id", String),
+            column("status", SAEnum(PaymentStatus, name="paymentstatus")),
+            column("received_at", TIMESTAMP(timezone=True)),
+            name="provider",
+        ).data(updates)
+        stmt = (
+            update(self._model_cls)
+            .where(self._model_cls.external_id == provider.c.external_id)
+            .where(self._model_cls.status == PaymentStatus.CREATED)
+            .values(status=provider.c.status, updated_at=func.now())
+            .returning(self._model_cls.booking_id, self._model_cls.status, provider.c.received_at)
+        )
+        res = await self.session.execute(stmt)
+        return [tuple(row) for row in res.all()]
+
+    async def get_known_external_ids(self, external_ids: list[str]) -> set[str]:
+        """
+        :return: the subset of `external_ids` that belongs to a stored payment
+        """
+        if not external_ids:
+            return set()
+        res = await self.session.execute(
+            select(self._model_cls.external_id).where(self._model_cls.external_id.in_(external_ids))
+        )
+        return set(res.scalars().all())
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.payment_webhook import PaymentWebhookEvent
+from app.repositories.base import BaseRepository
+
+
+class PaymentWebhookRepository(BaseRepository[PaymentWebhookEvent]):
+    _model_cls = PaymentWebhookEvent
+
+    async def enqueue(self, **data) -> bool:
+        """
+        Store a provider callback; a redelivery of the same event_id is a no-op.
+        :return: False for a duplicate delivery
+        """
+        stmt = (
+            insert(self._model_cls)
+            .values(**data)
+            .on_conflict_do_nothing(constraint="uq_payment_webhook_events_event_id")
+            .returning(self._model_cls.id)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none() is not None
+
+    async def claim_batch(self, batch_size: int, after_id: int = 0) -> list[PaymentWebhookEvent]:
+        """
+        Lock the oldest unprocessed callbacks; SKIP LOCKED lets appliers run side by side.
+        :param after_id: skip callbacks up to this id (ones left unprocessed earlier in the same run)
+        """
+        stmt = (
+            select(self._model_cls)
+            .where(self._model_cls.processed_at.is_(None))
+            .where(self._model_cls.id > after_id)
+            .order_by(self._model_cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def mark_processed(self, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+        await self.session.execute(
+            update(self._model_cls)
+            .where(self._model_cls.id.in_(event_ids))
+            .values(processed_at=datetime.now(timezone.utc), updated_at=func.now())
+        )
@@ -1,8 +1,9 @@
 from typing import List, Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.orm import aliased, contains_eager, selectinload
 
+from app.models.location import Location
 from app.models.room import Room
 from app.repositories.base import BaseRepository
 
@@ -36,3 +37,58 @@ class RoomRepository(BaseRepository[Room]):
 
         res = await self.session.execute(query)
         return list(res.scalars().all())
+
+    async def search(self, query: str, offset: int, limit: int) -> list[tuple[Room, float]]:
+        """
+        Active rooms whose name/description, or whose location name/address/description,
+        contain `query` (ILIKE) or fuzzily match it by name (pg_trgm word similarity).
+        For queries of at least 3 characters the predicates are served by the `*_trgm` GIN
+        indexes; pg_trgm extracts no trigram from a shorter pattern, so those would scan both
+        tables (callers reject them). Location matches are resolved in a subquery so each table can use its own indexes.
+        :return: list[tuple[Room, rank]] ordered by rank desc, room id; rooms have location loaded
+        """
+        text_query = literal(query)
+        MatchedLocation = aliased(Location, name="matched_location")
+
+        def _matches(*columns):
+            return or_(*(column.icontains(query, autoescape=True) for column in columns))
+
+        def _fuzzy(column):
+            return text_query.op("<%")(column)
+
+        def _rank(column, weight: float = 1.0):
+            return func.word_similarity(text_query, column) * weight
+
+        matched_location_ids = select(MatchedLocation.id).where(
+            or_(
+                _matches(MatchedLocation.name, MatchedLocation.address, MatchedLocation.description),
+                _fuzzy(MatchedLocation.name),
+            )
+        )
+        rank = func.greatest(
+            _rank(self._model_cls.name),
+            _rank(self._model_cls.description, 0.5),
+            _rank(Location.name, 0.8),
+            _rank(Location.address, 0.4),
+            _rank(Location.description, 0.4),
+        ).label("rank")
+
+        stmt = (
+            select(self._model_cls, rank)
+            .join(Location, Location.id == self._model_cls.location_id)
+            .options(contains_eager(self._model_cls.location))
+            .where(self._model_cls.is_active.is_(True))
+            .where(
+                or_(
+                    _matches(self._model_cls.name, self._model_cls.description),
+                    _fuzzy(self._model_cls.name),
+                    self._model_cls.location_id.in_(matched_location_ids),
+                )
+            )
+            .order_by(rank.desc(), self._model_cls.id)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        res = await self.session.execute(stmt)
+        return [(room, float(rank_value)) for room, rank_value in res.all()]
@@ -0,0 +1,155 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import and_, delete, func, select, tuple_, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.models import Booking, TimeSlot
+from app.models.booking import BookingStatus
+from app.models.room_availability import RoomDayAvailability
+from app.models.timeslot import TimeSlotStatus
+from app.repositories.base import BaseRepository
+
+# advisory lock namespace for (room_id, day) summary rows
+_ADVISORY_LOCK_NAMESPACE = 30_001
+
+
+def timeslot_day(column):
+    """
+    SQL expression: UTC calendar day of a timestamptz column.
+    """
+    return func.date(func.timezone("UTC", column))
+
+
+class RoomAvailabilityRepository(BaseRepository[RoomDayAvailability]):
+    _model_cls = RoomDayAvailability
+
+    async def get_days_for_timeslots(self, timeslot_ids: Iterable[int]) -> set[tuple[int, date]]:
+        """
+        (room_id, day) pairs the given timeslots fall on.
+        """
+        ids = list(timeslot_ids)
+        if not ids:
+            return set()
+        stmt = (
+            select(TimeSlot.room_id, timeslot_day(TimeSlot.start_datetime))
+            .where(TimeSlot.id.in_(ids))
+            .distinct()
+        )
+        res = await self.session.execute(stmt)
+        return {(room_id, day) for room_id, day in res.all()}
+
+    async def refresh_days(self, room_days: Iterable[tuple[int, date]]) -> None:
+        """
+        Recompute summary rows for the given (room_id, day) pairs from timeslots/bookings.
+
+        Refreshers of the same pair are serialized with a transaction-scoped advisory lock
+        (taken in sorted order), so the last upsert can't overwrite newer counts. Writers
+        run it after their own commit in a short transaction (recompute_room_days), so the
+        lock is never held across a booking, cancel or expiry.
+        """
+        pairs = sorted(set(room_days))
+        if not pairs:
+            return
+
+        for room_id, day in pairs:
+            await self.session.execute(
+                select(func.pg_advisory_xact_lock(
+                    _ADVISORY_LOCK_NAMESPACE,
+                    func.hashtext(f"{room_id}:{day.isoformat()}"),
+                ))
+            )
+
+        ActiveBooking = aliased(Booking, name="active_booking")
+        is_free = and_(TimeSlot.status == TimeSlotStatus.AVAILABLE, ActiveBooking.id.is_(None))
+        day_expr = timeslot_day(TimeSlot.start_datetime)
+
+        range_start = datetime.combine(pairs[0][1], time.min, tzinfo=timezone.utc)
+        range_end = datetime.combine(max(day for _, day in pairs) + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+        aggregated = (
+            select(
+                TimeSlot.room_id,
+                day_expr.label("day"),
+                func.count().label("total_slots"),
+                func.count().filter(is_free).label("free_slots"),
+                func.min(TimeSlot.base_price).filter(is_free).label("min_price"),
+            )
+            .join(
+                ActiveBooking,
+                and_(
+                    ActiveBooking.timeslot_id == TimeSlot.id,
+                    ActiveBooking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]),
+                ),
+                isouter=True,
+            )
+            .where(TimeSlot.room_id.in_({room_id for room_id, _ in pairs}))
+            .where(TimeSlot.start_datetime >= range_start)
+            .where(TimeSlot.start_datetime < range_end)
+            .where(tuple_(TimeSlot.room_id, day_expr).in_(pairs))
+            .group_by(TimeSlot.room_id, day_expr)
+        )
+
+        upsert = insert(self._model_cls).from_select(
+            ["room_id", "day", "total_slots", "free_slots", "min_price"],
+            aggregated,
+        )
+        upsert = upsert.on_conflict_do_update(
+            constraint="uq_room_day_availability_room_day",
+            set_={
+                "total_slots": upsert.excluded.total_slots,
+                "free_slots": upsert.excluded.free_slots,
+                "min_price": upsert.excluded.min_price,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(upsert)
+
+        # days that no longer have any timeslot
+        still_present = (
+            select(TimeSlot.id)
+            .where(TimeSlot.room_id == self._model_cls.room_id)
+            .where(timeslot_day(TimeSlot.start_datetime) == self._model_cls.day)
+            .exists()
+        )
+        await self.session.execute(
+            delete(self._model_cls)
+            .where(tuple_(self._model_cls.room_id, self._model_cls.day).in_(pairs))
+            .where(~still_present)
+        )
+
+    async def get_days_between(self, day_from: date, day_to: date) -> list[tuple[int, date]]:
+        """
+        (room_id, day) pairs in [day_from, day_to] that have timeslots or a summary
+        row (possibly one whose timeslots are gone), ordered.
+        """
+        range_start = datetime.combine(day_from, time.min, tzinfo=timezone.utc)
+        range_end = datetime.combine(day_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        slot_days = (
+            select(TimeSlot.room_id, timeslot_day(TimeSlot.start_datetime).label("day"))
+            .where(TimeSlot.start_datetime >= range_start)
+            .where(TimeSlot.start_datetime < range_end)
+        )
+        summary_days = (
+            select(self._model_cls.room_id, self._model_cls.day)
+            .where(self._model_cls.day >= day_from)
+            .where(self._model_cls.day <= day_to)
+        )
+        pairs = union(slot_days, summary_days).subquery()
+        res = await self.session.execute(select(pairs.c.room_id, pairs.c.day).order_by(pairs.c.room_id, pairs.c.day))
+        return [(room_id, day) for room_id, day in res.all()]
+
+    async def get_by_room_and_days(self, room_id: int, day_from: date, day_to: date) -> list[RoomDayAvailability]:
+        """
+        Summary rows for a room in [day_from, day_to], ordered by day.
+        """
+        stmt = (
+            select(self._model_cls)
+            .where(self._model_cls.room_id == room_id)
+            .where(self._model_cls.day >= day_from)
+            .where(self._model_cls.day <= day_to)
+            .order_by(self._model_cls.day)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
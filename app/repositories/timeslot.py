@@ -1,13 +1,23 @@
 from datetime import datetime
+from decimal import Decimal
 
-from sqlalchemy import select, and_
+from pydantic import TypeAdapter
+from sqlalchemy import Integer, any_, bindparam, select, and_, exists, func, literal_column, Select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import aliased
 
-from app.models import Booking
+from app.models import Booking, Room
 from app.models.booking import BookingStatus
-from app.models.timeslot import TimeSlot
-from app.repositories.base import BaseRepository
+from app.models.room import RoomType
+from app.models.timeslot import TimeSlot, TimeSlotStatus
+from app.repositories.base import BaseRepository, dto_json_object, json_array
+from app.schemas.timeslot import STimeSlotOutWithBookingStatus
+
+# advisory lock namespace for timeslots being booked (see BOOKING_LOCK_STRATEGY)
+_BOOKING_ADVISORY_LOCK_NAMESPACE = 30_002
+
+_SLOTS_WITH_BOOKING_FLAG = TypeAdapter(list[STimeSlotOutWithBookingStatus])
 
 
 class TimeSlotRepository(BaseRepository[TimeSlot]):
@@ -19,29 +29,78 @@ class TimeSlotRepository(BaseRepository[TimeSlot]):
         :param timeslot_id:
         :return: timeslot: TimeSlot, has_active_booking: bool
         """
-        ActiveBooking = aliased(Booking, name="active_booking")
-
         stmt = (
-            select(
-                self._model_cls,
-                (ActiveBooking.id.is_not(None)).label("has_active_booking"),
-            )
-            .join(
-                ActiveBooking,
-                and_(
-                    ActiveBooking.timeslot_id == self._model_cls.id,
-                    ActiveBooking.status.in_(
-                        [BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]
-                    ),
-                ),
-                isouter=True,  # LEFT JOIN
-            )
+            select(self._model_cls)
             .where(self._model_cls.id == timeslot_id)
-            .with_for_update(of=self._model_cls)
+            .with_for_update()
         )
+        timeslot = (await self.session.execute(stmt)).scalar_one_or_none()
 
-        result = await self.session.execute(stmt)
-        row = result.one_or_none()  # Row | None
+        if timeslot is None:
+            raise NoResultFound
+
+        # Checked in a separate statement on purpose: after waiting for the row lock,
+        # READ COMMITTED re-checks only the locked row, so an active booking joined into
+        # the locking query would still be read from the old snapshot and be missed.
+        has_active_booking = (await self.session.execute(
+            select(self._active_booking_exists(timeslot_id))
+        )).scalar_one()
+
+        return timeslot, has_active_booking
+
+    async def lock_time_slots_for_booking(self, timeslot_ids: list[int]) -> tuple[list[TimeSlot], set[int]]:
+        """
+        Lock several timeslots for one booking in a single statement, in id order,
+        so two overlapping multi-slot bookings can't deadlock each other.
+        :param timeslot_ids:
+        :return: locked timeslots ordered by id, ids of those with an active booking
+        """
+        ids = sorted(set(timeslot_ids))
+        stmt = (
+            select(self._model_cls)
+            .where(self._model_cls.id == any_(bindparam("timeslot_ids", ids, type_=ARRAY(Integer))))
+            .order_by(self._model_cls.id)
+            .with_for_update()
+        )
+        timeslots = list((await self.session.execute(stmt)).scalars().all())
+
+        # separate statement for the same reason as in lock_time_slot_for_booking
+        return timeslots, await self._taken_ids(ids)
+
+    async def get_time_slots_for_booking(self, timeslot_ids: list[int]) -> tuple[list[TimeSlot], set[int]]:
+        """
+        Same as lock_time_slots_for_booking, without the row locks.
+        :param timeslot_ids:
+        :return: timeslots ordered by id, ids of those with an active booking
+        """
+        ids = sorted(set(timeslot_ids))
+        stmt = (
+            select(self._model_cls)
+            .where(self._model_cls.id == any_(bindparam("timeslot_ids", ids, type_=ARRAY(Integer))))
+            .order_by(self._model_cls.id)
+        )
+        timeslots = list((await self.session.execute(stmt)).scalars().all())
+        return timeslots, await self._taken_ids(ids)
+
+    async def _taken_ids(self, ids: list[int]) -> set[int]:
+        taken = await self.session.execute(
+            select(Booking.timeslot_id)
+            .where(Booking.timeslot_id == any_(bindparam("taken_ids", ids, type_=ARRAY(Integer))))
+            .where(Booking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]))
+        )
+        return set(taken.scalars().all())
+
+    async def get_time_slot_for_booking(self, timeslot_id: int) -> tuple[TimeSlot, bool]:
+        """
+        Same as lock_time_slot_for_booking, without the row lock.
+        :param timeslot_id:
+        :return: timeslot: TimeSlot, has_active_booking: bool
+        """
+        stmt = (
+            select(self._model_cls, self._active_booking_exists(timeslot_id).label("has_active_booking"))
+            .where(self._model_cls.id == timeslot_id)
+        )
+        row = (await self.session.execute(stmt)).one_or_none()
 
         if row is None:
             raise NoResultFound
@@ -50,44 +109,164 @@ class TimeSlotRepository(BaseRepository[TimeSlot]):
 
         return timeslot, has_active_booking
 
-    async def get_all_by_room_id_and_date_range(
+    @staticmethod
+    def _active_booking_exists(timeslot_id: int):
+        return (
+            select(Booking.id)
+            .where(Booking.timeslot_id == timeslot_id)
+            .where(Booking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]))
+            .exists()
+        )
+
+    async def try_advisory_lock_for_booking(self, timeslot_id: int) -> bool:
+        """
+        Take the transaction-scoped advisory lock of the timeslot without waiting.
+        :param timeslot_id:
+        :return: False if another transaction is booking this timeslot right now
+        """
+        res = await self.session.execute(
+            select(func.pg_try_advisory_xact_lock(_BOOKING_ADVISORY_LOCK_NAMESPACE, timeslot_id))
+        )
+        return bool(res.scalar_one())
+
+    async def try_advisory_locks_for_booking(self, timeslot_ids: list[int]) -> bool:
+        """
+        Take the booking advisory locks of several timeslots without waiting (try-locks
+        never wait, so the order can't deadlock). Locks taken before a miss are kept
+        until the transaction ends, which the caller's SlotAlreadyTaken rolls back.
+        :param timeslot_ids:
+        :return: False if another transaction is booking any of these timeslots right now
+        """
+        ids = func.unnest(bindparam("lock_ids", sorted(set(timeslot_ids)), type_=ARRAY(Integer))).column_valued("id")
+        res = await self.session.execute(
+            select(func.bool_and(func.pg_try_advisory_xact_lock(_BOOKING_ADVISORY_LOCK_NAMESPACE, ids)))
+        )
+        return bool(res.scalar_one())
+
+    async def list_by_room_id_and_date_range(
             self,
             room_id: int,
             date_from: datetime,
             date_to: datetime,
-    ) -> list[tuple[TimeSlot, bool]]:
+    ) -> list[STimeSlotOutWithBookingStatus]:
         """
-        Retrieve all timeslots for a room and a date range, with has_active_booking flag
-        :param room_id:
-        :param date_from:
-        :param date_to:
-        :return: list[tuple[TimeSlot, bool]]
+        Timeslots of a room within a date range, with the has_active_booking flag.
+        Read-only: selects only the DTO columns and maps the rows straight into DTOs.
         """
-        ActiveBooking = aliased(Booking, name="active_booking")
+        stmt = (
+            self._slots_with_booking_flag()
+            .where(self._model_cls.room_id == room_id)
+            .where(self._model_cls.start_datetime >= date_from)
+            .where(self._model_cls.end_datetime <= date_to)
+            .order_by(self._model_cls.start_datetime)
+        )
+        return await self._fetch_into(stmt, _SLOTS_WITH_BOOKING_FLAG)
 
+    async def list_by_room_ids_and_date_range(
+            self,
+            room_ids: list[int],
+            date_from: datetime,
+            date_to: datetime,
+    ) -> list[STimeSlotOutWithBookingStatus]:
+        """
+        Same as list_by_room_id_and_date_range, for several rooms in one query
+        (`room_id = ANY(:room_ids)`, a single array parameter whatever the number of rooms)
+        :return: DTOs ordered by room_id, start_datetime
+        """
         stmt = (
+            self._slots_with_booking_flag()
+            .where(self._model_cls.room_id == any_(bindparam("room_ids", room_ids, type_=ARRAY(Integer))))
+            .where(self._model_cls.start_datetime >= date_from)
+            .where(self._model_cls.end_datetime <= date_to)
+            .order_by(self._model_cls.room_id, self._model_cls.start_datetime)
+        )
+        return await self._fetch_into(stmt, _SLOTS_WITH_BOOKING_FLAG)
+
+    async def get_json_by_room_id_and_date_range(
+            self,
+            room_id: int,
+            date_from: datetime,
+            date_to: datetime,
+    ) -> str:
+        """
+        Same list as list_by_room_id_and_date_range, rendered by Postgres with
+        json_agg(json_build_object(...)): the JSON array text, no Python objects per row.
+        """
+        slots = (
+            self._slots_with_booking_flag()
+            .where(self._model_cls.room_id == room_id)
+            .where(self._model_cls.start_datetime >= date_from)
+            .where(self._model_cls.end_datetime <= date_to)
+            .subquery()
+        )
+        stmt = select(json_array(dto_json_object(slots.c, STimeSlotOutWithBookingStatus), slots.c.start_datetime))
+        return (await self.session.execute(stmt)).scalar_one()
+
+    def _slots_with_booking_flag(self) -> Select:
+        ActiveBooking = aliased(Booking, name="active_booking")
+        return (
             select(
-                self._model_cls,
-                # вернёт True, если есть строка брони, иначе False
+                self._model_cls.id,
+                self._model_cls.room_id,
+                self._model_cls.start_datetime,
+                self._model_cls.end_datetime,
+                self._model_cls.base_price,
+                self._model_cls.status,
                 (ActiveBooking.id.is_not(None)).label("has_active_booking"),
             )
             .join(
                 ActiveBooking,
                 and_(
                     ActiveBooking.timeslot_id == self._model_cls.id,
-                    ActiveBooking.status.in_(
-                        [BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]
-                    ),
+                    ActiveBooking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]),
                 ),
-                isouter=True,  # LEFT JOIN
+                isouter=True,
             )
-            .where(self._model_cls.room_id == room_id)
-            .where(self._model_cls.start_datetime >= date_from)
-            .where(self._model_cls.end_datetime <= date_to)
-            .order_by(self._model_cls.start_datetime)
         )
 
-        result = await self.session.execute(stmt)
-        rows = result.all()  # list[Row[TimeSlot, bool]]
+    async def search_free(
+            self,
+            date_from: datetime,
+            date_to: datetime,
+            location_id: int | None = None,
+            min_capacity: int | None = None,
+            room_type: RoomType | None = None,
+            max_price: Decimal | None = None,
+    ) -> list[tuple[TimeSlot, Room]]:
+        """
+        Free timeslots inside [date_from, date_to] across all active rooms matching the filters.
 
-        return [(slot, has_active_booking) for slot, has_active_booking in rows]
+        The window condition is written against the same `tstzrange(start, end, '[]')`
+        expression as the `timeslot_no_overlap_per_room` exclusion constraint, so the
+        lookup is served by its GiST index for every room at once.
+        :return: list[tuple[TimeSlot, Room]] ordered by start_datetime, room_id
+        """
+        slot_range = func.tstzrange(
+            self._model_cls.start_datetime, self._model_cls.end_datetime, literal_column("'[]'")
+        )
+        window = func.tstzrange(date_from, date_to, literal_column("'[]'"))
+        has_active_booking = exists().where(
+            Booking.timeslot_id == self._model_cls.id,
+            Booking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]),
+        )
+
+        stmt = (
+            select(self._model_cls, Room)
+            .join(Room, Room.id == self._model_cls.room_id)
+            .where(slot_range.op("<@")(window))
+            .where(self._model_cls.status == TimeSlotStatus.AVAILABLE)
+            .where(~has_active_booking)
+            .where(Room.is_active.is_(True))
+            .order_by(self._model_cls.start_datetime, self._model_cls.room_id)
+        )
+        if location_id is not None:
+            stmt = stmt.where(Room.location_id == location_id)
+        if min_capacity is not None:
+            stmt = stmt.where(Room.capacity >= min_capacity)
+        if room_type is not None:
+            stmt = stmt.where(Room.type == room_type)
+        if max_price is not None:
+            stmt = stmt.where(self._model_cls.base_price <= max_price)
+
+        result = await self.session.execute(stmt)
+        return [(slot, room) for slot, room in result.all()]
@@ -13,3 +13,21 @@ class BaseSchema(BaseModel):
         - использует pydantic v2 model_validate
         """
         return cls.model_validate(model_obj)
+
+
+class RawJSON(str):
+    """
+    JSON text that is already rendered (by Postgres json_agg, or from DTOs once per
+    cache fill): responses and the cache pass it through without parsing it into DTOs.
+
+    `encoded` optionally carries the same body precompressed with `content_encoding`
+    (stored next to the cache entry); FastJSONResponse then sends those bytes.
+    """
+    content_encoding: str | None = None
+    encoded: bytes | None = None
+
+    def with_encoded(self, content_encoding: str, encoded: bytes) -> "RawJSON":
+        raw = RawJSON(self)
+        raw.content_encoding = content_encoding
+        raw.encoded = encoded
+        return raw
@@ -1,6 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
 
+from pydantic import Field
+
+from app.config import settings
 from app.models.booking import BookingStatus
 from app.schemas import BaseSchema
 from app.schemas.timeslot import STimeSlotOut
@@ -38,6 +41,10 @@ class SBookingCreate(BaseSchema):
     timeslot_id: int
 
 
+class SBookingBatchCreate(BaseSchema):
+    timeslot_ids: list[int] = Field(min_length=1, max_length=settings.BOOKING_BATCH_MAX_SLOTS)
+
+
 class SBookingFilters(BaseSchema):
     room_id: int | None = None
     status: BookingStatus | None = None
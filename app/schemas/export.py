@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ExportEntity(str, Enum):
+    BOOKINGS = "bookings"
+    PAYMENTS = "payments"
+    TIMESLOTS = "timeslots"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from app.models.payment import PaymentStatus
 from app.schemas import BaseSchema
 
@@ -15,3 +17,14 @@ class SPaymentOut(SPaymentBase):
 class SPaymentCreate(BaseSchema):
     booking_id: int
     external_id: str
+
+
+class SPaymentWebhook(BaseSchema):
+    event_id: str
+    external_id: str
+    status: Literal[PaymentStatus.SUCCESS, PaymentStatus.FAILED]
+
+
+class SPaymentWebhookAck(BaseSchema):
+    event_id: str
+    duplicate: bool
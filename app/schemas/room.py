@@ -25,6 +25,17 @@ class SRoomOutWithLocation(SRoomOut):
     location: SLocationOut
 
 
+class SRoomSearchResult(SRoomOutWithLocation):
+    rank: float
+
+
+class SRoomSearchPage(BaseSchema):
+    items: list[SRoomSearchResult]
+    page: int
+    size: int
+    has_next: bool
+
+
 class SRoomCreate(BaseSchema):
     name: str
     capacity: int
@@ -0,0 +1,11 @@
+from datetime import date
+from decimal import Decimal
+
+from app.schemas import BaseSchema
+
+
+class SRoomDayAvailabilityOut(BaseSchema):
+    day: date
+    total_slots: int
+    free_slots: int
+    min_price: Decimal | None
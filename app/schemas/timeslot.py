@@ -1,6 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 
+from app.models.room import RoomType
 from app.models.timeslot import TimeSlotStatus
 from app.schemas import BaseSchema
 
@@ -21,6 +22,11 @@ class STimeSlotOutWithBookingStatus(STimeSlotOut):
     has_active_booking: bool
 
 
+class SRoomTimeSlots(BaseSchema):
+    room_id: int
+    timeslots: list[STimeSlotOutWithBookingStatus]
+
+
 class STimeSlotDateRange(BaseSchema):
     date_from: datetime
     date_to: datetime
@@ -41,3 +47,19 @@ class STimeSlotUpdate(BaseSchema):
 class STimeSlotFilters(BaseSchema):
     start_datetime: datetime | None = None
     end_datetime: datetime | None = None
+
+
+class STimeSlotSearch(BaseSchema):
+    date_from: datetime
+    date_to: datetime
+    location_id: int | None = None
+    min_capacity: int | None = None
+    room_type: RoomType | None = None
+    max_price: Decimal | None = None
+
+
+class STimeSlotSearchOut(STimeSlotOut):
+    location_id: int
+    room_name: str
+    capacity: int
+    room_type: RoomType | None
@@ -0,0 +1,19 @@
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from app.schemas import BaseSchema
+
+
+class SResourceVersion(BaseSchema):
+    """
+    Validator of a GET representation: `tag` changes whenever the body may change,
+    `last_modified` is the newest updated_at behind it when that is known.
+    """
+    tag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def of(cls, *parts: Any, last_modified: datetime | None = None) -> "SResourceVersion":
+        digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+        return cls(tag=digest, last_modified=last_modified)
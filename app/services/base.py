@@ -1,12 +1,15 @@
 import inspect
 from abc import ABC
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import TypeVar, Generic, List
 
+from sqlalchemy import Row
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BaseSQLModel
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, TableVersion
 from app.utils.err.base.not_found import NotFoundException
 
 T = TypeVar('T', bound=BaseSQLModel)
@@ -31,6 +34,14 @@ class BaseService(Generic[T], ABC):
         """
         return await self._repository.create(**data)
 
+    async def create_many(self, rows: list[dict]) -> List[T]:
+        """
+        Create several models via repo in one statement and return them.
+        :param rows: list of dicts with new model data
+        :return: Created models
+        """
+        return await self._repository.create_many(rows)
+
     async def update_by_id(self, _id: int, **data) -> T:
         """
         Update model via repo and return it.
@@ -121,3 +132,31 @@ class BaseService(Generic[T], ABC):
         :return: list[Model]
         """
         return await self._repository.get_all(desc=desc, offset=offset, limit=limit, **filters)
+
+    async def get_version(self, **filters) -> TableVersion:
+        """
+        Fingerprint of the filtered rows, see BaseRepository.get_version.
+
+        :param filters: any filters
+        :return: TableVersion
+        """
+        return await self._repository.get_version(**filters)
+
+    def column_names(self) -> list[str]:
+        return self._repository.column_names()
+
+    def stream_all(
+            self,
+            batch_size: int,
+            created_from: datetime | None = None,
+            created_to: datetime | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream all rows in batches from a server-side cursor, see BaseRepository.stream_all.
+
+        :param batch_size: rows fetched per round trip
+        :param created_from: optional created_at lower bound (inclusive)
+        :param created_to: optional created_at upper bound (exclusive)
+        :return: async iterator of row batches
+        """
+        return self._repository.stream_all(batch_size, created_from=created_from, created_to=created_to)
@@ -1,26 +1,63 @@
+from datetime import datetime
+
 from sqlalchemy.exc import NoResultFound
 
 from app.models import Booking, TimeSlot
 from app.models.booking import BookingStatus
 from app.repositories.booking import BookingRepository
-from app.schemas.booking import SBookingFilters
+from app.schemas.booking import SBookingFilters, SBookingOutWithTimeslots
 from app.schemas.timeslot import STimeSlotFilters
 from app.services.base import BaseService
 from app.utils.err.base.conflict import ConflictException
 from app.utils.err.base.not_found import NotFoundException
-from app.utils.err.booking import BookingNotFound
+from app.utils.err.booking import BookingNotFound, SlotAlreadyTaken
 
 
 class BookingService(BaseService[Booking]):
     _repository = BookingRepository
 
-    async def get_all_bookings_with_timeslots(
+    async def create_if_timeslot_free(self, **data) -> Booking:
+        """
+        Create a booking, relying on the active-booking unique index instead of a timeslot lock.
+        :param data: dict with new booking data
+        :return: Created booking
+        """
+        booking = await self._repository.create_if_timeslot_free(**data)
+        if booking is None:
+            raise SlotAlreadyTaken()
+        return booking
+
+    async def create_many_if_timeslots_free(self, rows: list[dict]) -> list[Booking]:
+        """
+        Create all bookings or none: if any timeslot already has an active booking,
+        raise SlotAlreadyTaken and let the transaction roll the others back.
+        :param rows: list of dicts with new booking data
+        :return: Created bookings
+        """
+        bookings = await self._repository.create_many_if_timeslots_free(rows)
+        if len(bookings) != len(rows):
+            raise SlotAlreadyTaken()
+        return bookings
+
+    async def list_bookings_with_timeslots(
+            self,
+            user_id: int,
+            booking_filters: SBookingFilters | None = None,
+            timeslot_filters: STimeSlotFilters | None = None,
+    ) -> list[SBookingOutWithTimeslots]:
+        return await self._repository.list_bookings_with_timeslots(
+            user_id=user_id,
+            booking_filters=booking_filters,
+            timeslot_filters=timeslot_filters,
+        )
+
+    async def get_json_bookings_with_timeslots(
             self,
             user_id: int,
             booking_filters: SBookingFilters | None = None,
             timeslot_filters: STimeSlotFilters | None = None,
-    ) -> list[tuple[Booking, TimeSlot]]:
-        return await self._repository.get_all_bookings_with_timeslots(
+    ) -> str:
+        return await self._repository.get_json_bookings_with_timeslots(
             user_id=user_id,
             booking_filters=booking_filters,
             timeslot_filters=timeslot_filters,
@@ -41,12 +78,27 @@ class BookingService(BaseService[Booking]):
         except NoResultFound:
             raise NotFoundException(f"Booking with id {booking_id} not found")
 
+    async def get_booking_version(
+            self,
+            booking_id: int,
+            user_id: int,
+            is_admin: bool
+    ) -> tuple[datetime, datetime] | None:
+        return await self._repository.get_booking_version(
+            booking_id=booking_id,
+            user_id=user_id,
+            is_admin=is_admin
+        )
+
     async def set_booking_paid(self, booking_id: int) -> Booking:
         try:
             return await self._repository.set_booking_paid(booking_id=booking_id)
         except NoResultFound:
             raise BookingNotFound()
 
+    async def set_bookings_paid(self, paid: list[tuple[int, datetime]]) -> list[tuple[int, int]]:
+        return await self._repository.set_bookings_paid(paid)
+
     async def cancel_booking(self, booking_id: int, user_id: int, is_admin: bool) -> bool:
         try:
             old_booking_status: BookingStatus = await self._repository.check_booking_status(
@@ -1,12 +1,17 @@
 import logging
 from datetime import datetime, timedelta, UTC
-from typing import List, Tuple
+from typing import List
 
-from app.celery_app.tasks import expire_booking
+from app.celery_app.publisher import task_publisher
+from app.celery_app.tasks import expire_booking, expire_bookings
 from app.config import settings
-from app.db.base import new_session
-from app.models import Booking, TimeSlot
+from app.db.base import new_session, run_after_commit
+from app.models import Booking
+from app.models.notificationlog import NotificationLogType
+from app.models.outbox import OutboxTopic
+from app.schemas import RawJSON
 from app.schemas.booking import (
+    SBookingBatchCreate,
     SBookingCreate,
     SBookingFilters,
     SBookingOut,
@@ -14,57 +19,173 @@ from app.schemas.booking import (
     SBookingOutWithTimeslots,
 )
 from app.schemas.timeslot import STimeSlotFilters, STimeSlotOut
+from app.schemas.version import SResourceVersion
 from app.services.booking import BookingService
 from app.services.business.base import BaseBusinessService
+from app.services.notificationlog import NotificationLogService
+from app.services.outbox import OutboxService
+from app.services.room_availability import RoomAvailabilityService
 from app.services.timeslot import TimeSlotService
-from app.utils.cache import CacheService
-from app.utils.cache import keys as cache_keys
+from app.utils.booking_gate import booking_gate
+from app.utils.cache import invalidate_room_timeslots
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _schedule_expiry(booking_id: int, expires_at: datetime) -> None:
+    try:
+        await task_publisher.publish(expire_booking, args=[booking_id], eta=expires_at)
+    except Exception:
+        logger.exception("failed to schedule expiry of booking %s", booking_id)
+
+
+async def _schedule_batch_expiry(booking_ids: tuple[int, ...], expires_at: datetime) -> None:
+    try:
+        await task_publisher.publish(expire_bookings, args=[list(booking_ids)], eta=expires_at)
+    except Exception:
+        logger.exception("failed to schedule expiry of bookings %s", booking_ids)
 
 
 class BookingsBusinessService(BaseBusinessService):
     booking_service: BookingService
     timeslot_service: TimeSlotService
+    room_availability_service: RoomAvailabilityService
+    outbox_service: OutboxService
+    notification_service: NotificationLogService
 
-    @new_session()
     async def create_booking(self, booking_data: SBookingCreate) -> SBookingOutAfterCreate:
-        timeslot = await self.timeslot_service.lock_time_slot_for_booking(booking_data.timeslot_id)
+        if not settings.BOOKING_GATE_ENABLED:
+            return await self._create_booking(booking_data)
+
+        # claimed before any DB work: contenders are turned away without a transaction
+        timeslot_id = booking_data.timeslot_id
+        token = await booking_gate.claim(timeslot_id)
+        if token is None:
+            return await self._create_booking(booking_data)
+
+        try:
+            booking = await self._create_booking(booking_data)
+        except BaseException:
+            await booking_gate.release(timeslot_id, token)
+            raise
+        await booking_gate.confirm(timeslot_id, token, until=booking.expires_at)
+        return booking
 
-        new_booking: Booking = await self.booking_service.create(
+    @new_session()
+    async def _create_booking(self, booking_data: SBookingCreate) -> SBookingOutAfterCreate:
+        strategy = settings.BOOKING_LOCK_STRATEGY
+        timeslot = await self.timeslot_service.acquire_time_slot_for_booking(booking_data.timeslot_id, strategy)
+
+        booking_values = dict(
             user_id=self.user_id,
             room_id=timeslot.room_id,
             timeslot_id=timeslot.id,
             total_price=timeslot.base_price,
             expires_at=datetime.now(UTC) + timedelta(seconds=settings.BOOKING_EXPIRE_SECONDS),
         )
-        try:
-            expire_booking.apply_async(args=[new_booking.id], eta=new_booking.expires_at)
-        except Exception as exc:
-            ...
-            # TODO сюда логгер
-        await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(timeslot.room_id))
+        if strategy == "optimistic":
+            new_booking: Booking = await self.booking_service.create_if_timeslot_free(**booking_values)
+        else:
+            new_booking: Booking = await self.booking_service.create(**booking_values)
+        await self.room_availability_service.refresh_timeslots_after_commit([timeslot])
+        if settings.BOOKING_EXPIRY_ENGINE == "eta":
+            if settings.OUTBOX_ENABLED:
+                await self.outbox_service.add_event(
+                    OutboxTopic.EXPIRE_BOOKING,
+                    {"booking_id": new_booking.id, "eta": new_booking.expires_at.isoformat()},
+                )
+            else:
+                run_after_commit(self.session, _schedule_expiry, new_booking.id, new_booking.expires_at)
+        run_after_commit(self.session, invalidate_room_timeslots, timeslot.room_id)
+        self._notify(NotificationLogType.BOOKING_CREATED, new_booking)
         return SBookingOutAfterCreate.from_model(new_booking)
 
+    async def create_bookings(self, booking_data: SBookingBatchCreate) -> List[SBookingOutAfterCreate]:
+        """
+        Book several timeslots atomically: either every slot is booked or none is.
+        """
+        if not settings.BOOKING_GATE_ENABLED:
+            return await self._create_bookings(booking_data)
+
+        # claimed in id order like the DB locks; a taken slot releases the claims made so far
+        tokens: dict[int, str] = {}
+        try:
+            for timeslot_id in sorted(set(booking_data.timeslot_ids)):
+                token = await booking_gate.claim(timeslot_id)
+                if token is not None:
+                    tokens[timeslot_id] = token
+            bookings = await self._create_bookings(booking_data)
+        except BaseException:
+            for timeslot_id, token in tokens.items():
+                await booking_gate.release(timeslot_id, token)
+            raise
+        for booking in bookings:
+            if booking.timeslot_id in tokens:
+                await booking_gate.confirm(booking.timeslot_id, tokens[booking.timeslot_id], until=booking.expires_at)
+        return bookings
+
     @new_session()
+    async def _create_bookings(self, booking_data: SBookingBatchCreate) -> List[SBookingOutAfterCreate]:
+        timeslots = await self.timeslot_service.acquire_time_slots_for_booking(
+            booking_data.timeslot_ids, settings.BOOKING_LOCK_STRATEGY
+        )
+
+        expires_at = datetime.now(UTC) + timedelta(seconds=settings.BOOKING_EXPIRE_SECONDS)
+        # ON CONFLICT backstop: under "optimistic" the unique index is the only guard
+        new_bookings: List[Booking] = await self.booking_service.create_many_if_timeslots_free([
+            dict(
+                user_id=self.user_id,
+                room_id=timeslot.room_id,
+                timeslot_id=timeslot.id,
+                total_price=timeslot.base_price,
+                expires_at=expires_at,
+            )
+            for timeslot in timeslots
+        ])
+        await self.room_availability_service.refresh_timeslots_after_commit(timeslots)
+
+        booking_ids = tuple(booking.id for booking in new_bookings)
+        if settings.BOOKING_EXPIRY_ENGINE == "eta":
+            if settings.OUTBOX_ENABLED:
+                await self.outbox_service.add_event(
+                    OutboxTopic.EXPIRE_BOOKINGS,
+                    {"booking_ids": list(booking_ids), "eta": expires_at.isoformat()},
+                )
+            else:
+                run_after_commit(self.session, _schedule_batch_expiry, booking_ids, expires_at)
+        for room_id in sorted({timeslot.room_id for timeslot in timeslots}):
+            run_after_commit(self.session, invalidate_room_timeslots, room_id)
+        for booking in new_bookings:
+            self._notify(NotificationLogType.BOOKING_CREATED, booking)
+        return [SBookingOutAfterCreate.from_model(booking) for booking in new_bookings]
+
+    @new_session(readonly=True)
     async def get_my_bookings(
         self,
         booking_filters: SBookingFilters | None = None,
         timeslot_filters: STimeSlotFilters | None = None,
     ) -> List[SBookingOutWithTimeslots]:
-        bookings_with_timeslots: List[Tuple[Booking, TimeSlot]] = (
-            await self.booking_service.get_all_bookings_with_timeslots(
-                user_id=self.user_id,
-                booking_filters=booking_filters,
-                timeslot_filters=timeslot_filters,
-            )
+        return await self.booking_service.list_bookings_with_timeslots(
+            user_id=self.user_id,
+            booking_filters=booking_filters,
+            timeslot_filters=timeslot_filters,
         )
 
-        return [
-            SBookingOutWithTimeslots(
-                booking=SBookingOut.from_model(booking),
-                timeslot=STimeSlotOut.from_model(timeslot),
-            )
-            for booking, timeslot in bookings_with_timeslots
-        ]
+    @new_session(readonly=True)
+    async def get_my_bookings_json(
+        self,
+        booking_filters: SBookingFilters | None = None,
+        timeslot_filters: STimeSlotFilters | None = None,
+    ) -> RawJSON:
+        """
+        get_my_bookings rendered by Postgres (POSTGRES_JSON_LISTS).
+        """
+        return RawJSON(await self.booking_service.get_json_bookings_with_timeslots(
+            user_id=self.user_id,
+            booking_filters=booking_filters,
+            timeslot_filters=timeslot_filters,
+        ))
 
     @new_session(readonly=True)
     async def get_booking_by_id(self, booking_id: int) -> SBookingOutWithTimeslots:
@@ -77,6 +198,19 @@ class BookingsBusinessService(BaseBusinessService):
             timeslot=STimeSlotOut.from_model(timeslot),
         )
 
+    @new_session(readonly=True)
+    async def get_booking_version(self, booking_id: int) -> SResourceVersion | None:
+        """
+        Version of get_booking_by_id(booking_id); None if the booking is missing or not
+        visible to the caller, so get_booking_by_id answers with the usual error.
+        """
+        updated = await self.booking_service.get_booking_version(
+            user_id=self.user_id, booking_id=booking_id, is_admin=self.admin
+        )
+        if updated is None:
+            return None
+        return SResourceVersion.of("booking", booking_id, *updated, last_modified=max(updated))
+
     @new_session()
     async def cancel_booking(self, booking_id: int) -> bool:
         booking: Booking = await self.booking_service.get_one_by_id(booking_id)
@@ -85,5 +219,20 @@ class BookingsBusinessService(BaseBusinessService):
             user_id=self.user_id,
             is_admin=self.admin,
         )
-        await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(booking.room_id))
+        await self.room_availability_service.refresh_days_after_commit(
+            await self.room_availability_service.get_days_for_timeslots([booking.timeslot_id])
+        )
+        run_after_commit(self.session, invalidate_room_timeslots, booking.room_id)
+        if settings.BOOKING_GATE_ENABLED:
+            run_after_commit(self.session, booking_gate.clear, booking.timeslot_id)
+        self._notify(NotificationLogType.BOOKING_CANCELED, booking)
         return result
+
+    def _notify(self, notification_type: NotificationLogType, booking: Booking) -> None:
+        if settings.NOTIFICATIONS_ENABLED:
+            self.notification_service.queue(
+                notification_type,
+                user_id=booking.user_id,
+                booking_id=booking.id,
+                payload={"timeslot_id": booking.timeslot_id, "room_id": booking.room_id},
+            )
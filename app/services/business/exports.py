@@ -0,0 +1,84 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic_core import to_json
+from sqlalchemy import Row
+
+from app.config import settings
+from app.db.base import get_session
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.base import BaseService
+from app.services.booking import BookingService
+from app.services.business.base import BaseBusinessService
+from app.services.payment import PaymentService
+from app.services.timeslot import TimeSlotService
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _ndjson(columns: list[str], rows: Sequence[Row]) -> bytes:
+    return b"".join(to_json(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def _csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class ExportBusinessService(BaseBusinessService):
+    booking_service: BookingService
+    payment_service: PaymentService
+    timeslots_service: TimeSlotService
+
+    def _service_for(self, entity: ExportEntity) -> BaseService:
+        if entity == ExportEntity.BOOKINGS:
+            return self.booking_service
+        if entity == ExportEntity.PAYMENTS:
+            return self.payment_service
+        return self.timeslots_service
+
+    async def stream(
+            self,
+            entity: ExportEntity,
+            export_format: ExportFormat,
+            created_from: datetime | None = None,
+            created_to: datetime | None = None,
+            batch_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Encoded export chunks, one per EXPORT_BATCH_SIZE rows of a server-side cursor.
+
+        The session is opened here rather than with @new_session: the generator is
+        consumed by StreamingResponse after the route has returned, and it must keep
+        the cursor open until the last chunk is sent (or the client goes away).
+        """
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        async with get_session(readonly=True) as session:
+            self.session = session
+            try:
+                service = self._service_for(entity)
+                columns = service.column_names()
+                if export_format == ExportFormat.CSV:
+                    yield _csv([columns])
+
+                async for rows in service.stream_all(batch_size, created_from=created_from, created_to=created_to):
+                    if export_format == ExportFormat.CSV:
+                        yield _csv(rows)
+                    else:
+                        yield _ndjson(columns, rows)
+            finally:
+                self.session = None
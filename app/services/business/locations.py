@@ -1,14 +1,16 @@
+import time
 from typing import List
 
-from app.db.base import new_session
+from app.db.base import new_session, run_after_commit
 from app.models import Location, Room
 from app.config import settings
 from app.schemas.location import SLocationOut, SLocationCreate, SLocationUpdate
 from app.schemas.room import SRoomOut
+from app.schemas.version import SResourceVersion
 from app.services.business.base import BaseBusinessService
 from app.services.location import LocationService
 from app.services.room import RoomService
-from app.utils.cache import CacheService, keys
+from app.utils.cache import CacheService, invalidate_pattern, keys
 
 
 class LocationBusinessService(BaseBusinessService):
@@ -30,6 +32,17 @@ class LocationBusinessService(BaseBusinessService):
 
         return retult
 
+    @new_session(readonly=True)
+    async def get_all_version(self) -> SResourceVersion:
+        """
+        Version of get_all() from one aggregate query. Includes the cache TTL window:
+        the list may come from a cache entry filled just before a change, and an ETag
+        must not outlive that entry.
+        """
+        version = await self.location_service.get_version()
+        window = int(time.time() // settings.LOCATION_CACHE_TTL_SECONDS)
+        return SResourceVersion.of("locations", version, window, last_modified=version.last_modified)
+
     @new_session(readonly=True)
     async def get_by_id(self, location_id: int) -> SLocationOut:
         location: Location = await self.location_service.get_one_by_id(location_id)
@@ -38,7 +51,7 @@ class LocationBusinessService(BaseBusinessService):
     @new_session()
     async def create_location(self, location_data: SLocationCreate) -> SLocationOut:
         location: Location = await self.location_service.create(**location_data.model_dump())
-        await CacheService().delete_pattern(keys.locations_all())
+        run_after_commit(self.session, invalidate_pattern, keys.locations_all())
         return SLocationOut.from_model(location)
 
     @new_session()
@@ -47,13 +60,15 @@ class LocationBusinessService(BaseBusinessService):
             location_id,
             **location_data.model_dump(exclude_unset=True)
         )
-        await CacheService().delete_pattern(keys.locations_all())
+        run_after_commit(self.session, invalidate_pattern, keys.locations_all())
+        run_after_commit(self.session, invalidate_pattern, keys.rooms_search_prefix())
         return SLocationOut.from_model(location)
 
     @new_session()
     async def delete_by_id(self, location_id: int) -> None:
         await self.location_service.delete_by_id(location_id)
-        await CacheService().delete_pattern(keys.locations_all())
+        run_after_commit(self.session, invalidate_pattern, keys.locations_all())
+        run_after_commit(self.session, invalidate_pattern, keys.rooms_search_prefix())
 
     @new_session(readonly=True)
     async def get_rooms_by_location_id(self, location_id: int) -> List[SRoomOut]:
@@ -1,38 +1,65 @@
-from faker import Faker
+from decimal import Decimal
 
+from app.config import settings
 from app.db.base import new_session
 from app.models import Payment, Booking
+from app.models.notificationlog import NotificationLogType
 from app.models.payment import PaymentStatus
-from app.schemas.payment import SPaymentCreate, SPaymentOut
+from app.schemas.payment import SPaymentCreate, SPaymentOut, SPaymentWebhook, SPaymentWebhookAck
 from app.services.booking import BookingService
 from app.services.business.base import BaseBusinessService
+from app.services.notificationlog import NotificationLogService
 from app.services.payment import PaymentService
+from app.services.payment_webhook import PaymentWebhookService
 from app.utils.err.base.not_found import NotFoundException
 from app.utils.err.booking import BookingNotFound
 from app.utils.err.payment import PaymentNotFound
+from app.utils.payment_gateway import get_payment_gateway
 
 
 class PaymentBusinessService(BaseBusinessService):
     payment_service: PaymentService
     booking_service: BookingService
+    notification_service: NotificationLogService
+    payment_webhook_service: PaymentWebhookService
 
-    @new_session()
     async def create_payment(self, booking_id: int) -> SPaymentOut:
+        """
+        The provider is called between two short transactions, so no row lock or
+        pooled connection is held while waiting on the network.
+        """
+        amount = await self._payable_amount(booking_id)
+        external_id = await get_payment_gateway().create_payment(booking_id, amount)
+        return await self._store_payment(booking_id, external_id)
 
+    @new_session(readonly=True)
+    async def _payable_amount(self, booking_id: int) -> Decimal:
         booking = await self.booking_service.get_one_by_id(booking_id)
 
         if not self.admin and booking.user_id != self.user_id:
             raise BookingNotFound()
 
+        return booking.total_price
+
+    @new_session()
+    async def _store_payment(self, booking_id: int, external_id: str) -> SPaymentOut:
         payment: Payment = await self.payment_service.create(
             **SPaymentCreate(
                 booking_id=booking_id,
-                external_id=Faker().uuid4(),
+                external_id=external_id,
             ).model_dump()
         )
 
         return SPaymentOut.from_model(payment)
 
+    @new_session()
+    async def accept_webhook(self, event: SPaymentWebhook) -> SPaymentWebhookAck:
+        """
+        Enqueue a provider callback with one INSERT; app.payments.apply_webhooks applies it.
+        """
+        accepted = await self.payment_webhook_service.enqueue(event)
+        return SPaymentWebhookAck(event_id=event.event_id, duplicate=not accepted)
+
     @new_session()
     async def confirm_payment(self, payment_id: int) -> SPaymentOut:
         try:
@@ -44,6 +71,13 @@ class PaymentBusinessService(BaseBusinessService):
             raise PaymentNotFound()
 
         updated_payment: Payment = await self.payment_service.update_by_id(payment_id, status=PaymentStatus.SUCCESS)
-        await self.booking_service.set_booking_paid(updated_payment.booking_id)
+        paid_booking: Booking = await self.booking_service.set_booking_paid(updated_payment.booking_id)
+        if settings.NOTIFICATIONS_ENABLED:
+            self.notification_service.queue(
+                NotificationLogType.BOOKING_PAID,
+                user_id=paid_booking.user_id,
+                booking_id=paid_booking.id,
+                payload={"payment_id": updated_payment.id},
+            )
 
         return SPaymentOut.from_model(updated_payment)
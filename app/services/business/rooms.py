@@ -1,31 +1,63 @@
-from typing import List
+import asyncio
+import base64
+import time
+from typing import Awaitable, Callable, List
 
-from app.db.base import new_session
+from pydantic_core import to_json
+
+from app.db.base import new_session, run_after_commit
 from app.models import Room
-from app.schemas.room import SRoomOut, SRoomCreate, SRoomUpdate, SRoomOutWithLocation
-from app.schemas.timeslot import STimeSlotDateRange, STimeSlotOutWithBookingStatus, STimeSlotCreate, STimeSlotOut
+from app.schemas import RawJSON
+from app.schemas.room import (
+    SRoomCreate,
+    SRoomOut,
+    SRoomOutWithLocation,
+    SRoomSearchPage,
+    SRoomSearchResult,
+    SRoomUpdate,
+)
+from app.schemas.room_availability import SRoomDayAvailabilityOut
+from app.schemas.timeslot import (
+    SRoomTimeSlots,
+    STimeSlotCreate,
+    STimeSlotDateRange,
+    STimeSlotOut,
+    STimeSlotOutWithBookingStatus,
+)
+from app.schemas.version import SResourceVersion
 from app.config import settings
 from app.services.business.base import BaseBusinessService
 from app.services.location import LocationService
-from app.services.room import RoomService
+from app.services.room import SEARCH_MIN_LENGTH, RoomService
+from app.services.room_availability import RoomAvailabilityService
 from app.services.timeslot import TimeSlotService
-from app.utils.cache import keys as cache_keys
+from app.utils.cache import invalidate_pattern, invalidate_room_timeslots, keys as cache_keys
 from app.utils.cache.cache_service import CacheService
+from app.utils.compression import precompress
 
 
 class RoomBusinessService(BaseBusinessService):
     location_service: LocationService
     room_service: RoomService
     timeslots_service: TimeSlotService
+    room_availability_service: RoomAvailabilityService
 
     @new_session(readonly=True)
     async def get_all_with_location(self) -> list[SRoomOutWithLocation]:
         rooms = await self.room_service.get_all_with_location()
         return [SRoomOutWithLocation.from_model(room) for room in rooms]
 
+    @new_session(readonly=True)
+    async def get_all_with_location_version(self) -> SResourceVersion:
+        rooms = await self.room_service.get_version()
+        locations = await self.location_service.get_version()
+        last_modified = max(filter(None, (rooms.last_modified, locations.last_modified)), default=None)
+        return SResourceVersion.of("rooms", rooms, locations, last_modified=last_modified)
+
     @new_session()
     async def create_by_location_id(self, location_id: int, room_data: SRoomCreate) -> SRoomOut:
         room: Room = await self.room_service.create(location_id=location_id, **room_data.model_dump())
+        run_after_commit(self.session, invalidate_pattern, cache_keys.rooms_search_prefix())
         return SRoomOut.from_model(room)
 
     @new_session(readonly=True)
@@ -33,17 +65,56 @@ class RoomBusinessService(BaseBusinessService):
         room: Room = await self.room_service.get_one_by_id(room_id)
         return SRoomOut.from_model(room)
 
+    @new_session(readonly=True)
+    async def get_version(self, room_id: int) -> SResourceVersion | None:
+        """
+        Version of get_by_id(room_id), None if there is no such room (let get_by_id answer)
+        """
+        version = await self.room_service.get_version(id=room_id)
+        if not version.count:
+            return None
+        return SResourceVersion.of("room", room_id, version, last_modified=version.last_modified)
+
     @new_session()
     async def update_by_id(self, room_id: int, room_data: SRoomUpdate) -> SRoomOut:
         room: Room = await self.room_service.update_by_id(
             room_id,
             **room_data.model_dump(exclude_unset=True)
         )
+        run_after_commit(self.session, invalidate_room_timeslots, room_id)
+        run_after_commit(self.session, invalidate_pattern, cache_keys.rooms_search_prefix())
         return SRoomOut.from_model(room)
 
     @new_session()
     async def delete_by_id(self, room_id: int) -> None:
         await self.room_service.delete_by_id(room_id)
+        run_after_commit(self.session, invalidate_room_timeslots, room_id)
+        run_after_commit(self.session, invalidate_pattern, cache_keys.rooms_search_prefix())
+
+    @new_session(readonly=True)
+    async def search(self, query: str, page: int, size: int) -> SRoomSearchPage:
+        query = " ".join(query.lower().split())
+        if len(query) < SEARCH_MIN_LENGTH:
+            return SRoomSearchPage(items=[], page=page, size=size, has_next=False)
+        cache = CacheService[SRoomSearchPage](model=SRoomSearchPage)
+        cache_key = cache_keys.rooms_search(query=query, page=page, size=size)
+        cached = await cache.try_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # one extra row tells whether a next page exists without a COUNT(*)
+        rows = await self.room_service.search(query=query, offset=(page - 1) * size, limit=size + 1)
+        result = SRoomSearchPage(
+            items=[
+                SRoomSearchResult(**SRoomOutWithLocation.from_model(room).model_dump(), rank=rank)
+                for room, rank in rows[:size]
+            ],
+            page=page,
+            size=size,
+            has_next=len(rows) > size,
+        )
+        await cache.try_set(cache_key, result, ttl=settings.ROOM_SEARCH_CACHE_TTL_SECONDS)
+        return result
 
     @new_session(readonly=True)
     async def get_timeslots_by_date_range_with_booking_flag(
@@ -51,7 +122,13 @@ class RoomBusinessService(BaseBusinessService):
             room_id: int,
             date_range: STimeSlotDateRange
     ) -> List[STimeSlotOutWithBookingStatus]:
+        return await self._timeslots_with_booking_flag(room_id, date_range)
 
+    async def _timeslots_with_booking_flag(
+            self,
+            room_id: int,
+            date_range: STimeSlotDateRange
+    ) -> List[STimeSlotOutWithBookingStatus]:
         cache = CacheService[List[STimeSlotOutWithBookingStatus]](model=STimeSlotOutWithBookingStatus, collection=True)
         cache_key = cache_keys.timeslots_by_room_and_range(
             room_id=room_id, date_from=date_range.date_from, date_to=date_range.date_to
@@ -62,18 +139,11 @@ class RoomBusinessService(BaseBusinessService):
             timeslot_dicts = cached
         else:
             print("NOT CACHED")
-            timeslots_with_booking = await self.timeslots_service.get_all_by_room_id_and_date_range(
+            timeslot_dicts = await self.timeslots_service.list_by_room_id_and_date_range(
                 room_id=room_id,
                 date_from=date_range.date_from,
                 date_to=date_range.date_to,
             )
-            timeslot_dicts: List[STimeSlotOutWithBookingStatus] = [
-                STimeSlotOutWithBookingStatus(
-                    **STimeSlotOut.from_model(slot).model_dump(),
-                    has_active_booking=has_active_booking,
-                )
-                for slot, has_active_booking in timeslots_with_booking
-            ]
             # CACHE! Key: timeslots:{room_id}:{date_from}:{date_to} TTL: 30s
             await cache.try_set(
                 cache_key,
@@ -83,8 +153,160 @@ class RoomBusinessService(BaseBusinessService):
 
         return timeslot_dicts
 
+    @staticmethod
+    async def get_timeslots_version(room_id: int, date_range: STimeSlotDateRange) -> SResourceVersion | None:
+        """
+        Version of the room's timeslot listings from its cache generation (bumped by
+        invalidate_room_timeslots on every slot and booking change): no query at all.
+        Read it before the listing. The cache TTL window bounds an entry filled just
+        before a change. None while Redis is unavailable.
+        """
+        generation = await CacheService().get_generation(cache_keys.timeslots_generation(room_id))
+        if generation is None:
+            return None
+        window = int(time.time() // settings.TIMESLOT_CACHE_TTL_SECONDS)
+        return SResourceVersion.of(
+            "timeslots", room_id, date_range.date_from, date_range.date_to, generation, window
+        )
+
+    @new_session(readonly=True)
+    async def get_timeslots_body_by_date_range(
+            self,
+            room_id: int,
+            date_range: STimeSlotDateRange,
+            content_encoding: str | None = None,
+    ) -> RawJSON:
+        """
+        get_timeslots_by_date_range_with_booking_flag as a response body: the DTOs are
+        rendered by pydantic-core once per cache fill, and the body (with its
+        precompressed copies, see _cached_body) is what gets cached. A miss goes through
+        the per-room DTO entry, which the batch listing shares.
+        """
+        cache_key = cache_keys.timeslots_body_by_room_and_range(
+            room_id=room_id, date_from=date_range.date_from, date_to=date_range.date_to
+        )
+
+        async def render() -> str:
+            return to_json(await self._timeslots_with_booking_flag(room_id, date_range)).decode("utf-8")
+
+        return await self._cached_body(cache_key, content_encoding, render)
+
+    @new_session(readonly=True)
+    async def get_timeslots_json_by_date_range(
+            self,
+            room_id: int,
+            date_range: STimeSlotDateRange,
+            content_encoding: str | None = None,
+    ) -> RawJSON:
+        """
+        get_timeslots_body_by_date_range rendered by Postgres (POSTGRES_JSON_LISTS):
+        the JSON text goes to Redis and to the response without building DTOs.
+        """
+        cache_key = cache_keys.timeslots_json_by_room_and_range(
+            room_id=room_id, date_from=date_range.date_from, date_to=date_range.date_to
+        )
+
+        async def render() -> str:
+            return await self.timeslots_service.get_json_by_room_id_and_date_range(
+                room_id=room_id,
+                date_from=date_range.date_from,
+                date_to=date_range.date_to,
+            )
+
+        return await self._cached_body(cache_key, content_encoding, render)
+
+    @staticmethod
+    async def _cached_body(
+            cache_key: str,
+            content_encoding: str | None,
+            render: Callable[[], Awaitable[str]],
+    ) -> RawJSON:
+        """
+        Rendered response body from the cache, or from `render` on a miss.
+
+        Bodies worth compressing are also stored precompressed in every available coding,
+        once per cache fill and in the same MULTI as the body; with `content_encoding` the
+        matching copy comes back with the body from the same MGET.
+        """
+        cache = CacheService()
+        lookup = [cache_key]
+        if content_encoding is not None:
+            lookup.append(cache_keys.compressed_body(cache_key, content_encoding))
+        cached, *cached_encoded = await cache.get_raw_many(lookup)
+        if cached is not None:
+            if cached_encoded and cached_encoded[0] is not None:
+                return RawJSON(cached).with_encoded(content_encoding, base64.b64decode(cached_encoded[0]))
+            return RawJSON(cached)
+
+        rendered = await render()
+        body = rendered.encode("utf-8")
+        encoded: dict[str, bytes] = {}
+        if settings.COMPRESSION_ENABLED and len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+            encoded = await asyncio.to_thread(precompress, body)
+        await cache.set_raw_many(
+            {
+                cache_key: rendered,
+                **{
+                    cache_keys.compressed_body(cache_key, encoding): base64.b64encode(data).decode("ascii")
+                    for encoding, data in encoded.items()
+                },
+            },
+            ttl=settings.TIMESLOT_CACHE_TTL_SECONDS,
+        )
+        if content_encoding in encoded:
+            return RawJSON(rendered).with_encoded(content_encoding, encoded[content_encoding])
+        return RawJSON(rendered)
+
+    @new_session(readonly=True)
+    async def get_timeslots_by_rooms_and_date_range(
+            self,
+            room_ids: List[int],
+            date_range: STimeSlotDateRange
+    ) -> List[SRoomTimeSlots]:
+        """
+        Batch version of get_timeslots_by_date_range_with_booking_flag.
+        Shares the per-room cache entries with it: cached rooms come from one MGET,
+        the rest from one query and are written back in one pipeline.
+        """
+        room_ids = list(dict.fromkeys(room_ids))
+        cache = CacheService[List[STimeSlotOutWithBookingStatus]](model=STimeSlotOutWithBookingStatus, collection=True)
+        cache_keys_by_room = {
+            room_id: cache_keys.timeslots_by_room_and_range(
+                room_id=room_id, date_from=date_range.date_from, date_to=date_range.date_to
+            )
+            for room_id in room_ids
+        }
+        cached = await cache.get_many(list(cache_keys_by_room.values()))
+        by_room: dict[int, List[STimeSlotOutWithBookingStatus]] = {
+            room_id: slots for room_id, slots in zip(room_ids, cached) if slots is not None
+        }
+
+        missing = [room_id for room_id in room_ids if room_id not in by_room]
+        if missing:
+            fetched: dict[int, List[STimeSlotOutWithBookingStatus]] = {room_id: [] for room_id in missing}
+            timeslots = await self.timeslots_service.list_by_room_ids_and_date_range(
+                room_ids=missing,
+                date_from=date_range.date_from,
+                date_to=date_range.date_to,
+            )
+            for slot in timeslots:
+                fetched[slot.room_id].append(slot)
+            await cache.set_many(
+                {cache_keys_by_room[room_id]: slots for room_id, slots in fetched.items()},
+                ttl=settings.TIMESLOT_CACHE_TTL_SECONDS,
+            )
+            by_room.update(fetched)
+
+        return [SRoomTimeSlots(room_id=room_id, timeslots=by_room[room_id]) for room_id in room_ids]
+
     @new_session()
     async def create_timeslot(self, room_id: int, timeslot_data: STimeSlotCreate) -> STimeSlotOut:
         new_slot = await self.timeslots_service.create(room_id=room_id, **timeslot_data.model_dump())
-        await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(room_id))
+        await self.room_availability_service.refresh_timeslots_after_commit([new_slot])
+        run_after_commit(self.session, invalidate_room_timeslots, room_id)
         return STimeSlotOut.from_model(new_slot)
+
+    @new_session(readonly=True)
+    async def get_month_availability(self, room_id: int, year: int, month: int) -> List[SRoomDayAvailabilityOut]:
+        days = await self.room_availability_service.get_month(room_id=room_id, year=year, month=month)
+        return [SRoomDayAvailabilityOut.from_model(day) for day in days]
@@ -1,28 +1,103 @@
-from app.db.base import new_session
-from app.schemas.timeslot import STimeSlotUpdate
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.config import settings
+from app.db.base import new_session, run_after_commit
+from app.schemas.timeslot import STimeSlotOut, STimeSlotSearch, STimeSlotSearchOut, STimeSlotUpdate
 from app.services.business.base import BaseBusinessService
 from app.services.location import LocationService
 from app.services.room import RoomService
+from app.services.room_availability import RoomAvailabilityService
 from app.services.timeslot import TimeSlotService
-from app.utils.cache import keys as cache_keys
+from app.utils.cache import invalidate_room_timeslots, keys as cache_keys
 from app.utils.cache.cache_service import CacheService
+from app.utils.err.booking import InvalidSearchWindow
+
+# search windows are widened to whole hours so nearby requests share one cache entry
+SEARCH_WINDOW_GRANULARITY = timedelta(hours=1)
+
+
+def _canonical_window(date_from: datetime, date_to: datetime) -> tuple[datetime, datetime]:
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start = epoch + (date_from - epoch) // SEARCH_WINDOW_GRANULARITY * SEARCH_WINDOW_GRANULARITY
+    end = epoch + -((epoch - date_to) // SEARCH_WINDOW_GRANULARITY) * SEARCH_WINDOW_GRANULARITY
+    return start, end
 
 
 class TimeSlotBusinessService(BaseBusinessService):
     location_service: LocationService
     room_service: RoomService
     timeslots_service: TimeSlotService
+    room_availability_service: RoomAvailabilityService
 
     @new_session()
     async def update_timeslot_by_id(self, timeslot_id: int, timeslot_data: STimeSlotUpdate):
+        days_before = await self.room_availability_service.get_days_for_timeslots([timeslot_id])
         updated = await self.timeslots_service.update_by_id(
             timeslot_id, **timeslot_data.model_dump(exclude_unset=True)
         )
-        await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(updated.room_id))
+        days_after = await self.room_availability_service.get_days_for_timeslots([timeslot_id])
+        await self.room_availability_service.refresh_days_after_commit(days_before | days_after)
+        # a slot moved to another room changes the listings of both rooms
+        for room_id in sorted({room_id for room_id, _ in days_before | days_after}):
+            run_after_commit(self.session, invalidate_room_timeslots, room_id)
         return updated
 
     @new_session()
     async def delete_timeslot_by_id(self, timeslot_id: int):
         timeslot = await self.timeslots_service.get_one_by_id(timeslot_id)
         await self.timeslots_service.delete_by_id(timeslot_id)
-        await CacheService().delete_pattern(cache_keys.timeslots_room_prefix(timeslot.room_id))
+        await self.room_availability_service.refresh_timeslots_after_commit([timeslot])
+        run_after_commit(self.session, invalidate_room_timeslots, timeslot.room_id)
+
+    @new_session(readonly=True)
+    async def search_free_timeslots(self, search: STimeSlotSearch) -> List[STimeSlotSearchOut]:
+        if search.date_from.tzinfo is None or search.date_to.tzinfo is None:
+            raise InvalidSearchWindow("date_from and date_to must be timezone-aware")
+        if search.date_to <= search.date_from:
+            raise InvalidSearchWindow("date_to must be after date_from")
+        if search.date_to - search.date_from > timedelta(days=settings.TIMESLOT_SEARCH_MAX_WINDOW_DAYS):
+            raise InvalidSearchWindow(
+                f"Search window is limited to {settings.TIMESLOT_SEARCH_MAX_WINDOW_DAYS} days"
+            )
+
+        window_from, window_to = _canonical_window(search.date_from, search.date_to)
+        cache = CacheService[List[STimeSlotSearchOut]](model=STimeSlotSearchOut, collection=True)
+        generation = await cache.get_generation(cache_keys.timeslots_search_generation())
+        cache_key = cache_keys.timeslots_search(
+            location_id=search.location_id,
+            date_from=window_from,
+            date_to=window_to,
+            min_capacity=search.min_capacity,
+            room_type=search.room_type.value if search.room_type else None,
+            max_price=search.max_price,
+            generation=generation,
+        )
+        found: List[STimeSlotSearchOut] | None = await cache.try_get(cache_key)
+
+        if found is None:
+            rows = await self.timeslots_service.search_free(
+                date_from=window_from,
+                date_to=window_to,
+                location_id=search.location_id,
+                min_capacity=search.min_capacity,
+                room_type=search.room_type,
+                max_price=search.max_price,
+            )
+            found = [
+                STimeSlotSearchOut(
+                    **STimeSlotOut.from_model(slot).model_dump(),
+                    location_id=room.location_id,
+                    room_name=room.name,
+                    capacity=room.capacity,
+                    room_type=room.type,
+                )
+                for slot, room in rows
+            ]
+            await cache.try_set(cache_key, found, ttl=settings.TIMESLOT_CACHE_TTL_SECONDS)
+
+        # the cached canonical window may be wider than the requested one
+        return [
+            slot for slot in found
+            if slot.start_datetime >= search.date_from and slot.end_datetime <= search.date_to
+        ]
@@ -0,0 +1,55 @@
+from typing import Any
+
+from app.db.base import run_before_commit
+from app.models.notificationlog import NotificationLog, NotificationLogStatus, NotificationLogType
+from app.repositories.notificationlog import NotificationLogRepository
+from app.services.base import BaseService
+
+_BUFFER_KEY = "notifications"
+
+
+class NotificationLogService(BaseService[NotificationLog]):
+    _repository = NotificationLogRepository
+
+    def queue(
+            self,
+            notification_type: NotificationLogType,
+            user_id: int,
+            booking_id: int,
+            payload: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Buffer a notification in the session; every notification of the transaction
+        is written as QUEUED with one multi-row INSERT right before commit
+        (get_session/new_session), or by an explicit flush() elsewhere.
+        """
+        self.session.info.setdefault(_BUFFER_KEY, []).append(dict(
+            user_id=user_id,
+            booking_id=booking_id,
+            type=notification_type,
+            payload={"booking_id": booking_id, **(payload or {})},
+        ))
+        run_before_commit(self.session, _flush, self.session, key=_BUFFER_KEY)
+
+    async def flush(self) -> int:
+        return await _flush(self.session)
+
+    async def claim_queued(self, batch_size: int, lease_seconds: float) -> list[NotificationLog]:
+        return await self._repository.claim_queued(batch_size, lease_seconds)
+
+    async def mark_sent(self, notification_ids: list[int]) -> None:
+        await self._repository.set_status(notification_ids, NotificationLogStatus.SENT)
+
+    async def mark_failed(self, notification_ids: list[int], max_attempts: int, backoff_seconds: float) -> int:
+        """
+        Requeue failed sends with backoff until `max_attempts`, then mark them FAILED.
+        :return: number of notifications marked FAILED
+        """
+        return await self._repository.retry_or_fail(notification_ids, max_attempts, backoff_seconds)
+
+
+async def _flush(session) -> int:
+    rows = session.info.pop(_BUFFER_KEY, [])
+    if rows:
+        await NotificationLogRepository(session).create_many(rows)
+    return len(rows)
@@ -0,0 +1,25 @@
+from typing import Any
+
+from app.models.outbox import OutboxEvent, OutboxTopic
+from app.repositories.outbox import OutboxRepository
+from app.services.base import BaseService
+
+
+class OutboxService(BaseService[OutboxEvent]):
+    _repository = OutboxRepository
+
+    async def add_event(self, topic: OutboxTopic, payload: dict[str, Any]) -> OutboxEvent:
+        """
+        Record a side effect in the current transaction; the relay performs it
+        after the transaction has committed.
+        """
+        return await self._repository.create(topic=topic.value, payload=payload)
+
+    async def claim_batch(self, batch_size: int, max_attempts: int) -> list[OutboxEvent]:
+        return await self._repository.claim_batch(batch_size=batch_size, max_attempts=max_attempts)
+
+    async def mark_published(self, event_ids: list[int]) -> None:
+        await self._repository.mark_published(event_ids)
+
+    async def mark_failed(self, event_id: int, error: str, backoff_seconds: float) -> None:
+        await self._repository.mark_failed(event_id, error, backoff_seconds)
@@ -1,7 +1,19 @@
+from datetime import datetime
+
 from app.models import Payment
+from app.models.payment import PaymentStatus
 from app.repositories.payment import PaymentRepository
 from app.services.base import BaseService
 
 
 class PaymentService(BaseService[Payment]):
     _repository = PaymentRepository
+
+    async def apply_provider_statuses(
+            self,
+            updates: list[tuple[str, PaymentStatus, datetime]],
+    ) -> list[tuple[int, PaymentStatus, datetime]]:
+        return await self._repository.apply_provider_statuses(updates)
+
+    async def get_known_external_ids(self, external_ids: list[str]) -> set[str]:
+        return await self._repository.get_known_external_ids(external_ids)
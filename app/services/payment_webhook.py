@@ -0,0 +1,26 @@
+from app.models.payment_webhook import PaymentWebhookEvent
+from app.repositories.payment_webhook import PaymentWebhookRepository
+from app.schemas.payment import SPaymentWebhook
+from app.services.base import BaseService
+
+
+class PaymentWebhookService(BaseService[PaymentWebhookEvent]):
+    _repository = PaymentWebhookRepository
+
+    async def enqueue(self, event: SPaymentWebhook) -> bool:
+        """
+        Durably accept a provider callback.
+        :return: False for a duplicate delivery
+        """
+        return await self._repository.enqueue(
+            event_id=event.event_id,
+            external_id=event.external_id,
+            status=event.status,
+            payload=event.model_dump(mode="json"),
+        )
+
+    async def claim_batch(self, batch_size: int, after_id: int = 0) -> list[PaymentWebhookEvent]:
+        return await self._repository.claim_batch(batch_size, after_id=after_id)
+
+    async def mark_processed(self, event_ids: list[int]) -> None:
+        await self._repository.mark_processed(event_ids)
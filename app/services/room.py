@@ -2,9 +2,15 @@ from app.models import Room
 from app.repositories.room import RoomRepository
 from app.services.base import BaseService
 
+# shorter patterns yield no pg_trgm trigram, so the search could not use the GIN indexes
+SEARCH_MIN_LENGTH = 3
+
 
 class RoomService(BaseService[Room]):
     _repository = RoomRepository
 
     async def get_all_with_location(self) -> list[Room]:
         return await self._repository.get_all_with_location()
+
+    async def search(self, query: str, offset: int, limit: int) -> list[tuple[Room, float]]:
+        return await self._repository.search(query=query, offset=offset, limit=limit)
@@ -0,0 +1,112 @@
+import calendar
+import logging
+from datetime import date, timezone
+from typing import Iterable
+
+from app.config import settings
+from app.db import base as db_base
+from app.db.base import run_after_commit
+from app.models import RoomDayAvailability, TimeSlot
+from app.models.outbox import OutboxTopic
+from app.repositories.room_availability import RoomAvailabilityRepository
+from app.services.base import BaseService
+from app.services.outbox import OutboxService
+
+logger = logging.getLogger(__name__)
+
+
+async def recompute_room_days(room_days: Iterable[tuple[int, date]]) -> None:
+    """
+    Recompute summary rows in a short transaction of their own, after the write
+    that changed them has committed: the advisory locks taken by refresh_days are
+    never held by booking, cancel or expiry transactions.
+    """
+    room_days = set(room_days)
+    if not room_days:
+        return
+    async with db_base.async_session_maker() as session:
+        await RoomAvailabilityRepository(session).refresh_days(room_days)
+        await session.commit()
+
+
+async def refresh_room_days(room_days: Iterable[tuple[int, date]]) -> None:
+    """
+    recompute_room_days for callers without an outbox event: a failed refresh is
+    logged and the days stay stale until the reconcile_room_availability beat task
+    recomputes them.
+    """
+    room_days = set(room_days)
+    try:
+        await recompute_room_days(room_days)
+    except Exception:
+        logger.exception("room availability refresh failed for %s", room_days)
+
+
+def room_days_payload(room_days: Iterable[tuple[int, date]]) -> dict[str, list]:
+    return {"room_days": [[room_id, day.isoformat()] for room_id, day in sorted(set(room_days))]}
+
+
+def room_days_from_payload(payload: dict[str, list]) -> set[tuple[int, date]]:
+    return {(room_id, date.fromisoformat(day)) for room_id, day in payload["room_days"]}
+
+
+def _day_of(timeslot: TimeSlot) -> tuple[int, date]:
+    return timeslot.room_id, timeslot.start_datetime.astimezone(timezone.utc).date()
+
+
+class RoomAvailabilityService(BaseService[RoomDayAvailability]):
+    _repository = RoomAvailabilityRepository
+
+    async def get_days_for_timeslots(self, timeslot_ids: Iterable[int]) -> set[tuple[int, date]]:
+        return await self._repository.get_days_for_timeslots(timeslot_ids)
+
+    async def refresh_days(self, room_days: Iterable[tuple[int, date]]) -> None:
+        await self._repository.refresh_days(room_days)
+
+    async def refresh_for_timeslots(self, timeslot_ids: Iterable[int]) -> None:
+        """
+        Recompute the summary for every (room, day) the given timeslots fall on.
+        """
+        room_days = await self._repository.get_days_for_timeslots(timeslot_ids)
+        await self._repository.refresh_days(room_days)
+
+    async def queue_refresh(self, room_days: Iterable[tuple[int, date]]) -> bool:
+        """
+        With OUTBOX_ENABLED, write the refresh of room_days into the outbox in the
+        current transaction: it is relayed after commit and retried until it
+        succeeds, even if the process dies right after the commit.
+        :return: False when the outbox is off and the caller has to refresh after commit
+        """
+        if not settings.OUTBOX_ENABLED:
+            return False
+        room_days = set(room_days)
+        if room_days:
+            await OutboxService(self.session).add_event(OutboxTopic.REFRESH_ROOM_DAYS, room_days_payload(room_days))
+        return True
+
+    async def refresh_days_after_commit(self, room_days: Iterable[tuple[int, date]]) -> None:
+        """
+        Refresh room_days once the current transaction has committed
+        (get_session/new_session only): through the outbox when it is enabled,
+        otherwise as an after-commit refresh_room_days.
+        """
+        room_days = set(room_days)
+        if not await self.queue_refresh(room_days):
+            run_after_commit(self.session, refresh_room_days, tuple(sorted(room_days)))
+
+    async def refresh_timeslots_after_commit(self, timeslots: Iterable[TimeSlot]) -> None:
+        """
+        refresh_days_after_commit for the (room, day) of already loaded timeslots.
+        """
+        await self.refresh_days_after_commit(_day_of(timeslot) for timeslot in timeslots)
+
+    async def get_days_between(self, day_from: date, day_to: date) -> list[tuple[int, date]]:
+        return await self._repository.get_days_between(day_from, day_to)
+
+    async def get_month(self, room_id: int, year: int, month: int) -> list[RoomDayAvailability]:
+        last_day = calendar.monthrange(year, month)[1]
+        return await self._repository.get_by_room_and_days(
+            room_id=room_id,
+            day_from=date(year, month, 1),
+            day_to=date(year, month, last_day),
+        )
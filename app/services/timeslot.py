@@ -1,9 +1,13 @@
 from datetime import datetime
+from decimal import Decimal
 
 from sqlalchemy.exc import NoResultFound
 
-from app.models import TimeSlot
+from app.config import BookingLockStrategy
+from app.models import Room, TimeSlot
+from app.models.room import RoomType
 from app.repositories.timeslot import TimeSlotRepository
+from app.schemas.timeslot import STimeSlotOutWithBookingStatus
 from app.services.base import BaseService
 from app.utils.err.booking import TimeSlotNotFound, SlotAlreadyTaken
 
@@ -11,18 +15,60 @@ from app.utils.err.booking import TimeSlotNotFound, SlotAlreadyTaken
 class TimeSlotService(BaseService[TimeSlot]):
     _repository = TimeSlotRepository
 
-    async def get_all_by_room_id_and_date_range(
+    async def list_by_room_id_and_date_range(
             self,
             room_id: int,
             date_from: datetime,
             date_to: datetime
-    ) -> list[tuple[TimeSlot, bool]]:
-        return await self._repository.get_all_by_room_id_and_date_range(
+    ) -> list[STimeSlotOutWithBookingStatus]:
+        return await self._repository.list_by_room_id_and_date_range(
             room_id=room_id,
             date_from=date_from,
             date_to=date_to
         )
 
+    async def list_by_room_ids_and_date_range(
+            self,
+            room_ids: list[int],
+            date_from: datetime,
+            date_to: datetime
+    ) -> list[STimeSlotOutWithBookingStatus]:
+        return await self._repository.list_by_room_ids_and_date_range(
+            room_ids=room_ids,
+            date_from=date_from,
+            date_to=date_to
+        )
+
+    async def get_json_by_room_id_and_date_range(
+            self,
+            room_id: int,
+            date_from: datetime,
+            date_to: datetime
+    ) -> str:
+        return await self._repository.get_json_by_room_id_and_date_range(
+            room_id=room_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+
+    async def search_free(
+            self,
+            date_from: datetime,
+            date_to: datetime,
+            location_id: int | None = None,
+            min_capacity: int | None = None,
+            room_type: RoomType | None = None,
+            max_price: Decimal | None = None,
+    ) -> list[tuple[TimeSlot, Room]]:
+        return await self._repository.search_free(
+            date_from=date_from,
+            date_to=date_to,
+            location_id=location_id,
+            min_capacity=min_capacity,
+            room_type=room_type,
+            max_price=max_price,
+        )
+
     async def lock_time_slot_for_booking(self, timeslot_id: int) -> TimeSlot:
         """
         Lock the timeslot for the booking and return timeslot
@@ -38,3 +84,78 @@ class TimeSlotService(BaseService[TimeSlot]):
             raise SlotAlreadyTaken()
 
         return timeslot
+
+    async def lock_time_slots_for_booking(self, timeslot_ids: list[int]) -> list[TimeSlot]:
+        """
+        Lock all timeslots of a multi-slot booking and return them ordered by id
+        :param timeslot_ids:
+        :return: list[TimeSlot]
+        """
+        timeslots, taken_ids = await self._repository.lock_time_slots_for_booking(timeslot_ids)
+
+        if len(timeslots) != len(set(timeslot_ids)):
+            raise TimeSlotNotFound()
+
+        if taken_ids:
+            raise SlotAlreadyTaken()
+
+        return timeslots
+
+    async def acquire_time_slots_for_booking(
+            self,
+            timeslot_ids: list[int],
+            strategy: BookingLockStrategy = "pessimistic",
+    ) -> list[TimeSlot]:
+        """
+        acquire_time_slot_for_booking for a multi-slot booking, with the same lock the
+        strategy takes for one slot, in id order. Returns the timeslots ordered by id.
+        :param timeslot_ids:
+        :param strategy: settings.BOOKING_LOCK_STRATEGY
+        :return: list[TimeSlot]
+        """
+        if strategy == "pessimistic":
+            return await self.lock_time_slots_for_booking(timeslot_ids)
+
+        if strategy == "advisory" and not await self._repository.try_advisory_locks_for_booking(timeslot_ids):
+            raise SlotAlreadyTaken()
+
+        timeslots, taken_ids = await self._repository.get_time_slots_for_booking(timeslot_ids)
+
+        if len(timeslots) != len(set(timeslot_ids)):
+            raise TimeSlotNotFound()
+
+        if taken_ids:
+            raise SlotAlreadyTaken()
+
+        return timeslots
+
+    async def acquire_time_slot_for_booking(
+            self,
+            timeslot_id: int,
+            strategy: BookingLockStrategy = "pessimistic",
+    ) -> TimeSlot:
+        """
+        Make sure the timeslot can be booked by this transaction and return timeslot.
+        pessimistic: SELECT ... FOR UPDATE, contenders queue on the row lock;
+        advisory: pg_try_advisory_xact_lock, contenders fail fast with SlotAlreadyTaken;
+        optimistic: no lock, the booking insert itself resolves the race
+        (see BookingService.create_if_timeslot_free).
+        :param timeslot_id:
+        :param strategy: settings.BOOKING_LOCK_STRATEGY
+        :return: TimeSlot
+        """
+        if strategy == "pessimistic":
+            return await self.lock_time_slot_for_booking(timeslot_id)
+
+        if strategy == "advisory" and not await self._repository.try_advisory_lock_for_booking(timeslot_id):
+            raise SlotAlreadyTaken()
+
+        try:
+            timeslot, has_active_booking = await self._repository.get_time_slot_for_booking(timeslot_id=timeslot_id)
+        except NoResultFound:
+            raise TimeSlotNotFound()
+
+        if has_active_booking:
+            raise SlotAlreadyTaken()
+
+        return timeslot
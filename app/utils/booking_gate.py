@@ -0,0 +1,113 @@
+import logging
+import uuid
+from datetime import datetime
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from app.config import settings
+from app.utils.cache import keys
+from app.utils.err.booking import SlotAlreadyTaken
+from app.utils.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class BookingGate:
+    """
+    Redis admission gate in front of the booking transaction.
+
+    `claim()` takes the timeslot with SET NX PX; a contender that finds the key
+    gets SlotAlreadyTaken without touching Postgres. Once the DB outcome is known
+    the claim is either released (rollback) or confirmed, i.e. kept until the
+    booking expires. Postgres stays the source of truth: the gate only sheds load,
+    and when Redis is unavailable every call degrades to a no-op.
+    """
+
+    def __init__(self, redis_client: Redis | None = None, claim_ttl_ms: int | None = None) -> None:
+        self._redis_client = redis_client
+        self._claim_ttl_ms = claim_ttl_ms
+
+    async def _client(self) -> Redis | None:
+        if self._redis_client is not None:
+            return self._redis_client
+        try:
+            return await get_redis()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _key(timeslot_id: int) -> str:
+        return f"{settings.REDIS_CACHE_PREFIX}{keys.booking_gate(timeslot_id)}"
+
+    async def claim(self, timeslot_id: int) -> str | None:
+        """
+        Claim the timeslot for one booking attempt.
+        :return: claim token, or None if Redis is unavailable (go straight to the DB)
+        :raises SlotAlreadyTaken: another attempt or booking holds the timeslot
+        """
+        client = await self._client()
+        if client is None:
+            return None
+
+        token = uuid.uuid4().hex
+        ttl_ms = self._claim_ttl_ms or settings.BOOKING_GATE_CLAIM_TTL_MS
+        try:
+            claimed = await client.set(self._key(timeslot_id), token, nx=True, px=ttl_ms)
+        except Exception:
+            logger.warning("booking gate unavailable, falling back to the database", exc_info=True)
+            return None
+
+        if not claimed:
+            raise SlotAlreadyTaken()
+        return token
+
+    async def release(self, timeslot_id: int, token: str) -> None:
+        """
+        Drop our claim after a failed attempt; a claim taken over by someone else is kept.
+        """
+        await self._if_owner(timeslot_id, token, lambda pipe, key: pipe.delete(key))
+
+    async def confirm(self, timeslot_id: int, token: str, until: datetime) -> None:
+        """
+        Keep our claim until the committed booking expires.
+        """
+        expire_at_ms = int(until.timestamp() * 1000)
+        await self._if_owner(timeslot_id, token, lambda pipe, key: pipe.pexpireat(key, expire_at_ms))
+
+    async def clear(self, timeslot_id: int) -> None:
+        """
+        Open the gate after the booking holding the timeslot was canceled or expired.
+        """
+        client = await self._client()
+        if client is None:
+            return
+        try:
+            await client.delete(self._key(timeslot_id))
+        except Exception:
+            logger.warning("failed to clear booking gate of timeslot %s", timeslot_id, exc_info=True)
+
+    async def _if_owner(self, timeslot_id: int, token: str, command) -> None:
+        # compare-and-act: WATCH aborts the transaction if the key changes after the GET
+        client = await self._client()
+        if client is None:
+            return
+
+        key = self._key(timeslot_id)
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(key)
+                if await pipe.get(key) != token:
+                    await pipe.unwatch()
+                    return
+                pipe.multi()
+                command(pipe, key)
+                await pipe.execute()
+        except WatchError:
+            return
+        except Exception:
+            # the claim still expires on its own after BOOKING_GATE_CLAIM_TTL_MS
+            logger.warning("failed to update booking gate of timeslot %s", timeslot_id, exc_info=True)
+
+
+booking_gate = BookingGate()
@@ -1,3 +1,4 @@
 from .cache_service import CacheService
+from .invalidation import invalidate_pattern, invalidate_room_timeslots
 
-__all__ = ["CacheService"]
+__all__ = ["CacheService", "invalidate_pattern", "invalidate_room_timeslots"]
@@ -1,4 +1,5 @@
 import json
+import time
 from typing import Generic, TypeVar, Type
 
 from redis.asyncio import Redis
@@ -171,6 +172,180 @@ class CacheService(Generic[T]):
         except Exception:
             return
 
+    async def get_raw(self, key: str) -> str | None:
+        """
+        Get the stored string by key as is (no deserialization) OR None
+        """
+        client = await self._client()
+        if client is None:
+            return None
+
+        try:
+            raw_value = await client.get(self._full_key(key))
+        except Exception:
+            return None
+
+        if isinstance(raw_value, bytes):
+            try:
+                raw_value = raw_value.decode("utf-8")
+            except Exception:
+                return None
+        return raw_value
+
+    async def set_raw(self, key: str, value: str, ttl: int | None = None) -> None:
+        """
+        Store an already serialized string by key + TTL in sec (ignore Redis errors)
+        """
+        client = await self._client()
+        if client is None:
+            return
+
+        try:
+            if ttl is not None:
+                await client.setex(self._full_key(key), ttl, value)
+            else:
+                await client.set(self._full_key(key), value)
+        except Exception:
+            return
+
+    async def get_raw_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get stored strings for several keys as is in one round trip (MGET).
+        Result is aligned with `keys`; missing entries are None.
+        """
+        if not keys:
+            return []
+
+        client = await self._client()
+        if client is None:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await client.mget([self._full_key(key) for key in keys])
+        except Exception:
+            return [None] * len(keys)
+
+        values: list[str | None] = []
+        for raw_value in raw_values:
+            if isinstance(raw_value, bytes):
+                try:
+                    raw_value = raw_value.decode("utf-8")
+                except Exception:
+                    raw_value = None
+            values.append(raw_value)
+        return values
+
+    async def set_raw_many(self, items: dict[str, str], ttl: int | None = None) -> None:
+        """
+        Store several already serialized strings + TTL in sec in one round trip, as one
+        MULTI/EXEC: a concurrent fill can't interleave its values with these (a body
+        next to another fill's compressed copy)
+        """
+        if not items:
+            return
+
+        client = await self._client()
+        if client is None:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=True)
+            for key, value in items.items():
+                if ttl is not None:
+                    pipe.setex(self._full_key(key), ttl, value)
+                else:
+                    pipe.set(self._full_key(key), value)
+            await pipe.execute()
+        except Exception:
+            return
+
+    async def get_many(self, keys: list[str]) -> list[T | None]:
+        """
+        Get objects for several keys in one round trip (MGET).
+        Result is aligned with `keys`; missing or unreadable entries are None.
+        """
+        if not keys:
+            return []
+
+        client = await self._client()
+        if client is None:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await client.mget([self._full_key(key) for key in keys])
+        except Exception:
+            return [None] * len(keys)
+
+        values: list[T | None] = []
+        for raw_value in raw_values:
+            if isinstance(raw_value, bytes):
+                try:
+                    raw_value = raw_value.decode("utf-8")
+                except Exception:
+                    raw_value = None
+            values.append(None if raw_value is None else self._deserialize(raw_value))
+        return values
+
+    async def set_many(self, items: dict[str, T], ttl: int | None = None) -> None:
+        """
+        Set several objects + TTL in sec in one pipelined round trip
+        """
+        if not items:
+            return
+
+        client = await self._client()
+        if client is None:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                serialized = self._serialize(value)
+                if ttl is not None:
+                    pipe.setex(self._full_key(key), ttl, serialized)
+                else:
+                    pipe.set(self._full_key(key), serialized)
+            await pipe.execute()
+        except Exception:
+            return
+
+    async def get_generation(self, key: str) -> int | None:
+        """
+        Current value of a generation counter OR None if Redis is unavailable.
+        A missing counter is seeded from the clock, so a lost or evicted one
+        never returns to a value it already had.
+        """
+        client = await self._client()
+        if client is None:
+            return None
+
+        full_key = self._full_key(key)
+        try:
+            value = await client.get(full_key)
+            if value is None:
+                await client.set(full_key, time.time_ns(), nx=True)
+                value = await client.get(full_key)
+            return int(value)
+        except Exception:
+            return None
+
+    async def bump_generation(self, key: str) -> None:
+        """
+        Advance a generation counter (seeded like get_generation when missing)
+        """
+        client = await self._client()
+        if client is None:
+            return
+
+        full_key = self._full_key(key)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(full_key, time.time_ns(), nx=True)
+            pipe.incr(full_key)
+            await pipe.execute()
+        except Exception:
+            return
+
     async def delete(self, key: str) -> None:
         """
         Delete object by key
@@ -0,0 +1,26 @@
+from app.utils.cache import keys
+from app.utils.cache.cache_service import CacheService
+
+
+async def invalidate_room_timeslots(room_id: int) -> None:
+    """
+    Drop every cached timeslot listing a change in this room can affect:
+    the per-room range lists, then advance the room's timeslot generation (ETags
+    of GET /rooms/{id}/timeslots). The bump comes last: a reader that sees the new
+    generation can no longer get a dropped entry.
+
+    Cross-room search results are not scanned for: their keys carry the search
+    generation, so one INCR retires all of them and they age out by TTL.
+    """
+    cache = CacheService()
+    await cache.delete_pattern(keys.timeslots_room_prefix(room_id))
+    await cache.bump_generation(keys.timeslots_search_generation())
+    await cache.bump_generation(keys.timeslots_generation(room_id))
+
+
+async def invalidate_pattern(pattern: str) -> None:
+    """
+    Drop cached entries matching the pattern (module-level, so after-commit
+    callbacks registered with the same pattern deduplicate).
+    """
+    await CacheService().delete_pattern(pattern)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from decimal import Decimal
 
 
 def _format_dt(dt: datetime) -> str:
@@ -11,6 +12,14 @@ def login_ip(ip: str):
     return f"login:{ip}"
 
 
+def booking_gate(timeslot_id: int) -> str:
+    return f"booking:gate:{timeslot_id}"
+
+
+def idempotency(owner: str, idempotency_key: str) -> str:
+    return f"idempotency:{owner}:{idempotency_key}"
+
+
 def locations_all() -> str:
     return "locations:all"
 
@@ -19,11 +28,67 @@ def timeslots_by_room_and_range(room_id: int, date_from: datetime, date_to: date
     return f"timeslots:{room_id}:{_format_dt(date_from)}:{_format_dt(date_to)}"
 
 
+def timeslots_body_by_room_and_range(room_id: int, date_from: datetime, date_to: datetime) -> str:
+    # response body rendered from the DTOs; matched by timeslots_room_prefix
+    return f"timeslots:{room_id}:body:{_format_dt(date_from)}:{_format_dt(date_to)}"
+
+
+def timeslots_json_by_room_and_range(room_id: int, date_from: datetime, date_to: datetime) -> str:
+    # Postgres-rendered JSON, kept apart from the DTO entries; matched by timeslots_room_prefix
+    return f"timeslots:{room_id}:json:{_format_dt(date_from)}:{_format_dt(date_to)}"
+
+
+def compressed_body(key: str, content_encoding: str) -> str:
+    # precompressed copy of a cached response body, next to it so pattern invalidation drops both
+    return f"{key}:{content_encoding}"
+
+
 def timeslots_room_prefix(room_id: int) -> str:
     return f"timeslots:{room_id}:*"
 
 
+def timeslots_generation(room_id: int) -> str:
+    # bumped on every timeslot invalidation of the room; outside timeslots_room_prefix on purpose
+    return f"generation:timeslots:{room_id}"
+
+
+def timeslots_search(
+        location_id: int | None,
+        date_from: datetime,
+        date_to: datetime,
+        min_capacity: int | None,
+        room_type: str | None,
+        max_price: Decimal | None,
+        generation: int | None = None,
+) -> str:
+    location = "all" if location_id is None else location_id
+    return (
+        f"timeslots:search:{location}:{_format_dt(date_from)}:{_format_dt(date_to)}"
+        f":{min_capacity}:{room_type}:{max_price}:g{generation}"
+    )
+
+
+def timeslots_search_generation() -> str:
+    # bumped on every timeslot invalidation: search entries of older generations are never read again
+    return "generation:timeslots:search"
+
+
+def rooms_search(query: str, page: int, size: int) -> str:
+    return f"search:rooms:{page}:{size}:{query}"
+
+
+def rooms_search_prefix() -> str:
+    return "search:rooms:*"
+
+
 __all__ = [
     "timeslots_by_room_and_range",
+    "timeslots_json_by_room_and_range",
+    "compressed_body",
     "timeslots_room_prefix",
+    "timeslots_generation",
+    "timeslots_search",
+    "timeslots_search_generation",
+    "rooms_search",
+    "rooms_search_prefix",
 ]
@@ -0,0 +1,146 @@
+"""
+Response body codecs: gzip always, brotli and zstd when their packages are installed.
+
+Two sets of levels: `compress` / `stream_compressor` use cheap levels for bodies
+compressed per request; `precompress` uses stronger ones for bodies compressed
+once and stored with a cache entry.
+"""
+import gzip
+import zlib
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+# encoding -> (per-request level, precompressed level)
+_LEVELS: dict[str, tuple[int, int]] = {
+    "br": (4, 9),
+    "zstd": (3, 12),
+    "gzip": (6, 9),
+}
+
+
+def _available() -> tuple[str, ...]:
+    """Supported content codings, server preference (best ratio) first."""
+    found = []
+    if brotli is not None:
+        found.append("br")
+    if zstandard is not None:
+        found.append("zstd")
+    found.append("gzip")
+    return tuple(found)
+
+
+ENCODINGS: tuple[str, ...] = _available()
+
+
+def _qvalue(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate_encoding(accept_encoding: str | None, encodings: tuple[str, ...] = ENCODINGS) -> str | None:
+    """
+    Pick a content coding for an Accept-Encoding header: the highest q-value wins,
+    ties go to the first of `encodings`. None means send the body as is.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if coding:
+            accepted[coding] = _qvalue(params)
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    """
+    Encode a whole body.
+    :param encoding: one of ENCODINGS
+    :param precompressed: use the stronger level for bodies that are compressed once and cached
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported content coding: {encoding}")
+    level = _LEVELS[encoding][1 if precompressed else 0]
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def precompress(body: bytes) -> dict[str, bytes]:
+    """The body in every available coding, for storing next to its cache entry."""
+    return {encoding: compress(body, encoding, precompressed=True) for encoding in ENCODINGS}
+
+
+class StreamCompressor(Protocol):
+    def compress(self, chunk: bytes) -> bytes:
+        """Encode a chunk and flush it, so the client can decode it without waiting for the next one."""
+
+    def finish(self) -> bytes:
+        """End of the stream."""
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+_STREAMS = {"gzip": _GzipStream, "br": _BrotliStream, "zstd": _ZstdStream}
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    """Incremental encoder for bodies sent in several chunks (StreamingResponse)."""
+    return _STREAMS[encoding](_LEVELS[encoding][0])
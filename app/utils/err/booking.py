@@ -1,3 +1,4 @@
+from app.utils.err.base.bad_request import BadRequestException
 from app.utils.err.base.conflict import ConflictException
 from app.utils.err.base.not_found import NotFoundException
 
@@ -15,3 +16,8 @@ class TimeSlotNotFound(NotFoundException):
 class BookingNotFound(NotFoundException):
     def __init__(self):
         super().__init__("Booking not found")
+
+
+class InvalidSearchWindow(BadRequestException):
+    def __init__(self, detail: str = "Invalid search window"):
+        super().__init__(detail)
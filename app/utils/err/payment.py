@@ -1,6 +1,24 @@
+from app.utils.err.base.bad_request import BadRequestException
 from app.utils.err.base.not_found import NotFoundException
+from app.utils.err.base.service_unavailable import ServiceUnavailableException
+from app.utils.err.base.unauthorized import UnauthorizedException
 
 
 class PaymentNotFound(NotFoundException):
     def __init__(self):
         super().__init__("Payment not found")
+
+
+class InvalidWebhookSignature(UnauthorizedException):
+    def __init__(self):
+        super().__init__("Invalid webhook signature")
+
+
+class PaymentProviderUnavailable(ServiceUnavailableException):
+    def __init__(self):
+        super().__init__("Payment provider is unavailable, try again later")
+
+
+class PaymentRejected(BadRequestException):
+    def __init__(self):
+        super().__init__("Payment was rejected by the provider")
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from app.config import settings
+from app.models.notificationlog import NotificationLog
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationTransport(ABC):
+    """
+    Delivers one notification; raising marks it FAILED.
+    """
+
+    @abstractmethod
+    async def send(self, notification: NotificationLog) -> None:
+        ...
+
+
+class LogTransport(NotificationTransport):
+    """
+    Writes notifications to the application log (default until a real channel exists).
+    """
+
+    async def send(self, notification: NotificationLog) -> None:
+        logger.info(
+            "notification %s %s to user %s: %s",
+            notification.id, notification.type.value, notification.user_id, notification.payload,
+        )
+
+
+class FileTransport(NotificationTransport):
+    """
+    Appends notifications as JSON lines to a local file, a stand-in mailbox for
+    development and tests.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    async def send(self, notification: NotificationLog) -> None:
+        line = json.dumps({
+            "id": notification.id,
+            "type": notification.type.value,
+            "user_id": notification.user_id,
+            "booking_id": notification.booking_id,
+            "payload": notification.payload,
+        }, default=str)
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def get_notification_transport() -> NotificationTransport:
+    if settings.NOTIFICATION_TRANSPORT == "file":
+        return FileTransport(settings.NOTIFICATION_FILE_PATH)
+    return LogTransport()
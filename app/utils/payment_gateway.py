@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from decimal import Decimal
+
+import httpx
+
+from app.config import settings
+from app.utils.err.payment import PaymentProviderUnavailable, PaymentRejected
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentGateway(ABC):
+    """
+    Client of the payment provider.
+    """
+
+    @abstractmethod
+    async def create_payment(self, booking_id: int, amount: Decimal) -> str:
+        """
+        Register a payment for the booking with the provider.
+        :return: provider payment id (Payment.external_id)
+        :raises PaymentProviderUnavailable: provider down, slow or circuit open
+        :raises PaymentRejected: provider refused the payment
+        """
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class FakePaymentGateway(PaymentGateway):
+    """
+    In-process provider for development and tests: payment ids are random uuids.
+    :param record: keep every issued payment in `payments` (tests only: the dict is never trimmed)
+    """
+
+    def __init__(self, record: bool = False) -> None:
+        self.payments: dict[str, tuple[int, Decimal]] | None = {} if record else None
+
+    async def create_payment(self, booking_id: int, amount: Decimal) -> str:
+        external_id = str(uuid.uuid4())
+        if self.payments is not None:
+            self.payments[external_id] = (booking_id, amount)
+        return external_id
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker: after `failure_threshold` failures calls are refused
+    for `reset_seconds`, then a single trial call decides whether it closes again.
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int,
+            reset_seconds: float,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._trial_in_flight or self._clock() - self._opened_at < self._reset_seconds:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        The call ended without a verdict on the provider (cancelled, or an error of
+        our own): leave the state as is, but let the next call be the trial.
+        """
+        self._trial_in_flight = False
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"provider responded with {status_code}")
+        self.status_code = status_code
+
+
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpPaymentGateway(PaymentGateway):
+    """
+    Provider client over one pooled httpx.AsyncClient.
+
+    Each call is bounded by `deadline_seconds` end to end (waiting for a
+    concurrency slot, every attempt and the backoff between them); a single
+    attempt by `timeout_seconds`. Transport errors, 429 and 5xx are retried with
+    full-jitter exponential backoff under the same Idempotency-Key, so a retry
+    never creates a second provider payment. Calls that still fail count towards
+    the circuit breaker, calls that time out before getting a concurrency slot do
+    not (the provider was never asked); while it is open calls fail fast without
+    touching the network.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            api_key: str = "",
+            timeout_seconds: float = 2.0,
+            deadline_seconds: float = 5.0,
+            max_retries: int = 2,
+            backoff_seconds: float = 0.1,
+            max_connections: int = 50,
+            concurrency: int = 50,
+            breaker: CircuitBreaker | None = None,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout_seconds),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self._deadline_seconds = deadline_seconds
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._breaker = breaker or CircuitBreaker(failure_threshold=5, reset_seconds=30.0)
+
+    @classmethod
+    def from_settings(cls) -> "HttpPaymentGateway":
+        return cls(
+            base_url=settings.PAYMENT_GATEWAY_URL,
+            api_key=settings.PAYMENT_GATEWAY_API_KEY,
+            timeout_seconds=settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS,
+            deadline_seconds=settings.PAYMENT_GATEWAY_DEADLINE_SECONDS,
+            max_retries=settings.PAYMENT_GATEWAY_MAX_RETRIES,
+            backoff_seconds=settings.PAYMENT_GATEWAY_RETRY_BACKOFF_SECONDS,
+            max_connections=settings.PAYMENT_GATEWAY_MAX_CONNECTIONS,
+            concurrency=settings.PAYMENT_GATEWAY_CONCURRENCY,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.PAYMENT_GATEWAY_BREAKER_THRESHOLD,
+                reset_seconds=settings.PAYMENT_GATEWAY_BREAKER_RESET_SECONDS,
+            ),
+        )
+
+    async def create_payment(self, booking_id: int, amount: Decimal) -> str:
+        if not self._breaker.allow():
+            raise PaymentProviderUnavailable()
+
+        payload = {"reference": f"booking-{booking_id}", "amount": str(amount)}
+        called = False
+        try:
+            async with asyncio.timeout(self._deadline_seconds):
+                async with self._semaphore:
+                    called = True
+                    response = await self._post_with_retry("/payments", payload, idempotency_key=payload["reference"])
+        except (TimeoutError, httpx.TransportError, _RetryableStatus) as exc:
+            if not called:
+                # the deadline ran out in our own queue: local overload, not a provider failure
+                self._breaker.release()
+                logger.warning("payment provider call for booking %s timed out waiting for a slot", booking_id)
+                raise PaymentProviderUnavailable() from exc
+            self._breaker.record_failure()
+            logger.warning("payment provider call for booking %s failed: %r", booking_id, exc)
+            raise PaymentProviderUnavailable() from exc
+        except BaseException:
+            self._breaker.release()
+            raise
+
+        # any non-retryable answer means the provider itself is healthy
+        self._breaker.record_success()
+        if response.is_error:
+            logger.info("payment provider rejected booking %s: %s", booking_id, response.status_code)
+            raise PaymentRejected()
+        return str(response.json()["id"])
+
+    async def _post_with_retry(self, url: str, payload: dict, idempotency_key: str) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.post(url, json=payload, headers={"Idempotency-Key": idempotency_key})
+                if response.status_code not in _RETRYABLE_STATUSES:
+                    return response
+                error: Exception = _RetryableStatus(response.status_code)
+            except httpx.TransportError as exc:
+                error = exc
+
+            if attempt >= self._max_retries:
+                raise error
+            await asyncio.sleep(random.uniform(0, self._backoff_seconds * 2 ** attempt))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_gateway: PaymentGateway | None = None
+
+
+def get_payment_gateway() -> PaymentGateway:
+    """
+    Process-wide gateway, so every request shares one connection pool and breaker.
+    """
+    global _gateway
+    if _gateway is None:
+        if settings.PAYMENT_GATEWAY == "http":
+            _gateway = HttpPaymentGateway.from_settings()
+        else:
+            _gateway = FakePaymentGateway()
+    return _gateway
+
+
+async def close_payment_gateway() -> None:
+    global _gateway
+    gateway, _gateway = _gateway, None
+    if gateway is not None:
+        await gateway.aclose()
+
+
+__all__ = [
+    "PaymentGateway",
+    "FakePaymentGateway",
+    "HttpPaymentGateway",
+    "CircuitBreaker",
+    "get_payment_gateway",
+    "close_payment_gateway",
+]
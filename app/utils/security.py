@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 from datetime import datetime, timedelta, UTC
 from typing import Any
 
@@ -51,3 +53,18 @@ def create_refresh_token(data: dict) -> str:
 
 def verify_token(token: str) -> dict[str, Any]:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def sign_webhook(body: bytes) -> str:
+    digest = hmac.new(settings.PAYMENT_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_webhook_signature(body: bytes, signature: str | None) -> bool:
+    """
+    Constant-time check of the provider's `sha256=<hex hmac of the raw body>` header.
+    Always False while PAYMENT_WEBHOOK_SECRET is not configured.
+    """
+    if not settings.PAYMENT_WEBHOOK_SECRET or not signature:
+        return False
+    return hmac.compare_digest(sign_webhook(body), signature)
@@ -446,3 +446,34 @@ async def test__cancel_booking_route__admin_can_cancel_others(async_client, db_s
     async_client.app_ref.dependency_overrides.clear()
     assert response.status_code == 200, response.text
     assert response.json() is True
+
+
+@pytest.mark.asyncio
+async def test__create_bookings_route__books_all_slots_or_none(async_client, db_session, faker):
+    user = await create_user(db_session, faker)
+    token = SAccessToken(sub=str(user.id), admin=False)
+    override_token_dependency(async_client.app_ref, token)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    slots = [
+        await create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=i),
+            end_datetime=start + timedelta(hours=i, minutes=50),
+        )
+        for i in range(4)
+    ]
+    await create_booking(db_session, user=user, room=room, timeslot=slots[3], status=BookingStatus.PAID)
+    await db_session.commit()
+    free_ids = [slot.id for slot in slots[:3]]
+
+    conflict = await async_client.post("/bookings/batch", json={"timeslot_ids": free_ids + [slots[3].id]})
+    created = await async_client.post("/bookings/batch", json={"timeslot_ids": list(reversed(free_ids))})
+
+    async_client.app_ref.dependency_overrides.clear()
+    assert conflict.status_code == 409, conflict.text
+    assert created.status_code == 201, created.text
+    assert [item["timeslot_id"] for item in created.json()] == free_ids
+    assert len({item["expires_at"] for item in created.json()}) == 1
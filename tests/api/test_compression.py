@@ -0,0 +1,153 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeRedis
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.api.compression import CompressionMiddleware
+from app.config import settings
+from app.services.business import rooms as rooms_module
+from app.utils.cache import cache_service as cache_module, keys as cache_keys
+from tests.fixtures.factories import create_location, create_room, create_timeslot
+
+BIG = [{"id": i, "is_available": True} for i in range(200)]
+
+
+def _app() -> FastAPI:
+    app = FastAPI(title="test-compression")
+
+    @app.get("/big")
+    async def big():
+        return BIG
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\0" * 4096, media_type="application/octet-stream")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(b"x" * 4096), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/etag")
+    async def etag():
+        return PlainTextResponse("x" * 4096, headers={"ETag": '"v1"'})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield f"{i},{'row' * 100}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=_app(), raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_for_accepting_clients(client):
+    response = await client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == BIG
+
+
+@pytest.mark.asyncio
+async def test_bodies_not_worth_compressing_are_sent_as_is(client):
+    plain = await client.get("/big", headers={"Accept-Encoding": "identity"})
+    small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+    binary = await client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    encoded = await client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == BIG
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in binary.headers
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert encoded.content == b"x" * 4096  # not compressed twice
+
+
+@pytest.mark.asyncio
+async def test_compressed_response_gets_a_weak_etag(client):
+    response = await client.get("/etag", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_chunk_by_chunk(client):
+    response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text.splitlines()[4].startswith("4,row")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("postgres_json", "body_key"),
+    [(False, cache_keys.timeslots_body_by_room_and_range), (True, cache_keys.timeslots_json_by_room_and_range)],
+)
+async def test_cached_timeslots_are_compressed_once(
+        async_client, db_session, faker, monkeypatch, postgres_json, body_key
+):
+    fake_redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+    monkeypatch.setattr(settings, "POSTGRES_JSON_LISTS", postgres_json)
+    monkeypatch.setattr(settings, "COMPRESSION_MINIMUM_SIZE", 200)
+    calls = []
+
+    def _counting_precompress(body):
+        calls.append(len(body))
+        return {"gzip": gzip.compress(body)}
+
+    monkeypatch.setattr(rooms_module, "precompress", _counting_precompress)
+
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    for hour in range(5):
+        await create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=hour),
+            end_datetime=start + timedelta(hours=hour, minutes=50),
+        )
+    await db_session.commit()
+    params = {"date_from": start.isoformat(), "date_to": (start + timedelta(hours=5)).isoformat()}
+
+    first = await async_client.get(f"/rooms/{room.id}/timeslots", params=params, headers={"Accept-Encoding": "gzip"})
+    second = await async_client.get(f"/rooms/{room.id}/timeslots", params=params, headers={"Accept-Encoding": "gzip"})
+    plain = await async_client.get(f"/rooms/{room.id}/timeslots", params=params, headers={"Accept-Encoding": "identity"})
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert len(first.json()) == 5
+    assert second.json() == first.json() == plain.json()
+    assert "content-encoding" not in plain.headers
+    assert len(calls) == 1
+    cache_key = settings.REDIS_CACHE_PREFIX + body_key(
+        room_id=room.id, date_from=start, date_to=start + timedelta(hours=5)
+    )
+    assert await fake_redis.exists(cache_key, cache_keys.compressed_body(cache_key, "gzip")) == 2
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.config import settings
+from app.schemas.auth import SAccessToken
+from app.services.business.locations import LocationBusinessService
+from app.services.business.rooms import RoomBusinessService
+from app.utils.cache import cache_service as cache_module, invalidate_room_timeslots
+from app.utils.security import create_access_token
+from tests.fixtures.factories import create_booking, create_location, create_room, create_timeslot, create_user
+
+
+def _auth(user_id: int, admin: bool = False) -> dict[str, str]:
+    token = create_access_token(SAccessToken(sub=str(user_id), admin=admin).model_dump())
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_locations_revalidate_until_a_location_changes(async_client, db_session, faker, monkeypatch, fake_redis):
+    monkeypatch.setattr(settings, "LOCATION_CACHE_TTL_SECONDS", 10 ** 9)
+    admin = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    await db_session.commit()
+
+    first = await async_client.get("/locations")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+    assert "last-modified" in first.headers
+
+    async def _no_body(*args, **kwargs):
+        raise AssertionError("a 304 must not build the list")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(LocationBusinessService, "get_all", _no_body)
+        unchanged = await async_client.get("/locations", headers={"If-None-Match": etag})
+        since = await async_client.get("/locations", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert unchanged.status_code == since.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    updated = await async_client.patch(
+        f"/locations/{location.id}", json={"name": "Renamed"}, headers=_auth(admin.id, admin=True)
+    )
+    assert updated.status_code == 200
+    changed = await async_client.get("/locations", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert [item["name"] for item in changed.json() if item["id"] == location.id] == ["Renamed"]
+
+
+@pytest.mark.asyncio
+async def test_room_and_room_list_etags(async_client, db_session, faker):
+    admin = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    await db_session.commit()
+
+    room_response = await async_client.get(f"/rooms/{room.id}")
+    list_response = await async_client.get("/rooms")
+    room_etag, list_etag = room_response.headers["etag"], list_response.headers["etag"]
+
+    assert (await async_client.get(f"/rooms/{room.id}", headers={"If-None-Match": room_etag})).status_code == 304
+    assert (await async_client.get("/rooms", headers={"If-None-Match": f'"x", {list_etag}'})).status_code == 304
+    assert (await async_client.get("/rooms/999999", headers={"If-None-Match": "*"})).status_code == 404
+
+    await async_client.patch(f"/rooms/{room.id}", json={"capacity": 42}, headers=_auth(admin.id, admin=True))
+
+    changed_room = await async_client.get(f"/rooms/{room.id}", headers={"If-None-Match": room_etag})
+    changed_list = await async_client.get("/rooms", headers={"If-None-Match": list_etag})
+    assert changed_room.status_code == changed_list.status_code == 200
+    assert changed_room.json()["capacity"] == 42
+
+
+@pytest.mark.asyncio
+async def test_timeslot_etag_follows_the_room_generation(async_client, db_session, faker, monkeypatch, fake_redis):
+    monkeypatch.setattr(settings, "TIMESLOT_CACHE_TTL_SECONDS", 10 ** 9)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(minutes=50))
+    await db_session.commit()
+    url = f"/rooms/{room.id}/timeslots"
+    params = {"date_from": start.isoformat(), "date_to": (start + timedelta(hours=1)).isoformat()}
+
+    first = await async_client.get(url, params=params)
+    etag = first.headers["etag"]
+
+    async def _no_body(*args, **kwargs):
+        raise AssertionError("a 304 must not load the timeslots")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(RoomBusinessService, "get_timeslots_body_by_date_range", _no_body)
+        unchanged = await async_client.get(url, params=params, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    other_range = await async_client.get(
+        url, params={**params, "date_to": (start + timedelta(hours=2)).isoformat()}, headers={"If-None-Match": etag}
+    )
+    assert other_range.status_code == 200
+
+    await invalidate_room_timeslots(room.id)
+    changed = await async_client.get(url, params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_timeslots_without_redis_have_no_etag(async_client, db_session, faker, monkeypatch):
+    async def _no_redis():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache_module, "get_redis", _no_redis)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    await db_session.commit()
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    params = {"date_from": start.isoformat(), "date_to": (start + timedelta(hours=1)).isoformat()}
+
+    response = await async_client.get(f"/rooms/{room.id}/timeslots", params=params, headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_booking_etag_is_private_and_owner_scoped(async_client, db_session, faker):
+    owner = await create_user(db_session, faker)
+    stranger = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    booking = await create_booking(db_session, user=owner, room=room, timeslot=slot)
+    await db_session.commit()
+
+    first = await async_client.get(f"/bookings/{booking.id}", headers=_auth(owner.id))
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    unchanged = await async_client.get(f"/bookings/{booking.id}", headers={**_auth(owner.id), "If-None-Match": etag})
+    foreign = await async_client.get(f"/bookings/{booking.id}", headers={**_auth(stranger.id), "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert foreign.status_code == 404
+
+    canceled = await async_client.post(f"/bookings/{booking.id}/cancel", headers=_auth(owner.id))
+    assert canceled.status_code == 200
+    changed = await async_client.get(f"/bookings/{booking.id}", headers={**_auth(owner.id), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["booking"]["status"] == "CANCELED"
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.schemas.auth import SAccessToken
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.business.exports import ExportBusinessService
+from app.utils.security import create_access_token
+from tests.fixtures.factories import create_booking, create_room_with_slots, create_user
+
+
+def _auth(user_id: int, admin: bool) -> dict[str, str]:
+    token = create_access_token(SAccessToken(sub=str(user_id), admin=admin).model_dump())
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _bookings(session, faker, count: int):
+    user = await create_user(session, faker)
+    room, slots = await create_room_with_slots(session, faker, count)
+    bookings = [await create_booking(session, user=user, room=room, timeslot=slot) for slot in slots]
+    await session.commit()
+    return user, bookings
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_as_ndjson(async_client, db_session, faker):
+    user, bookings = await _bookings(db_session, faker, count=5)
+
+    response = await async_client.get("/admin/exports/bookings", headers=_auth(user.id, admin=True))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="bookings.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [booking.id for booking in bookings]
+    assert rows[0]["status"] == bookings[0].status.value
+
+
+@pytest.mark.asyncio
+async def test_export_is_yielded_one_chunk_per_batch(db_session, faker, monkeypatch):
+    _, bookings = await _bookings(db_session, faker, count=5)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+    chunks = [chunk async for chunk in ExportBusinessService().stream(ExportEntity.BOOKINGS, ExportFormat.CSV)]
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [1, 2, 2, 1]
+    assert len(list(csv.reader(io.StringIO(b"".join(chunks).decode())))) == len(bookings) + 1
+
+
+@pytest.mark.asyncio
+async def test_export_timeslots_as_csv_with_created_window(async_client, db_session, faker):
+    user, bookings = await _bookings(db_session, faker, count=3)
+
+    response = await async_client.get(
+        "/admin/exports/timeslots",
+        headers=_auth(user.id, admin=True),
+        params={"format": "csv", "created_from": (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header[0] == "id" and "start_datetime" in header
+    assert sorted(int(row[0]) for row in rows) == sorted(booking.timeslot_id for booking in bookings)
+
+    empty = await async_client.get(
+        "/admin/exports/timeslots",
+        headers=_auth(user.id, admin=True),
+        params={"format": "csv", "created_to": "2000-01-01T00:00:00Z"},
+    )
+    assert list(csv.reader(io.StringIO(empty.text))) == [header]
+
+
+@pytest.mark.asyncio
+async def test_export_requires_admin(async_client, db_session, faker):
+    user = await create_user(db_session, faker)
+    await db_session.commit()
+
+    response = await async_client.get("/admin/exports/payments", headers=_auth(user.id, admin=False))
+
+    assert response.status_code == 403
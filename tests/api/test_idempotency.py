@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeRedis
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from app.api import routers
+from app.api.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
+from app.models import Booking, Payment
+from app.schemas.auth import SAccessToken
+from app.utils.security import create_access_token
+from tests.fixtures.factories import create_room_with_slots, create_user
+
+
+def _app(redis) -> FastAPI:
+    app = FastAPI(title="test-idempotency")
+    for router in routers.__all__:
+        app.include_router(router)
+    app.add_middleware(IdempotencyMiddleware, redis_client=redis, wait_seconds=5)
+    return app
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    return FakeRedis(decode_responses=True)
+
+
+@pytest_asyncio.fixture
+async def client(fake_redis):
+    transport = ASGITransport(app=_app(fake_redis), raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+async def _user_and_slot(session, faker) -> tuple[dict[str, str], int]:
+    user = await create_user(session, faker)
+    _, (slot,) = await create_room_with_slots(session, faker)
+    await session.commit()
+    token = create_access_token(SAccessToken(sub=str(user.id), admin=False).model_dump())
+    return {"Authorization": f"Bearer {token}"}, slot.id
+
+
+async def _count(session, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_retry_with_same_key_replays_first_response(client, db_session, faker):
+    auth, slot_id = await _user_and_slot(db_session, faker)
+    headers = {**auth, "Idempotency-Key": "retry-1"}
+
+    first = await client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers)
+    second = await client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert await _count(db_session, Booking) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_in_flight_result(client, db_session, faker):
+    auth, slot_id = await _user_and_slot(db_session, faker)
+    headers = {**auth, "Idempotency-Key": "double-tap"}
+
+    responses = await asyncio.gather(*(
+        client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers) for _ in range(3)
+    ))
+
+    assert [r.status_code for r in responses] == [201, 201, 201]
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert await _count(db_session, Booking) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_different_request_is_rejected(client, db_session, faker):
+    auth, slot_id = await _user_and_slot(db_session, faker)
+    headers = {**auth, "Idempotency-Key": "reused"}
+
+    await client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers)
+    response = await client.post("/bookings", json={"timeslot_id": slot_id + 1}, headers=headers)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_payment_retry_does_not_hit_unique_constraint(client, db_session, faker):
+    auth, slot_id = await _user_and_slot(db_session, faker)
+    booking = await client.post("/bookings", json={"timeslot_id": slot_id}, headers=auth)
+    headers = {**auth, "Idempotency-Key": "pay-1"}
+
+    first = await client.post(f"/bookings/{booking.json()['id']}/payments", headers=headers)
+    second = await client.post(f"/bookings/{booking.json()['id']}/payments", headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert await _count(db_session, Payment) == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_pass_through_when_redis_is_down(db_session, faker):
+    class BrokenRedis(FakeRedis):
+        async def set(self, *args, **kwargs):
+            raise ConnectionError("redis is down")
+
+    transport = ASGITransport(app=_app(BrokenRedis(decode_responses=True)), raise_app_exceptions=True)
+    auth, slot_id = await _user_and_slot(db_session, faker)
+    headers = {**auth, "Idempotency-Key": "no-redis"}
+
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = await client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers)
+        second = await client.post("/bookings", json={"timeslot_id": slot_id}, headers=headers)
+
+    assert first.status_code == 201
+    assert second.status_code == 409
@@ -197,3 +197,31 @@ async def test__confirm_payment_route__admin_can_confirm_other(async_client, db_
     assert payment.status == PaymentStatus.SUCCESS
     # ❗BUG FOUND: API returns stale payment status (expects SUCCESS).
     assert response.json()["status"] == PaymentStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test__payment_webhook_route__verifies_signature_and_dedupes(async_client, monkeypatch):
+    import json
+
+    from app.config import settings
+    from app.utils.security import sign_webhook
+
+    monkeypatch.setattr(settings, "PAYMENT_WEBHOOK_SECRET", "whsec-test")
+    body = json.dumps({"event_id": "evt-1", "external_id": "ext-1", "status": "SUCCESS"}).encode()
+
+    unsigned = await async_client.post("/payments/webhook", content=body)
+    forged = await async_client.post(
+        "/payments/webhook", content=body, headers={"X-Webhook-Signature": "sha256=" + "0" * 64}
+    )
+    first = await async_client.post("/payments/webhook", content=body, headers={"X-Webhook-Signature": sign_webhook(body)})
+    again = await async_client.post("/payments/webhook", content=body, headers={"X-Webhook-Signature": sign_webhook(body)})
+    bad_body = b'{"event_id": "evt-2"}'
+    invalid = await async_client.post(
+        "/payments/webhook", content=bad_body, headers={"X-Webhook-Signature": sign_webhook(bad_body)}
+    )
+
+    assert unsigned.status_code == forged.status_code == 401
+    assert first.status_code == again.status_code == 202
+    assert first.json() == {"event_id": "evt-1", "duplicate": False}
+    assert again.json() == {"event_id": "evt-1", "duplicate": True}
+    assert invalid.status_code == 400
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.config import settings
+from app.schemas.auth import SAccessToken
+from app.schemas.timeslot import STimeSlotDateRange
+from app.services.business.rooms import RoomBusinessService
+from app.services.timeslot import TimeSlotService
+from app.utils.cache import cache_service as cache_module, invalidate_room_timeslots, keys as cache_keys
+from app.utils.security import create_access_token
+from tests.fixtures.factories import create_booking, create_room_with_slots, create_user
+
+
+async def _room_with_bookings(session, faker):
+    user = await create_user(session, faker)
+    room, slots = await create_room_with_slots(session, faker, 3)
+    for slot in (slots[0], slots[2]):
+        await create_booking(session, user=user, room=room, timeslot=slot)
+    await session.commit()
+    start = slots[0].start_datetime
+    token = create_access_token(SAccessToken(sub=str(user.id), admin=False).model_dump())
+    params = {"date_from": start.isoformat(), "date_to": (start + timedelta(hours=3)).isoformat()}
+    return room.id, {"Authorization": f"Bearer {token}"}, params
+
+
+@pytest.mark.asyncio
+async def test_postgres_rendered_lists_match_python_rendering(async_client, db_session, faker, monkeypatch):
+    room_id, auth, params = await _room_with_bookings(db_session, faker)
+
+    python_slots = await async_client.get(f"/rooms/{room_id}/timeslots", params=params)
+    python_bookings = await async_client.get("/bookings", headers=auth)
+    monkeypatch.setattr(settings, "POSTGRES_JSON_LISTS", True)
+    pg_slots = await async_client.get(f"/rooms/{room_id}/timeslots", params=params)
+    pg_bookings = await async_client.get("/bookings", headers=auth, params={"status": "PENDING_PAYMENTS"})
+
+    assert pg_slots.status_code == pg_bookings.status_code == 200
+    assert pg_slots.headers["content-type"] == "application/json"
+    assert pg_slots.json() == python_slots.json()
+    assert len(pg_slots.json()) == 3
+    assert pg_bookings.json() == python_bookings.json()
+    assert len(pg_bookings.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_postgres_rendered_timeslots_are_cached_raw_and_invalidated(db_session, faker, monkeypatch):
+    fake_redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+    room_id, _, params = await _room_with_bookings(db_session, faker)
+    date_range = STimeSlotDateRange(**params)
+    raw_key = settings.REDIS_CACHE_PREFIX + cache_keys.timeslots_json_by_room_and_range(
+        room_id=room_id, date_from=date_range.date_from, date_to=date_range.date_to
+    )
+
+    rendered = await RoomBusinessService().get_timeslots_json_by_date_range(room_id, date_range)
+    assert await fake_redis.get(raw_key) == rendered
+
+    async def _no_db(*args, **kwargs):
+        raise AssertionError("cached JSON should be served without a query")
+
+    monkeypatch.setattr(TimeSlotService, "get_json_by_room_id_and_date_range", _no_db)
+    assert await RoomBusinessService().get_timeslots_json_by_date_range(room_id, date_range) == rendered
+
+    await invalidate_room_timeslots(room_id)
+    assert await fake_redis.exists(raw_key) == 0
@@ -288,3 +288,95 @@ async def test__delete_room_with_admin_not_found(async_client):
 
     async_client.app_ref.dependency_overrides.clear()
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test__room_calendar_returns_month_summary(async_client, db_session, faker):
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    await db_session.commit()
+    override_token(async_client.app_ref, admin=True)
+
+    for start in (
+        datetime(2031, 5, 2, 10, tzinfo=timezone.utc),
+        datetime(2031, 5, 2, 12, tzinfo=timezone.utc),
+        datetime(2031, 6, 1, 10, tzinfo=timezone.utc),
+    ):
+        response = await async_client.post(
+            f"/rooms/{room.id}/timeslots",
+            json={
+                "start_datetime": start.isoformat(),
+                "end_datetime": (start + timedelta(hours=1)).isoformat(),
+                "base_price": 90,
+                "status": "AVAILABLE",
+            },
+            headers=auth_header(),
+        )
+        assert response.status_code == 201, response.text
+    async_client.app_ref.dependency_overrides.clear()
+
+    response = await async_client.get(f"/rooms/{room.id}/calendar", params={"year": 2031, "month": 5})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == [
+        {"day": "2031-05-02", "total_slots": 2, "free_slots": 2, "min_price": "90"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test__search_rooms_ranks_matches_from_rooms_and_locations(async_client, db_session, faker):
+    harbor = await create_location(db_session, faker)
+    harbor.name, harbor.address, harbor.description = "Harbor Hub", "Pier street 5", "by the water"
+    other = await create_location(db_session, faker)
+    other.name, other.address, other.description = "Downtown", "Main street 1", "city centre"
+    podcast = await create_room(db_session, faker, location=other)
+    podcast.name, podcast.description = "Podcast studio", "soundproof booth"
+    meeting = await create_room(db_session, faker, location=harbor)
+    meeting.name, meeting.description = "Big meeting room", "projector"
+    hidden = await create_room(db_session, faker, location=other, is_active=False)
+    hidden.name = "Podcast archive"
+    await db_session.commit()
+
+    by_name = await async_client.get("/rooms/search", params={"q": "podcast"})
+    by_address = await async_client.get("/rooms/search", params={"q": "PIER street"})
+    with_typo = await async_client.get("/rooms/search", params={"q": "poddcast"})
+
+    assert by_name.status_code == 200, by_name.text
+    assert [item["id"] for item in by_name.json()["items"]] == [podcast.id]
+    assert [item["id"] for item in by_address.json()["items"]] == [meeting.id]
+    assert by_address.json()["items"][0]["location"]["name"] == "Harbor Hub"
+    assert [item["id"] for item in with_typo.json()["items"]] == [podcast.id]
+
+
+@pytest.mark.asyncio
+async def test__search_rooms_paginates(async_client, db_session, faker):
+    location = await create_location(db_session, faker)
+    rooms = []
+    for i in range(3):
+        room = await create_room(db_session, faker, location=location)
+        room.name = f"Quiet pod {i}"
+        rooms.append(room)
+    await db_session.commit()
+
+    first = await async_client.get("/rooms/search", params={"q": "quiet pod", "size": 2})
+    second = await async_client.get("/rooms/search", params={"q": "quiet pod", "size": 2, "page": 2})
+
+    assert first.json()["has_next"] is True
+    assert second.json()["has_next"] is False
+    ids = [item["id"] for item in first.json()["items"] + second.json()["items"]]
+    assert sorted(ids) == sorted(room.id for room in rooms)
+
+
+@pytest.mark.asyncio
+async def test__search_rooms_rejects_queries_too_short_for_trigrams(async_client, db_session, faker):
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    room.name = "Ab studio"
+    await db_session.commit()
+
+    too_short = await async_client.get("/rooms/search", params={"q": "ab"})
+    padded = await async_client.get("/rooms/search", params={"q": "  ab  "})
+
+    assert too_short.status_code == 422
+    assert padded.status_code == 200, padded.text
+    assert padded.json()["items"] == []
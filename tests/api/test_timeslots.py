@@ -7,10 +7,13 @@ from app.api import deps
 from app.schemas.auth import SAccessToken
 from app.utils.err.base.forbidden import ForbiddenException
 from app.models import TimeSlot
+from app.models.room import RoomType
 from tests.fixtures.factories import (
+    create_booking,
     create_location,
     create_room,
     create_timeslot,
+    create_user,
 )
 
 
@@ -151,3 +154,64 @@ async def test__delete_timeslot_not_found_returns_404(async_client):
 
     async_client.app_ref.dependency_overrides.clear()
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test__search_free_timeslots_across_rooms(async_client, db_session, faker):
+    location = await create_location(db_session, faker)
+    other_location = await create_location(db_session, faker)
+    studio = await create_room(db_session, faker, location=location, room_type=RoomType.STUDIO)
+    meeting = await create_room(db_session, faker, location=location, room_type=RoomType.MEETING_ROOM)
+    inactive = await create_room(db_session, faker, location=location, is_active=False)
+    elsewhere = await create_room(db_session, faker, location=other_location)
+    start = datetime(2031, 4, 1, 10, tzinfo=timezone.utc)
+
+    def _slot(room, hours: int):
+        return create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=hours),
+            end_datetime=start + timedelta(hours=hours, minutes=50),
+        )
+
+    free_studio = await _slot(studio, 0)
+    booked_studio = await _slot(studio, 1)
+    free_meeting = await _slot(meeting, 0)
+    await _slot(meeting, 5)  # outside the window
+    await _slot(inactive, 0)
+    await _slot(elsewhere, 0)
+    user = await create_user(db_session, faker)
+    await create_booking(db_session, user=user, room=studio, timeslot=booked_studio)
+    await db_session.commit()
+
+    params = {
+        "location_id": location.id,
+        "date_from": start.isoformat(),
+        "date_to": (start + timedelta(hours=3)).isoformat(),
+    }
+    response = await async_client.get("/timeslots/search", params=params)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item["id"] for item in body] == sorted([free_studio.id, free_meeting.id])
+    assert {item["room_name"] for item in body} == {studio.name, meeting.name}
+
+    response = await async_client.get("/timeslots/search", params={**params, "room_type": "STUDIO"})
+    assert [item["id"] for item in response.json()] == [free_studio.id]
+
+
+@pytest.mark.asyncio
+async def test__search_free_timeslots_rejects_invalid_window(async_client):
+    start = datetime(2031, 4, 1, 10, tzinfo=timezone.utc)
+
+    reversed_window = await async_client.get(
+        "/timeslots/search",
+        params={"date_from": start.isoformat(), "date_to": (start - timedelta(hours=1)).isoformat()},
+    )
+    too_wide = await async_client.get(
+        "/timeslots/search",
+        params={"date_from": start.isoformat(), "date_to": (start + timedelta(days=400)).isoformat()},
+    )
+
+    assert reversed_window.status_code == 400
+    assert too_wide.status_code == 400
@@ -0,0 +1,76 @@
+"""
+Contention benchmark for BOOKING_LOCK_STRATEGY.
+
+Every round N bookers race for the same fresh timeslot through
+BookingsBusinessService.create_booking, each in its own session. Exactly one
+must win and the rest must get SlotAlreadyTaken; per-attempt latencies are
+collected and throughput / p50 / p95 / p99 are printed (run with -s to see them).
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingCreate
+from app.services.business.bookings import BookingsBusinessService
+from app.utils.err.booking import SlotAlreadyTaken
+from tests.fixtures.factories import create_location, create_room, create_timeslot, create_user
+
+# stays below the default engine pool (5 + 10 overflow)
+N_BOOKERS = 10
+ROUNDS = 5
+
+
+async def _attempt(user_id: int, timeslot_id: int) -> tuple[bool, float]:
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    started = time.perf_counter()
+    try:
+        await service.create_booking(SBookingCreate(timeslot_id=timeslot_id))
+        won = True
+    except SlotAlreadyTaken:
+        won = False
+    return won, time.perf_counter() - started
+
+
+def _percentile(latencies: list[float], pct: int) -> float:
+    return statistics.quantiles(latencies, n=100, method="inclusive")[pct - 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["pessimistic", "optimistic", "advisory"])
+async def test_one_winner_per_hot_slot(db_session, faker, monkeypatch, strategy):
+    monkeypatch.setattr(settings, "BOOKING_LOCK_STRATEGY", strategy)
+    user_ids = [(await create_user(db_session, faker)).id for _ in range(N_BOOKERS)]
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    slot_ids = []
+    for i in range(ROUNDS):
+        slot_start = start + timedelta(hours=i)
+        slot = await create_timeslot(
+            db_session, room=room, start_datetime=slot_start, end_datetime=slot_start + timedelta(minutes=50)
+        )
+        slot_ids.append(slot.id)
+    await db_session.commit()
+
+    latencies: list[float] = []
+    elapsed = 0.0
+    for slot_id in slot_ids:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(_attempt(user_id, slot_id) for user_id in user_ids))
+        elapsed += time.perf_counter() - started
+
+        assert sum(won for won, _ in results) == 1
+        latencies.extend(latency for _, latency in results)
+
+    print(
+        f"\n[{strategy}] {N_BOOKERS} bookers x {ROUNDS} slots: "
+        f"{len(latencies) / elapsed:.0f} attempts/s, "
+        f"p50={_percentile(latencies, 50) * 1000:.1f}ms "
+        f"p95={_percentile(latencies, 95) * 1000:.1f}ms "
+        f"p99={_percentile(latencies, 99) * 1000:.1f}ms"
+    )
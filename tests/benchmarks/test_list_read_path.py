@@ -0,0 +1,79 @@
+"""
+Per-row cost of the room timeslots list: ORM path vs. column select into DTOs.
+
+The ORM path hydrates TimeSlot instances into the identity map and builds three
+objects per slot (STimeSlotOut, its dump, STimeSlotOutWithBookingStatus); the read
+path maps Core rows straight into the DTO list with one TypeAdapter call. Both must
+return the same DTOs; time and peak allocations per row are measured with
+RUN_BENCHMARKS=1 and reported in the summary.
+"""
+import time
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+
+from app.repositories.timeslot import TimeSlotRepository
+from tests.fixtures.seed import orm_timeslots_with_booking_flag, seed_booking_dataset
+
+SLOTS = 1_000
+ROUNDS = 10
+
+
+async def _measure(session, fetch) -> tuple[list, float, float]:
+    result = await fetch()
+    session.expunge_all()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await fetch()
+        session.expunge_all()
+    per_row_us = (time.perf_counter() - started) / (ROUNDS * SLOTS) * 1_000_000
+
+    tracemalloc.start()
+    await fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.expunge_all()
+    return result, per_row_us, peak / SLOTS
+
+
+async def _window(session, slots: int) -> dict:
+    dataset = await seed_booking_dataset(session, users=5, rooms=1, slots_per_room=slots)
+    await session.commit()
+    return dict(
+        room_id=dataset.room_ids[0],
+        date_from=dataset.slots_start,
+        date_to=dataset.slots_start + timedelta(hours=slots + 1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_path_returns_same_dtos_as_orm_path(db_session):
+    window = await _window(db_session, 50)
+
+    orm_result = await orm_timeslots_with_booking_flag(db_session, **window)
+    read_result = await TimeSlotRepository(db_session).list_by_room_id_and_date_range(**window)
+
+    assert len(read_result) == 50
+    assert read_result == orm_result
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_read_path_cost_per_row(db_session, benchmark_report):
+    window = await _window(db_session, SLOTS)
+    repo = TimeSlotRepository(db_session)
+
+    async def orm_path():
+        return await orm_timeslots_with_booking_flag(db_session, **window)
+
+    async def read_path():
+        return await repo.list_by_room_id_and_date_range(**window)
+
+    _, orm_us, orm_bytes = await _measure(db_session, orm_path)
+    _, read_us, read_bytes = await _measure(db_session, read_path)
+
+    benchmark_report(
+        f"{SLOTS} slots: ORM {orm_us:.1f} us/row, {orm_bytes:.0f} B/row peak; "
+        f"read path {read_us:.1f} us/row, {read_bytes:.0f} B/row peak"
+    )
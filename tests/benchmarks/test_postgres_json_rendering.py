@@ -0,0 +1,67 @@
+"""
+10k-row availability response: Python rendering vs. Postgres json_agg.
+
+Three ways to produce the response body of GET /rooms/{id}/timeslots for one room
+with 10,000 slots: the ORM path (entities + three DTO constructions per slot +
+to_json), the column-select DTO path, and POSTGRES_JSON_LISTS where Postgres returns
+the JSON text. Runs only with RUN_BENCHMARKS=1: the time per response is reported
+in the summary, not asserted (the data equality of the default suite lives in
+tests/api/test_postgres_json_lists.py).
+"""
+import json
+import time
+from datetime import timedelta
+
+import pytest
+from pydantic_core import to_json
+
+from app.repositories.timeslot import TimeSlotRepository
+from tests.fixtures.seed import orm_timeslots_with_booking_flag, seed_booking_dataset
+
+SLOTS = 10_000
+ROUNDS = 3
+
+
+async def _ms_per_response(session, render) -> tuple[bytes, float]:
+    body = await render()
+    session.expunge_all()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await render()
+        session.expunge_all()
+    return body, (time.perf_counter() - started) / ROUNDS * 1000
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_postgres_json_rendering_cost(db_session, benchmark_report):
+    dataset = await seed_booking_dataset(db_session, users=5, rooms=1, slots_per_room=SLOTS)
+    await db_session.commit()
+    repo = TimeSlotRepository(db_session)
+    window = dict(
+        room_id=dataset.room_ids[0],
+        date_from=dataset.slots_start,
+        date_to=dataset.slots_start + timedelta(hours=SLOTS + 1),
+    )
+
+    async def orm_path() -> bytes:
+        return to_json(await orm_timeslots_with_booking_flag(db_session, **window))
+
+    async def dto_path() -> bytes:
+        return to_json(await repo.list_by_room_id_and_date_range(**window))
+
+    async def postgres_path() -> bytes:
+        return (await repo.get_json_by_room_id_and_date_range(**window)).encode()
+
+    orm_body, orm_ms = await _ms_per_response(db_session, orm_path)
+    dto_body, dto_ms = await _ms_per_response(db_session, dto_path)
+    pg_body, pg_ms = await _ms_per_response(db_session, postgres_path)
+
+    expected = json.loads(orm_body)
+    assert len(expected) == SLOTS
+    assert json.loads(dto_body) == expected
+    assert json.loads(pg_body) == expected
+    benchmark_report(
+        f"{SLOTS} slots per response: ORM {orm_ms:.1f} ms, column select + DTOs {dto_ms:.1f} ms, "
+        f"Postgres json_agg {pg_ms:.1f} ms ({len(pg_body)} vs {len(orm_body)} bytes)"
+    )
@@ -0,0 +1,111 @@
+"""
+Plan-regression benchmark for the hot booking/timeslot queries.
+
+A few thousand rows are seeded and analyzed, the repository queries are run
+through the slow query logger with a zero threshold, and the captured EXPLAIN
+plans must use the expected indexes instead of sequential scans.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.slow_query import SlowQueryLogger
+from app.repositories.booking import BookingRepository
+from app.repositories.timeslot import TimeSlotRepository
+from tests.fixtures.seed import plan_nodes, seed_booking_dataset
+
+
+async def _capture_plans(engine, session, run) -> list[dict]:
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(engine, threshold_ms=0, max_explains_per_minute=100, sink=records.append)
+    slow_log.install()
+    try:
+        await run()
+        await session.rollback()
+        await slow_log.drain()
+    finally:
+        slow_log.uninstall()
+    return [r for r in records if r["plan"] is not None]
+
+
+def _nodes_for(records: list[dict], table: str) -> list[dict]:
+    nodes: list[dict] = []
+    for record in records:
+        if f"FROM {table}" not in record["statement"]:
+            continue
+        nodes.extend(plan_nodes(record["plan"][0]["Plan"]))
+    return nodes
+
+
+def _index_names(nodes: list[dict]) -> set[str]:
+    return {node["Index Name"] for node in nodes if "Index Name" in node}
+
+
+def _seq_scanned(nodes: list[dict]) -> set[str]:
+    return {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+
+
+@pytest.mark.asyncio
+async def test_my_bookings_uses_user_created_at_index(async_engine, db_session):
+    dataset = await seed_booking_dataset(db_session)
+    repo = BookingRepository(db_session)
+
+    async def run():
+        await repo.list_bookings_with_timeslots(user_id=dataset.user_ids[0])
+
+    nodes = _nodes_for(await _capture_plans(async_engine, db_session, run), "bookings")
+
+    assert "ix_bookings_user_id_created_at" in _index_names(nodes)
+    assert "bookings" not in _seq_scanned(nodes)
+
+
+@pytest.mark.asyncio
+async def test_expiry_sweep_uses_partial_pending_index(async_engine, db_session):
+    await seed_booking_dataset(db_session)
+
+    async def run():
+        await BookingRepository(db_session).expire_due_bookings(
+            now=datetime.now(timezone.utc), batch_size=100
+        )
+
+    nodes = _nodes_for(await _capture_plans(async_engine, db_session, run), "bookings")
+
+    assert "ix_bookings_pending_expires_at" in _index_names(nodes)
+    assert "bookings" not in _seq_scanned(nodes)
+
+
+@pytest.mark.asyncio
+async def test_room_availability_range_uses_indexes(async_engine, db_session):
+    dataset = await seed_booking_dataset(db_session)
+    repo = TimeSlotRepository(db_session)
+
+    async def run():
+        await repo.list_by_room_id_and_date_range(
+            room_id=dataset.room_ids[0],
+            date_from=dataset.slots_start,
+            date_to=dataset.slots_start + timedelta(hours=24),
+        )
+
+    nodes = _nodes_for(await _capture_plans(async_engine, db_session, run), "timeslots")
+
+    assert "uq_timeslot_unique_range" in _index_names(nodes)
+    assert "uq_bookings_timeslot_active" in _index_names(nodes)
+    assert not _seq_scanned(nodes)
+
+
+@pytest.mark.asyncio
+async def test_free_slot_search_uses_gist_range_index(async_engine, db_session):
+    dataset = await seed_booking_dataset(db_session)
+    repo = TimeSlotRepository(db_session)
+
+    async def run():
+        await repo.search_free(
+            date_from=dataset.slots_start + timedelta(hours=24),
+            date_to=dataset.slots_start + timedelta(hours=28),
+            location_id=dataset.location_id,
+        )
+
+    nodes = _nodes_for(await _capture_plans(async_engine, db_session, run), "timeslots")
+
+    assert "timeslot_no_overlap_per_room" in _index_names(nodes)
+    assert "timeslots" not in _seq_scanned(nodes)
@@ -0,0 +1,86 @@
+"""
+Rendering benchmark for FastJSONResponse.
+
+The same 1,000 STimeSlotOutWithBookingStatus DTOs are served by two routes: one
+returns them through response_model (re-validation + jsonable walk + json.dumps),
+the other returns FastJSONResponse directly. Bodies must be identical; the per-item
+cost of each path is measured with RUN_BENCHMARKS=1 and reported in the summary.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.responses import FastJSONResponse
+from app.models.timeslot import TimeSlotStatus
+from app.schemas.timeslot import STimeSlotOutWithBookingStatus
+
+N_SLOTS = 1_000
+ROUNDS = 20
+
+
+def _slots() -> list[STimeSlotOutWithBookingStatus]:
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    return [
+        STimeSlotOutWithBookingStatus(
+            id=i,
+            room_id=1,
+            start_datetime=start + timedelta(hours=i),
+            end_datetime=start + timedelta(hours=i, minutes=50),
+            base_price=Decimal("1500.00"),
+            status=TimeSlotStatus.AVAILABLE,
+            has_active_booking=i % 3 == 0,
+        )
+        for i in range(N_SLOTS)
+    ]
+
+
+def _app(slots: list[STimeSlotOutWithBookingStatus]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=List[STimeSlotOutWithBookingStatus])
+    async def validated() -> List[STimeSlotOutWithBookingStatus]:
+        return slots
+
+    @app.get("/fast", response_model=List[STimeSlotOutWithBookingStatus], response_class=FastJSONResponse)
+    async def fast() -> FastJSONResponse:
+        return FastJSONResponse(slots)
+
+    return app
+
+
+async def _per_item_us(client: AsyncClient, path: str) -> float:
+    await client.get(path)  # warm-up
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await client.get(path)
+    return (time.perf_counter() - started) / (ROUNDS * N_SLOTS) * 1_000_000
+
+
+@pytest.mark.asyncio
+async def test_fast_path_renders_same_body():
+    transport = ASGITransport(app=_app(_slots()))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        validated = await client.get("/validated")
+        fast = await client.get("/fast")
+
+    assert fast.content == validated.content
+    assert fast.headers["content-type"] == validated.headers["content-type"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_fast_path_rendering_cost(benchmark_report):
+    transport = ASGITransport(app=_app(_slots()))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        validated_us = await _per_item_us(client, "/validated")
+        fast_us = await _per_item_us(client, "/fast")
+
+    benchmark_report(
+        f"{N_SLOTS} slots: response_model {validated_us:.2f} us/item, "
+        f"FastJSONResponse {fast_us:.2f} us/item ({validated_us / fast_us:.1f}x)"
+    )
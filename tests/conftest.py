@@ -61,6 +61,40 @@ if IS_SQLITE:
             if index.name == "uq_bookings_timeslot_active":
                 bookings_table.indexes.discard(index)
 
+
+# timing/allocation benchmarks (tests/benchmarks) are reported in the terminal summary, never asserted
+RUN_BENCHMARKS = os.environ.get("RUN_BENCHMARKS", "0") == "1"
+_benchmark_lines: list[str] = []
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing measurement, runs only with RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason="benchmark: set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _benchmark_lines:
+        terminalreporter.section("benchmarks")
+        for line in _benchmark_lines:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture
+def benchmark_report():
+    """
+    Add a line to the benchmarks section of the terminal summary.
+    """
+    return _benchmark_lines.append
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     loop = asyncio.new_event_loop()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -93,6 +93,39 @@ async def create_timeslot(
     return slot
 
 
+async def create_room_with_slots(
+    session: AsyncSession,
+    faker,
+    count: int = 1,
+    *,
+    start: datetime | None = None,
+    step: timedelta = timedelta(hours=1),
+    duration: timedelta = timedelta(minutes=50),
+    base_prices: Sequence[Decimal] | None = None,
+    location: Location | None = None,
+) -> tuple[Room, list[TimeSlot]]:
+    """
+    A room (in a new location unless one is given) with `count` timeslots, one
+    every `step` from `start` (default: tomorrow, whole seconds).
+    """
+    if start is None:
+        start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    if location is None:
+        location = await create_location(session, faker)
+    room = await create_room(session, faker, location=location)
+    slots = []
+    for i in range(count):
+        slot_start = start + step * i
+        slots.append(await create_timeslot(
+            session,
+            room=room,
+            start_datetime=slot_start,
+            end_datetime=slot_start + duration,
+            base_price=Decimal("100.00") if base_prices is None else base_prices[i],
+        ))
+    return room, slots
+
+
 async def create_booking(
     session: AsyncSession,
     *,
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Booking, TimeSlot
+from app.models.booking import BookingStatus
+from app.schemas.timeslot import STimeSlotOut, STimeSlotOutWithBookingStatus
+
+
+@dataclass
+class SeededDataset:
+    user_ids: list[int]
+    room_ids: list[int]
+    location_id: int
+    slots_start: datetime
+    slots_per_room: int
+
+
+async def seed_booking_dataset(
+    session: AsyncSession,
+    *,
+    users: int = 50,
+    rooms: int = 20,
+    slots_per_room: int = 300,
+    pending_every: int = 20,
+    slots_start: datetime | None = None,
+) -> SeededDataset:
+    """
+    Bulk-seed a realistic volume of users/rooms/timeslots/bookings with set-based
+    INSERTs (ORM factories are too slow for thousands of rows). Slots start every
+    hour and last 50 minutes: ranges are closed, so back-to-back slots would overlap.
+
+    Every timeslot gets one booking, users are assigned round-robin; every
+    `pending_every`-th booking is PENDING_PAYMENTS and already expired, the rest
+    are spread across PAID/CANCELED/EXPIRED.
+
+    Tables are truncated first: the per-test DELETE cleanup leaves bloated heaps and
+    indexes behind, which would skew planner costs between runs.
+    """
+    if slots_start is None:
+        slots_start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    await session.execute(text("TRUNCATE users, locations RESTART IDENTITY CASCADE"))
+
+    location_id = (await session.execute(text(
+        "INSERT INTO locations (name, address, description) "
+        "VALUES ('Seed location', 'Seed street 1', 'seeded') RETURNING id"
+    ))).scalar_one()
+
+    user_ids = list((await session.execute(text(
+        "INSERT INTO users (email, hashed_password, role) "
+        "SELECT 'seed' || g || '@example.com', 'x', 'USER' FROM generate_series(1, :n) g "
+        "RETURNING id"
+    ), {"n": users})).scalars().all())
+
+    room_ids = list((await session.execute(text(
+        "INSERT INTO rooms (location_id, name, capacity, description, is_active, time_slot_type, hour_price) "
+        "SELECT :location_id, 'Seed room ' || g, 4, 'seeded', true, 'FIXED', 100 "
+        "FROM generate_series(1, :n) g RETURNING id"
+    ), {"location_id": location_id, "n": rooms})).scalars().all())
+
+    await session.execute(text(
+        "INSERT INTO timeslots (room_id, start_datetime, end_datetime, base_price, status) "
+        "SELECT r.id, CAST(:start AS timestamptz) + make_interval(hours => g), CAST(:start AS timestamptz) + make_interval(hours => g, mins => 50), 100, 'AVAILABLE' "
+        "FROM rooms r CROSS JOIN generate_series(0, :n - 1) g WHERE r.id = ANY(:room_ids)"
+    ), {"start": slots_start, "n": slots_per_room, "room_ids": room_ids})
+
+    await session.execute(text(
+        "INSERT INTO bookings (user_id, room_id, timeslot_id, status, total_price, expires_at, created_at) "
+        "SELECT u.ids[1 + (t.rn % array_length(u.ids, 1))], t.room_id, t.id, "
+        "       CASE WHEN t.rn % :pending_every = 0 THEN 'PENDING_PAYMENTS'::bookingstatus "
+        "            WHEN t.rn % 3 = 0 THEN 'PAID'::bookingstatus "
+        "            WHEN t.rn % 3 = 1 THEN 'CANCELED'::bookingstatus "
+        "            ELSE 'EXPIRED'::bookingstatus END, "
+        "       t.base_price, now() - interval '1 minute', now() - make_interval(mins => t.rn::int) "
+        "FROM (SELECT ts.*, row_number() OVER (ORDER BY ts.id) AS rn FROM timeslots ts "
+        "      WHERE ts.room_id = ANY(:room_ids)) t "
+        "CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM users WHERE id = ANY(:user_ids)) u"
+    ), {"pending_every": pending_every, "room_ids": room_ids, "user_ids": user_ids})
+
+    await session.commit()
+    await session.execute(text("ANALYZE users, rooms, timeslots, bookings"))
+    await session.commit()
+
+    return SeededDataset(
+        user_ids=user_ids,
+        room_ids=room_ids,
+        location_id=location_id,
+        slots_start=slots_start,
+        slots_per_room=slots_per_room,
+    )
+
+
+def plan_nodes(plan: dict) -> list[dict]:
+    """
+    Flatten an EXPLAIN (FORMAT JSON) plan tree into a list of nodes.
+    """
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def orm_timeslots_with_booking_flag(
+    session: AsyncSession,
+    room_id: int,
+    date_from: datetime,
+    date_to: datetime,
+) -> list[STimeSlotOutWithBookingStatus]:
+    """
+    Baseline for the read-path benchmarks: the same list as
+    TimeSlotRepository.list_by_room_id_and_date_range, built the ORM way - TimeSlot
+    instances in the identity map, then three objects per slot.
+    """
+    active_booking = aliased(Booking, name="active_booking")
+    stmt = (
+        select(TimeSlot, active_booking.id.is_not(None).label("has_active_booking"))
+        .join(
+            active_booking,
+            and_(
+                active_booking.timeslot_id == TimeSlot.id,
+                active_booking.status.in_([BookingStatus.PENDING_PAYMENTS, BookingStatus.PAID]),
+            ),
+            isouter=True,
+        )
+        .where(TimeSlot.room_id == room_id)
+        .where(TimeSlot.start_datetime >= date_from)
+        .where(TimeSlot.end_datetime <= date_to)
+        .order_by(TimeSlot.start_datetime)
+    )
+    return [
+        STimeSlotOutWithBookingStatus(**STimeSlotOut.from_model(slot).model_dump(), has_active_booking=flag)
+        for slot, flag in (await session.execute(stmt)).all()
+    ]
@@ -0,0 +1,250 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.celery_app import tasks
+from app.models import (
+    Booking,
+    NotificationLog,
+    OutboxEvent,
+    Payment,
+    PaymentWebhookEvent,
+    RoomDayAvailability,
+    TimeSlot,
+)
+from app.models.archive import bookings_archive, notificationlogs_archive, payments_archive, timeslots_archive
+from app.models.booking import BookingStatus
+from app.models.notificationlog import NotificationLogStatus, NotificationLogType
+from app.models.payment import PaymentStatus
+from app.repositories.archive import ArchiveRepository
+from app.services.room_availability import RoomAvailabilityService
+from tests.fixtures.factories import (
+    create_booking,
+    create_location,
+    create_room,
+    create_room_with_slots,
+    create_timeslot,
+    create_user,
+)
+
+
+async def _count(session, table) -> int:
+    return (await session.execute(select(func.count()).select_from(table))).scalar_one()
+
+
+async def _old_booking(session, faker, *, status: BookingStatus, hours_ago: int, created_days_ago: int):
+    user = await create_user(session, faker)
+    room, (slot,) = await create_room_with_slots(
+        session, faker, start=datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    )
+    booking = await create_booking(
+        session,
+        user=user,
+        room=room,
+        timeslot=slot,
+        status=status,
+        created_at=datetime.now(timezone.utc) - timedelta(days=created_days_ago),
+    )
+    return user, slot, booking
+
+
+@pytest.mark.asyncio
+async def test__archive_dead_bookings__moves_booking_with_payment_and_logs(db_session, faker):
+    # Given
+    user, slot, dead = await _old_booking(
+        db_session, faker, status=BookingStatus.CANCELED, hours_ago=24 * 100, created_days_ago=100
+    )
+    db_session.add(Payment(booking_id=dead.id, external_id="ext-1"))
+    db_session.add(NotificationLog(
+        user_id=user.id,
+        booking_id=dead.id,
+        payload={"booking_id": dead.id},
+        type=NotificationLogType.BOOKING_CANCELED,
+        status=NotificationLogStatus.SENT,
+    ))
+    _, _, recent = await _old_booking(
+        db_session, faker, status=BookingStatus.EXPIRED, hours_ago=1, created_days_ago=1
+    )
+    _, _, paid = await _old_booking(
+        db_session, faker, status=BookingStatus.PAID, hours_ago=24 * 100, created_days_ago=100
+    )
+    await db_session.commit()
+    repo = ArchiveRepository(db_session)
+
+    # When
+    moved = await repo.archive_dead_bookings(datetime.now(timezone.utc) - timedelta(days=90), batch_size=10)
+    await db_session.commit()
+
+    # Then
+    assert moved == {"bookings": 1, "payments": 1, "notificationlogs": 1}
+    remaining = set((await db_session.execute(select(Booking.id))).scalars().all())
+    assert remaining == {recent.id, paid.id}
+    archived = (await db_session.execute(select(bookings_archive))).mappings().one()
+    assert archived["id"] == dead.id
+    assert archived["status"] == BookingStatus.CANCELED
+    assert archived["archived_at"] is not None
+    assert await _count(db_session, payments_archive) == 1
+    assert await _count(db_session, notificationlogs_archive) == 1
+
+
+@pytest.mark.asyncio
+async def test__archive_dead_bookings__respects_batch_size(db_session, faker):
+    # Given
+    for _ in range(3):
+        await _old_booking(db_session, faker, status=BookingStatus.EXPIRED, hours_ago=24 * 100, created_days_ago=100)
+    await db_session.commit()
+    repo = ArchiveRepository(db_session)
+    older_than = datetime.now(timezone.utc) - timedelta(days=90)
+
+    # When
+    first = await repo.archive_dead_bookings(older_than, batch_size=2)
+    second = await repo.archive_dead_bookings(older_than, batch_size=2)
+    await db_session.commit()
+
+    # Then
+    assert first["bookings"] == 2
+    assert second["bookings"] == 1
+    assert await _count(db_session, bookings_archive) == 3
+
+
+@pytest.mark.asyncio
+async def test__archive_past_timeslots__skips_slots_still_referenced(db_session, faker):
+    # Given
+    _, referenced_slot, _ = await _old_booking(
+        db_session, faker, status=BookingStatus.PAID, hours_ago=24 * 100, created_days_ago=100
+    )
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) - timedelta(days=100)
+    free_slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    future_slot = await create_timeslot(
+        db_session,
+        room=room,
+        start_datetime=datetime.now(timezone.utc) + timedelta(days=1),
+        end_datetime=datetime.now(timezone.utc) + timedelta(days=1, hours=1),
+    )
+    await db_session.commit()
+    repo = ArchiveRepository(db_session)
+
+    # When
+    moved, room_days = await repo.archive_past_timeslots(datetime.now(timezone.utc) - timedelta(days=90), batch_size=10)
+    await db_session.commit()
+
+    # Then
+    assert moved == 1
+    assert room_days == {(room.id, start.date())}
+    remaining = set((await db_session.execute(select(TimeSlot.id))).scalars().all())
+    assert remaining == {referenced_slot.id, future_slot.id}
+    archived_ids = (await db_session.execute(select(timeslots_archive.c.id))).scalars().all()
+    assert archived_ids == [free_slot.id]
+
+
+@pytest.mark.asyncio
+async def test__archive_old_rows_task__archives_everything_and_is_resumable(db_session, faker):
+    # Given
+    for _ in range(3):
+        await _old_booking(db_session, faker, status=BookingStatus.EXPIRED, hours_ago=24 * 100, created_days_ago=100)
+    await db_session.commit()
+
+    # When
+    first = await tasks._archive_old_rows(horizon_days=90, batch_size=2, max_batches=1, pause_seconds=0)
+    second = await tasks._archive_old_rows(horizon_days=90, batch_size=2, pause_seconds=0)
+
+    # Then
+    assert first["status"] == "partial"
+    assert first["pending"] == ["bookings", "timeslots"]
+    assert first["archived"]["bookings"] == 2
+    # the timeslots step has its own budget: it still archives the slots the first bookings released
+    assert first["archived"]["timeslots"] == 2
+    assert second["status"] == "ok"
+    assert second["archived"]["bookings"] == 1
+    assert second["archived"]["timeslots"] == 1
+    assert await _count(db_session, bookings_archive) == 3
+    assert await _count(db_session, Booking.__table__) == 0
+
+
+@pytest.mark.asyncio
+async def test__archive_old_rows_task__is_ok_when_a_step_drains_on_its_last_batch(db_session, faker):
+    # Given
+    for _ in range(2):
+        await _old_booking(db_session, faker, status=BookingStatus.EXPIRED, hours_ago=24 * 100, created_days_ago=100)
+    await db_session.commit()
+
+    # When
+    result = await tasks._archive_old_rows(horizon_days=90, batch_size=3, max_batches=1, pause_seconds=0)
+
+    # Then
+    assert result["status"] == "ok"
+    assert result["pending"] == []
+    assert result["archived"]["bookings"] == 2
+    assert result["archived"]["timeslots"] == 2
+
+
+@pytest.mark.asyncio
+async def test__archive_old_rows_task__drops_summary_rows_of_archived_days(db_session, faker):
+    # Given
+    _, slot, _ = await _old_booking(
+        db_session, faker, status=BookingStatus.EXPIRED, hours_ago=24 * 100, created_days_ago=100
+    )
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([slot.id])
+    await db_session.commit()
+    assert await _count(db_session, RoomDayAvailability.__table__) == 1
+
+    # When
+    result = await tasks._archive_old_rows(horizon_days=90, batch_size=10, pause_seconds=0)
+
+    # Then
+    assert result["archived"]["timeslots"] == 1
+    assert await _count(db_session, RoomDayAvailability.__table__) == 0
+
+
+@pytest.mark.asyncio
+async def test__archive_old_rows_task__purges_published_and_dead_outbox_events(db_session, faker, monkeypatch):
+    # Given
+    monkeypatch.setattr(tasks.settings, "OUTBOX_RETENTION_DAYS", 7)
+    monkeypatch.setattr(tasks.settings, "OUTBOX_MAX_ATTEMPTS", 3)
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=8)
+    events = {
+        "published": OutboxEvent(topic="t", payload={}, published_at=old, updated_at=old),
+        "dead": OutboxEvent(topic="t", payload={}, attempts=3, updated_at=old),
+        "pending": OutboxEvent(topic="t", payload={}, attempts=2, updated_at=old),
+        "recent": OutboxEvent(topic="t", payload={}, published_at=now, updated_at=now),
+    }
+    db_session.add_all(events.values())
+    await db_session.commit()
+
+    # When
+    result = await tasks._archive_old_rows(horizon_days=90, batch_size=10, pause_seconds=0)
+
+    # Then
+    assert result["purged"]["outbox_events"] == 2
+    remaining = (await db_session.execute(select(OutboxEvent.id).order_by(OutboxEvent.id))).scalars().all()
+    assert remaining == [events["pending"].id, events["recent"].id]
+
+
+@pytest.mark.asyncio
+async def test__archive_old_rows_task__purges_processed_payment_webhooks_after_retention(db_session, monkeypatch):
+    # Given
+    monkeypatch.setattr(tasks.settings, "PAYMENT_WEBHOOK_RETENTION_DAYS", 30)
+    now = datetime.now(timezone.utc)
+
+    def callback(event_id: str, processed_at: datetime | None) -> PaymentWebhookEvent:
+        return PaymentWebhookEvent(
+            event_id=event_id, external_id="ext-1", status=PaymentStatus.SUCCESS, payload={}, processed_at=processed_at
+        )
+
+    expired = callback("evt-old", now - timedelta(days=31))
+    kept = callback("evt-recent", now - timedelta(days=29))
+    unprocessed = callback("evt-pending", None)
+    db_session.add_all([expired, kept, unprocessed])
+    await db_session.commit()
+
+    # When
+    result = await tasks._archive_old_rows(horizon_days=90, batch_size=10, pause_seconds=0)
+
+    # Then
+    assert result["purged"]["payment_webhook_events"] == 1
+    remaining = (await db_session.execute(select(PaymentWebhookEvent.event_id))).scalars().all()
+    assert sorted(remaining) == ["evt-pending", "evt-recent"]
@@ -1,11 +1,13 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from pydantic_core import to_json
 
 from app.models.booking import BookingStatus
 from app.repositories.booking import BookingRepository
-from app.schemas.booking import SBookingFilters
-from app.schemas.timeslot import STimeSlotFilters
+from app.schemas.booking import SBookingFilters, SBookingOut, SBookingOutWithTimeslots
+from app.schemas.timeslot import STimeSlotFilters, STimeSlotOut
 from tests.fixtures.factories import (
     create_booking,
     create_location,
@@ -16,7 +18,7 @@ from tests.fixtures.factories import (
 
 
 @pytest.mark.asyncio
-async def test__get_all_bookings_with_timeslots__returns_joined_rows_sorted_by_created_at(db_session, faker):
+async def test__list_bookings_with_timeslots__returns_joined_rows_sorted_by_created_at(db_session, faker):
     # Given
     user = await create_user(db_session, faker)
     other_user = await create_user(db_session, faker)
@@ -66,15 +68,15 @@ async def test__get_all_bookings_with_timeslots__returns_joined_rows_sorted_by_c
     repo = BookingRepository(db_session)
 
     # When
-    rows = await repo.get_all_bookings_with_timeslots(user.id)
+    rows = await repo.list_bookings_with_timeslots(user.id)
 
     # Then
-    assert [booking.id for booking, _ in rows] == [older_booking.id, newer_booking.id]
-    assert [slot.id for _, slot in rows] == [slot_old.id, slot_new.id]
+    assert [row.booking.id for row in rows] == [older_booking.id, newer_booking.id]
+    assert [row.timeslot.id for row in rows] == [slot_old.id, slot_new.id]
 
 
 @pytest.mark.asyncio
-async def test__get_all_bookings_with_timeslots__applies_room_status_and_timeslot_filters(db_session, faker):
+async def test__list_bookings_with_timeslots__applies_room_status_and_timeslot_filters(db_session, faker):
     # Given
     user = await create_user(db_session, faker)
     location = await create_location(db_session, faker)
@@ -118,7 +120,7 @@ async def test__get_all_bookings_with_timeslots__applies_room_status_and_timeslo
     )
 
     # When
-    rows = await repo.get_all_bookings_with_timeslots(
+    rows = await repo.list_bookings_with_timeslots(
         user.id,
         booking_filters=booking_filters,
         timeslot_filters=timeslot_filters,
@@ -126,6 +128,77 @@ async def test__get_all_bookings_with_timeslots__applies_room_status_and_timeslo
 
     # Then
     assert len(rows) == 1
-    booking, timeslot = rows[0]
-    assert booking.id == target_booking.id
-    assert timeslot.id == slot_b.id
+    assert rows[0].booking.id == target_booking.id
+    assert rows[0].timeslot.id == slot_b.id
+
+
+@pytest.mark.asyncio
+async def test__list_bookings_with_timeslots__maps_rows_into_nested_dtos(db_session, faker):
+    # Given
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room_a = await create_room(db_session, faker, location=location)
+    room_b = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    slot_a = await create_timeslot(
+        db_session, room=room_a, start_datetime=start, end_datetime=start + timedelta(hours=1)
+    )
+    slot_b = await create_timeslot(
+        db_session,
+        room=room_b,
+        start_datetime=start + timedelta(days=1),
+        end_datetime=start + timedelta(days=1, hours=1),
+    )
+    canceled = await create_booking(
+        db_session, user=user, room=room_a, timeslot=slot_a, status=BookingStatus.CANCELED
+    )
+    paid = await create_booking(db_session, user=user, room=room_b, timeslot=slot_b, status=BookingStatus.PAID)
+    await db_session.commit()
+    repo = BookingRepository(db_session)
+    expected = [
+        SBookingOutWithTimeslots(booking=SBookingOut.from_model(booking), timeslot=STimeSlotOut.from_model(timeslot))
+        for booking, timeslot in ((canceled, slot_a), (paid, slot_b))
+    ]
+    user_id, room_b_id = user.id, room_b.id
+    db_session.expunge_all()
+
+    # When
+    all_rows = await repo.list_bookings_with_timeslots(user_id)
+    filtered = await repo.list_bookings_with_timeslots(
+        user_id, booking_filters=SBookingFilters(room_id=room_b_id, status=BookingStatus.PAID)
+    )
+
+    # Then
+    assert all_rows == expected
+    assert filtered == expected[1:]
+    assert len(db_session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test__get_json_bookings_with_timeslots__renders_same_json_as_dtos(db_session, faker):
+    # Given
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    for hours in (1, 3):
+        slot = await create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=hours),
+            end_datetime=start + timedelta(hours=hours + 1),
+        )
+        await create_booking(db_session, user=user, room=room, timeslot=slot, status=BookingStatus.PAID)
+    await db_session.commit()
+    repo = BookingRepository(db_session)
+
+    # When
+    raw = await repo.get_json_bookings_with_timeslots(user.id)
+    filtered = await repo.get_json_bookings_with_timeslots(
+        user.id, booking_filters=SBookingFilters(status=BookingStatus.CANCELED)
+    )
+
+    # Then
+    dtos = await repo.list_bookings_with_timeslots(user.id)
+    assert json.loads(raw) == json.loads(to_json(dtos))
+    assert json.loads(filtered) == []
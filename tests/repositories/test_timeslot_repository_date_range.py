@@ -1,9 +1,13 @@
+import json
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 
 import pytest
+from pydantic_core import to_json
 
 from app.models.booking import BookingStatus
 from app.repositories.timeslot import TimeSlotRepository
+from app.schemas.timeslot import STimeSlotOut, STimeSlotOutWithBookingStatus
 from tests.fixtures.factories import (
     create_booking,
     create_location,
@@ -14,7 +18,7 @@ from tests.fixtures.factories import (
 
 
 @pytest.mark.asyncio
-async def test__get_all_by_room_id_and_date_range__returns_only_matching_sorted_slots(db_session, faker):
+async def test__list_by_room_id_and_date_range__returns_only_matching_sorted_slots(db_session, faker):
     # Given
     location = await create_location(db_session, faker)
     room = await create_room(db_session, faker, location=location)
@@ -55,21 +59,21 @@ async def test__get_all_by_room_id_and_date_range__returns_only_matching_sorted_
     date_to = slot_b.end_datetime
 
     # When
-    rows = await repo.get_all_by_room_id_and_date_range(
+    rows = await repo.list_by_room_id_and_date_range(
         room_id=room.id,
         date_from=date_from,
         date_to=date_to,
     )
 
     # Then
-    returned_ids = [slot.id for slot, _ in rows]
+    returned_ids = [slot.id for slot in rows]
     assert returned_ids == [slot_a.id, slot_b.id]
     excluded_ids = {slot_before.id, slot_after.id}
     assert not excluded_ids.intersection(returned_ids)
 
 
 @pytest.mark.asyncio
-async def test__get_all_by_room_id_and_date_range__sets_booking_flags_by_status(db_session, faker):
+async def test__list_by_room_id_and_date_range__sets_booking_flags_by_status(db_session, faker):
     # Given
     user = await create_user(db_session, faker)
     location = await create_location(db_session, faker)
@@ -110,14 +114,130 @@ async def test__get_all_by_room_id_and_date_range__sets_booking_flags_by_status(
     repo = TimeSlotRepository(db_session)
 
     # When
-    rows = await repo.get_all_by_room_id_and_date_range(
+    rows = await repo.list_by_room_id_and_date_range(
         room_id=room.id,
         date_from=slot_taken.start_datetime,
         date_to=slot_free.end_datetime,
     )
 
     # Then
-    flags = {slot.id: flag for slot, flag in rows}
+    flags = {slot.id: slot.has_active_booking for slot in rows}
     assert flags[slot_taken.id] is True
     assert flags[slot_canceled.id] is False
     assert flags[slot_free.id] is False
+
+
+@pytest.mark.asyncio
+async def test__list_by_room_ids_and_date_range__groups_rooms_in_one_query(db_session, faker):
+    # Given
+    location = await create_location(db_session, faker)
+    room_a = await create_room(db_session, faker, location=location)
+    room_b = await create_room(db_session, faker, location=location)
+    room_c = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    slots = {}
+    for room in (room_a, room_b, room_c):
+        slots[room.id] = await create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=1),
+            end_datetime=start + timedelta(hours=2),
+        )
+    user = await create_user(db_session, faker)
+    await create_booking(db_session, user=user, room=room_b, timeslot=slots[room_b.id])
+    await db_session.commit()
+    repo = TimeSlotRepository(db_session)
+
+    # When
+    result = await repo.list_by_room_ids_and_date_range(
+        room_ids=[room_b.id, room_a.id],
+        date_from=start,
+        date_to=start + timedelta(hours=3),
+    )
+
+    # Then
+    assert [(slot.id, slot.has_active_booking) for slot in result] == [
+        (slots[room_a.id].id, False),
+        (slots[room_b.id].id, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test__list_by_room_ids_and_date_range__maps_rows_into_dtos_without_identity_map(db_session, faker):
+    # Given
+    location = await create_location(db_session, faker)
+    room_a = await create_room(db_session, faker, location=location)
+    room_b = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    created = []
+    for room in (room_a, room_b):
+        for hour in (1, 3):
+            created.append(await create_timeslot(
+                db_session,
+                room=room,
+                start_datetime=start + timedelta(hours=hour),
+                end_datetime=start + timedelta(hours=hour + 1),
+            ))
+    user = await create_user(db_session, faker)
+    taken = await create_timeslot(
+        db_session, room=room_b, start_datetime=start + timedelta(hours=5), end_datetime=start + timedelta(hours=6)
+    )
+    created.append(taken)
+    await create_booking(db_session, user=user, room=room_b, timeslot=taken)
+    await db_session.commit()
+    expected = [
+        STimeSlotOutWithBookingStatus(**STimeSlotOut.from_model(slot).model_dump(), has_active_booking=slot is taken)
+        for slot in created
+    ]
+    room_ids = [room_a.id, room_b.id]
+    repo = TimeSlotRepository(db_session)
+    db_session.expunge_all()
+
+    # When
+    batch = await repo.list_by_room_ids_and_date_range(
+        room_ids=room_ids, date_from=start, date_to=start + timedelta(hours=8)
+    )
+    single = await repo.list_by_room_id_and_date_range(
+        room_id=room_b.id, date_from=start, date_to=start + timedelta(hours=8)
+    )
+
+    # Then
+    assert batch == expected
+    assert single == [slot for slot in expected if slot.room_id == room_b.id]
+    assert single[-1].has_active_booking is True
+    assert len(db_session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test__get_json_by_room_id_and_date_range__renders_same_json_as_dtos(db_session, faker):
+    # Given
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime(2031, 5, 1, 9, 30, 15, 250000, tzinfo=timezone.utc)
+    free = await create_timeslot(
+        db_session, room=room, start_datetime=start, end_datetime=start + timedelta(minutes=50)
+    )
+    taken = await create_timeslot(
+        db_session,
+        room=room,
+        start_datetime=start + timedelta(hours=1),
+        end_datetime=start + timedelta(hours=2),
+        base_price=Decimal("1499.90"),
+    )
+    user = await create_user(db_session, faker)
+    await create_booking(db_session, user=user, room=room, timeslot=taken)
+    await db_session.commit()
+    repo = TimeSlotRepository(db_session)
+    window = dict(room_id=room.id, date_from=free.start_datetime, date_to=taken.end_datetime)
+
+    # When
+    raw = await repo.get_json_by_room_id_and_date_range(**window)
+    empty = await repo.get_json_by_room_id_and_date_range(
+        room_id=room.id, date_from=start - timedelta(days=2), date_to=start - timedelta(days=1)
+    )
+
+    # Then
+    dtos = await repo.list_by_room_id_and_date_range(**window)
+    assert json.loads(raw) == json.loads(to_json(dtos))
+    assert [item["has_active_booking"] for item in json.loads(raw)] == [False, True]
+    assert json.loads(empty) == []
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy import func, select
+
+from app.config import settings
+
+from app.celery_app import tasks
+from app.models import Booking
+from app.models.booking import BookingStatus
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingBatchCreate, SBookingCreate
+from app.services.booking import BookingService
+from app.services.business.bookings import BookingsBusinessService
+from app.services.room_availability import RoomAvailabilityService
+from app.utils.cache import keys as cache_keys
+from app.utils.err.booking import SlotAlreadyTaken, TimeSlotNotFound
+from tests.fixtures.factories import create_room_with_slots, create_user
+
+
+@pytest.fixture(autouse=True)
+def no_broker(monkeypatch):
+    monkeypatch.setattr("app.services.business.bookings.expire_booking.apply_async", lambda *a, **kw: None)
+    monkeypatch.setattr("app.services.business.bookings.expire_bookings.apply_async", lambda *a, **kw: None)
+
+
+async def _slots(session, faker, count: int):
+    user = await create_user(session, faker)
+    room, slots = await create_room_with_slots(session, faker, count)
+    await session.commit()
+    return user.id, room.id, [slot.id for slot in slots]
+
+
+@pytest.mark.asyncio
+async def test_create_bookings_schedules_one_expiry_and_one_invalidation(db_session, faker, monkeypatch):
+    user_id, room_id, slot_ids = await _slots(db_session, faker, 3)
+    scheduled = []
+    invalidated = []
+
+    def fake_apply_async(args=None, eta=None, **kwargs):
+        scheduled.append((args, eta))
+
+    async def fake_invalidate(room_id: int):
+        invalidated.append(room_id)
+
+    monkeypatch.setattr("app.services.business.bookings.expire_bookings.apply_async", fake_apply_async)
+    monkeypatch.setattr("app.services.business.bookings.invalidate_room_timeslots", fake_invalidate)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+
+    bookings = await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids))
+
+    assert [booking.timeslot_id for booking in bookings] == slot_ids
+    assert scheduled == [([[booking.id for booking in bookings]], bookings[0].expires_at)]
+    assert invalidated == [room_id]
+
+
+@pytest.mark.asyncio
+async def test_create_bookings_rolls_back_when_a_slot_is_missing(db_session, faker):
+    user_id, _, slot_ids = await _slots(db_session, faker, 2)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+
+    with pytest.raises(TimeSlotNotFound):
+        await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids + [987_654]))
+
+    assert (await db_session.execute(select(Booking.id))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_expire_bookings_task_expires_the_whole_batch(db_session, faker, monkeypatch):
+    monkeypatch.setattr("app.services.business.bookings.settings.BOOKING_EXPIRE_SECONDS", -1)
+    user_id, room_id, slot_ids = await _slots(db_session, faker, 2)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    bookings = await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids))
+
+    result = await tasks._expire_bookings([booking.id for booking in bookings])
+
+    assert result["expired"] == 2
+    assert result["rooms"] == [room_id]
+    db_session.expire_all()
+    statuses = (await db_session.execute(select(Booking.status))).scalars().all()
+    assert statuses == [BookingStatus.EXPIRED, BookingStatus.EXPIRED]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["pessimistic", "optimistic", "advisory"])
+async def test_batch_respects_single_bookings_under_every_lock_strategy(db_session, faker, monkeypatch, strategy):
+    monkeypatch.setattr(settings, "BOOKING_LOCK_STRATEGY", strategy)
+    user_id, _, slot_ids = await _slots(db_session, faker, 3)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    await service.create_booking(SBookingCreate(timeslot_id=slot_ids[1]))
+
+    with pytest.raises(SlotAlreadyTaken):
+        await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids))
+
+    assert (await db_session.execute(select(func.count(Booking.id)))).scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_create_many_if_timeslots_free_is_all_or_nothing(db_session, faker):
+    user_id, room_id, slot_ids = await _slots(db_session, faker, 2)
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    rows = [
+        dict(user_id=user_id, room_id=room_id, timeslot_id=slot_id, total_price=100, expires_at=expires_at)
+        for slot_id in slot_ids
+    ]
+    bookings = BookingService(db_session)
+    await bookings.create(**rows[0])
+
+    with pytest.raises(SlotAlreadyTaken):
+        await bookings.create_many_if_timeslots_free(rows)
+
+
+@pytest.mark.asyncio
+async def test_advisory_batch_fails_fast_on_a_slot_being_booked(db_session, faker, monkeypatch):
+    monkeypatch.setattr(settings, "BOOKING_LOCK_STRATEGY", "advisory")
+    user_id, _, slot_ids = await _slots(db_session, faker, 2)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    await db_session.execute(select(func.pg_advisory_xact_lock(30_002, slot_ids[0])))
+
+    try:
+        with pytest.raises(SlotAlreadyTaken):
+            await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids))
+    finally:
+        await db_session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_batch_claims_and_releases_the_booking_gate(db_session, faker, monkeypatch):
+    redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return redis
+
+    monkeypatch.setattr("app.utils.booking_gate.get_redis", _fake_get_redis)
+    monkeypatch.setattr("app.utils.cache.cache_service.get_redis", _fake_get_redis)
+    monkeypatch.setattr(settings, "BOOKING_GATE_ENABLED", True)
+    user_id, _, slot_ids = await _slots(db_session, faker, 3)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    gate_key = lambda slot_id: settings.REDIS_CACHE_PREFIX + cache_keys.booking_gate(slot_id)  # noqa: E731
+
+    with pytest.raises(TimeSlotNotFound):
+        await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids[:2] + [987_654]))
+    assert await redis.exists(*(gate_key(slot_id) for slot_id in slot_ids)) == 0
+
+    await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids[:2]))
+    assert await redis.exists(*(gate_key(slot_id) for slot_id in slot_ids[:2])) == 2
+
+    with pytest.raises(SlotAlreadyTaken):
+        await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids[1:]))
+    assert await redis.exists(gate_key(slot_ids[2])) == 0
+
+
+@pytest.mark.asyncio
+async def test_expire_bookings_task_reports_errors(db_session, faker, monkeypatch):
+    monkeypatch.setattr("app.services.business.bookings.settings.BOOKING_EXPIRE_SECONDS", -1)
+    user_id, _, slot_ids = await _slots(db_session, faker, 2)
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+    bookings = await service.create_bookings(SBookingBatchCreate(timeslot_ids=slot_ids))
+
+    async def _broken_days(self, timeslot_ids):
+        raise RuntimeError("lookup failed")
+
+    monkeypatch.setattr(RoomAvailabilityService, "get_days_for_timeslots", _broken_days)
+    result = await tasks._expire_bookings([booking.id for booking in bookings])
+
+    assert result["status"] == "error"
+    db_session.expire_all()
+    statuses = (await db_session.execute(select(Booking.status))).scalars().all()
+    assert statuses == [BookingStatus.PENDING_PAYMENTS, BookingStatus.PENDING_PAYMENTS]
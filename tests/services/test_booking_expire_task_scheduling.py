@@ -75,3 +75,31 @@ async def test_create_booking_ignores_task_errors(monkeypatch, db_session, faker
     booking_from_db = await db_session.get(Booking, result.id)
     assert booking_from_db is not None
     assert booking_from_db.status == BookingStatus.PENDING_PAYMENTS
+
+
+@pytest.mark.asyncio
+async def test_create_booking_skips_eta_task_with_sweeper_engine(monkeypatch, db_session, faker):
+    user = await create_user(db_session, faker)
+    token = SAccessToken(sub=str(user.id), admin=False)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    slot = await create_timeslot(
+        db_session,
+        room=room,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+    )
+    await db_session.commit()
+
+    called = []
+    monkeypatch.setattr(
+        "app.services.business.bookings.expire_booking.apply_async",
+        lambda *args, **kwargs: called.append(kwargs),
+    )
+    monkeypatch.setattr("app.services.business.bookings.settings.BOOKING_EXPIRY_ENGINE", "sweeper")
+
+    service = BookingsBusinessService(token_data=token)
+    await service.create_booking(SBookingCreate(timeslot_id=slot.id))
+
+    assert called == []
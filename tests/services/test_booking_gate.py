@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from app.config import settings
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingCreate
+from app.services.business.bookings import BookingsBusinessService
+from app.services.timeslot import TimeSlotService
+from app.utils.booking_gate import BookingGate
+from app.utils.cache import keys as cache_keys
+from app.utils.err.booking import SlotAlreadyTaken, TimeSlotNotFound
+from tests.fixtures.factories import create_room_with_slots, create_user
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return redis
+
+    monkeypatch.setattr("app.utils.booking_gate.get_redis", _fake_get_redis)
+    monkeypatch.setattr("app.utils.cache.cache_service.get_redis", _fake_get_redis)
+    monkeypatch.setattr(settings, "BOOKING_GATE_ENABLED", True)
+    return redis
+
+
+def _gate_key(timeslot_id: int) -> str:
+    return f"{settings.REDIS_CACHE_PREFIX}{cache_keys.booking_gate(timeslot_id)}"
+
+
+async def _slot(session, faker):
+    user = await create_user(session, faker)
+    _, (slot,) = await create_room_with_slots(session, faker)
+    await session.commit()
+    return user.id, slot.id
+
+
+def _service(user_id: int) -> BookingsBusinessService:
+    return BookingsBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False))
+
+
+@pytest.mark.asyncio
+async def test_gate_keeps_claim_until_booking_expires_and_rejects_without_db(
+        fake_redis, db_session, faker, monkeypatch
+):
+    user_id, slot_id = await _slot(db_session, faker)
+
+    booking = await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+
+    ttl_ms = await fake_redis.pttl(_gate_key(slot_id))
+    expected_ms = (booking.expires_at - datetime.now(timezone.utc)).total_seconds() * 1000
+    assert abs(ttl_ms - expected_ms) < 2_000
+
+    async def _no_db(*args, **kwargs):
+        raise AssertionError("gate should reject before the database")
+
+    monkeypatch.setattr(TimeSlotService, "acquire_time_slot_for_booking", _no_db)
+    with pytest.raises(SlotAlreadyTaken):
+        await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+
+
+@pytest.mark.asyncio
+async def test_gate_releases_claim_when_booking_fails(fake_redis):
+    with pytest.raises(TimeSlotNotFound):
+        await _service(1).create_booking(SBookingCreate(timeslot_id=987_654))
+
+    assert await fake_redis.exists(_gate_key(987_654)) == 0
+
+
+@pytest.mark.asyncio
+async def test_gate_is_cleared_on_cancel(fake_redis, db_session, faker):
+    user_id, slot_id = await _slot(db_session, faker)
+    booking = await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+
+    await _service(user_id).cancel_booking(booking.id)
+
+    assert await fake_redis.exists(_gate_key(slot_id)) == 0
+    rebooked = await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+    assert rebooked.timeslot_id == slot_id
+
+
+@pytest.mark.asyncio
+async def test_gate_falls_back_to_database_when_redis_is_down(db_session, faker, monkeypatch):
+    async def _broken_get_redis():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr("app.utils.booking_gate.get_redis", _broken_get_redis)
+    monkeypatch.setattr(settings, "BOOKING_GATE_ENABLED", True)
+    user_id, slot_id = await _slot(db_session, faker)
+
+    booking = await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+
+    assert booking.timeslot_id == slot_id
+    with pytest.raises(SlotAlreadyTaken):
+        await _service(user_id).create_booking(SBookingCreate(timeslot_id=slot_id))
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_claim_of_another_owner(fake_redis):
+    gate = BookingGate(redis_client=fake_redis, claim_ttl_ms=10_000)
+    token = await gate.claim(42)
+
+    await gate.release(42, "someone-else")
+    assert await fake_redis.get(_gate_key(42)) == token
+
+    await gate.release(42, token)
+    assert await fake_redis.get(_gate_key(42)) is None
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.celery_app import tasks
+from app.models import NotificationLog
+from app.models.booking import BookingStatus
+from app.models.notificationlog import NotificationLogStatus, NotificationLogType
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingBatchCreate, SBookingCreate
+from app.services.business.bookings import BookingsBusinessService
+from app.services.notificationlog import NotificationLogService
+from app.utils.notifications import FileTransport, NotificationTransport
+from tests.fixtures.factories import (
+    create_booking,
+    create_room_with_slots,
+    create_user,
+)
+
+
+async def _slots(session, faker, count: int = 1):
+    user = await create_user(session, faker)
+    room, slots = await create_room_with_slots(session, faker, count)
+    return user, room, slots
+
+
+async def _notifications(session) -> list[tuple[NotificationLogType, NotificationLogStatus]]:
+    session.expire_all()
+    res = await session.execute(select(NotificationLog).order_by(NotificationLog.id))
+    return [(n.type, n.status) for n in res.scalars().all()]
+
+
+async def _queue(session, faker, count: int) -> None:
+    user, room, slots = await _slots(session, faker, count)
+    notifications = NotificationLogService(session)
+    for slot in slots:
+        booking = await create_booking(session, user=user, room=room, timeslot=slot)
+        notifications.queue(NotificationLogType.BOOKING_CREATED, user_id=user.id, booking_id=booking.id)
+    await notifications.flush()
+    await session.commit()
+
+
+class RecordingTransport(NotificationTransport):
+    def __init__(self, fail_types: set[NotificationLogType] = frozenset()) -> None:
+        self.sent: list[int] = []
+        self.fail_types = fail_types
+
+    async def send(self, notification: NotificationLog) -> None:
+        await asyncio.sleep(0)
+        if notification.type in self.fail_types:
+            raise ConnectionError("mailbox unavailable")
+        self.sent.append(notification.id)
+
+
+@pytest.mark.asyncio
+async def test_booking_flow_queues_notifications_with_the_transaction(db_session, faker):
+    user, _, slots = await _slots(db_session, faker, 3)
+    await db_session.commit()
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user.id), admin=False))
+
+    single = await service.create_booking(SBookingCreate(timeslot_id=slots[0].id))
+    await service.create_bookings(SBookingBatchCreate(timeslot_ids=[slots[1].id, slots[2].id]))
+    await service.cancel_booking(single.id)
+
+    assert await _notifications(db_session) == [
+        (NotificationLogType.BOOKING_CREATED, NotificationLogStatus.QUEUED),
+        (NotificationLogType.BOOKING_CREATED, NotificationLogStatus.QUEUED),
+        (NotificationLogType.BOOKING_CREATED, NotificationLogStatus.QUEUED),
+        (NotificationLogType.BOOKING_CANCELED, NotificationLogStatus.QUEUED),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_expire_task_queues_expired_notification(db_session, faker):
+    user, room, (slot,) = await _slots(db_session, faker)
+    booking = await create_booking(db_session, user=user, room=room, timeslot=slot, expires_delta=timedelta(minutes=-1))
+    await db_session.commit()
+
+    result = await tasks._expire_booking(booking.id)
+
+    assert result["status"] == BookingStatus.EXPIRED
+    assert await _notifications(db_session) == [(NotificationLogType.BOOKING_EXPIRED, NotificationLogStatus.QUEUED)]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sends_through_file_transport_and_marks_sent(db_session, faker, tmp_path):
+    await _queue(db_session, faker, 3)
+    mailbox = tmp_path / "mailbox.jsonl"
+
+    result = await tasks._dispatch_notifications(batch_size=2, transport=FileTransport(mailbox))
+
+    assert result == {"status": "ok", "sent": 3, "retried": 0, "failed": 0}
+    lines = [json.loads(line) for line in mailbox.read_text().splitlines()]
+    assert [line["type"] for line in lines] == ["BOOKING_CREATED"] * 3
+    assert {status for _, status in await _notifications(db_session)} == {NotificationLogStatus.SENT}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_failed_sends_then_marks_them_failed(db_session, faker, monkeypatch):
+    monkeypatch.setattr(tasks.settings, "NOTIFICATION_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(tasks.settings, "NOTIFICATION_RETRY_BACKOFF_SECONDS", 0)
+    await _queue(db_session, faker, 2)
+    transport = RecordingTransport(fail_types={NotificationLogType.BOOKING_CREATED})
+
+    first = await tasks._dispatch_notifications(transport=transport)
+    queued = await _notifications(db_session)
+    second = await tasks._dispatch_notifications(transport=transport)
+
+    assert first == {"status": "ok", "sent": 0, "retried": 2, "failed": 0}
+    assert {status for _, status in queued} == {NotificationLogStatus.QUEUED}
+    assert second == {"status": "ok", "sent": 0, "retried": 0, "failed": 2}
+    assert {status for _, status in await _notifications(db_session)} == {NotificationLogStatus.FAILED}
+    attempts = (await db_session.execute(select(NotificationLog.attempts))).scalars().all()
+    assert attempts == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_send_waits_for_its_backoff(db_session, faker, monkeypatch):
+    monkeypatch.setattr(tasks.settings, "NOTIFICATION_RETRY_BACKOFF_SECONDS", 3600)
+    await _queue(db_session, faker, 1)
+
+    failing = await tasks._dispatch_notifications(transport=RecordingTransport({NotificationLogType.BOOKING_CREATED}))
+    later = await tasks._dispatch_notifications(transport=RecordingTransport())
+
+    assert failing["retried"] == 1
+    assert later["sent"] == 0
+    db_session.expire_all()
+    notification = (await db_session.execute(select(NotificationLog))).scalar_one()
+    assert notification.next_attempt_at > datetime.now(timezone.utc) + timedelta(minutes=59)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sends_outside_the_claim_transaction(db_session, faker):
+    await _queue(db_session, faker, 2)
+    states: list[tuple[NotificationLogStatus, int]] = []
+
+    class InspectingTransport(NotificationTransport):
+        async def send(self, notification: NotificationLog) -> None:
+            # a separate connection sees the committed lease while the batch is being sent
+            async with tasks.db_base.async_session_maker() as session:
+                row = await session.get(NotificationLog, notification.id)
+                states.append((row.status, row.attempts))
+
+    result = await tasks._dispatch_notifications(transport=InspectingTransport())
+
+    assert result["sent"] == 2
+    assert states == [(NotificationLogStatus.QUEUED, 1)] * 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatchers_send_each_notification_once(db_session, faker):
+    await _queue(db_session, faker, 12)
+    transport = RecordingTransport()
+
+    await asyncio.gather(*(tasks._dispatch_notifications(batch_size=3, transport=transport) for _ in range(3)))
+
+    assert len(transport.sent) == len(set(transport.sent)) == 12
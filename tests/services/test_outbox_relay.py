@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.celery_app import tasks
+from app.models import OutboxEvent
+from app.models.outbox import OutboxTopic
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingCreate
+from app.services.business.bookings import BookingsBusinessService
+from app.services.outbox import OutboxService
+from tests.fixtures.factories import create_location, create_room, create_timeslot, create_user
+
+
+async def _events(session) -> list[OutboxEvent]:
+    session.expire_all()
+    res = await session.execute(select(OutboxEvent).order_by(OutboxEvent.id))
+    return list(res.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_create_booking_writes_expiry_to_outbox_instead_of_publishing(db_session, faker, monkeypatch):
+    published = []
+    monkeypatch.setattr(
+        "app.services.business.bookings.expire_booking.apply_async",
+        lambda *args, **kwargs: published.append(kwargs),
+    )
+    monkeypatch.setattr("app.services.business.bookings.settings.OUTBOX_ENABLED", True)
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    await db_session.commit()
+    room_id = room.id
+
+    booking = await BookingsBusinessService(
+        token_data=SAccessToken(sub=str(user.id), admin=False)
+    ).create_booking(SBookingCreate(timeslot_id=slot.id))
+
+    events = await _events(db_session)
+    assert published == []
+    assert [event.topic for event in events] == [
+        OutboxTopic.REFRESH_ROOM_DAYS.value, OutboxTopic.EXPIRE_BOOKING.value,
+    ]
+    assert events[0].payload == {"room_days": [[room_id, start.date().isoformat()]]}
+    assert events[1].payload["booking_id"] == booking.id
+    assert all(event.published_at is None for event in events)
+
+
+@pytest.mark.asyncio
+async def test_relay_outbox_publishes_and_retries_failures(db_session, monkeypatch):
+    published = []
+
+    def fake_apply_async(args=None, eta=None, **kwargs):
+        if args == [2]:
+            raise RuntimeError("broker down")
+        published.append((args, eta))
+
+    monkeypatch.setattr(tasks.expire_booking, "apply_async", fake_apply_async)
+    eta = datetime(2031, 1, 1, 12, tzinfo=timezone.utc)
+    outbox = OutboxService(db_session)
+    for booking_id in (1, 2, 3):
+        await outbox.add_event(OutboxTopic.EXPIRE_BOOKING, {"booking_id": booking_id, "eta": eta.isoformat()})
+    await outbox.create(topic="unknown.topic", payload={})
+    await db_session.commit()
+
+    result = await tasks._relay_outbox(batch_size=10)
+
+    assert result == {"status": "ok", "published": 2, "failed": 2}
+    assert published == [([1], eta), ([3], eta)]
+    events = await _events(db_session)
+    assert [(event.published_at is not None, event.attempts) for event in events] == [
+        (True, 0), (False, 1), (True, 0), (False, 1),
+    ]
+    assert events[1].last_error == "broker down"
+
+    # backing off: the failed events are not claimed again right away
+    again = await tasks._relay_outbox(batch_size=10)
+    assert again == {"status": "ok", "published": 0, "failed": 0}
+    now = datetime.now(timezone.utc)
+    assert all(now < event.next_attempt_at <= now + timedelta(seconds=6) for event in (events[1], events[3]))
+
+    await db_session.execute(update(OutboxEvent).values(next_attempt_at=now - timedelta(seconds=1)))
+    await db_session.commit()
+    due = await tasks._relay_outbox(batch_size=10)
+    assert due == {"status": "ok", "published": 0, "failed": 2}
+    events = await _events(db_session)
+    # the second failure waits twice as long as the first
+    waits = [event.next_attempt_at - now for event in (events[1], events[3])]
+    assert all(timedelta(seconds=9) < wait <= timedelta(seconds=12) for wait in waits)
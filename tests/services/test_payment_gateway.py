@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Payment
+from app.models.payment import PaymentStatus
+from app.schemas.auth import SAccessToken
+from app.services.business.payments import PaymentBusinessService
+from app.utils import payment_gateway
+from app.utils.err.payment import PaymentProviderUnavailable, PaymentRejected
+from app.utils.payment_gateway import CircuitBreaker, FakePaymentGateway, HttpPaymentGateway
+from tests.fixtures.factories import create_booking, create_location, create_room, create_timeslot, create_user
+
+
+def _gateway(handler, **kwargs) -> HttpPaymentGateway:
+    kwargs.setdefault("backoff_seconds", 0)
+    return HttpPaymentGateway("http://provider.test", transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_with_the_same_idempotency_key():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Idempotency-Key"])
+        if len(seen) == 1:
+            raise httpx.ConnectError("connection reset")
+        if len(seen) == 2:
+            return httpx.Response(503)
+        return httpx.Response(201, json={"id": "pay_1"})
+
+    gateway = _gateway(handler, max_retries=2)
+
+    assert await gateway.create_payment(7, Decimal("10.00")) == "pay_1"
+    assert seen == ["booking-7"] * 3
+    await gateway.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_rejected_without_retry():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(402)
+
+    gateway = _gateway(handler, max_retries=3)
+
+    with pytest.raises(PaymentRejected):
+        await gateway.create_payment(1, Decimal("1"))
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_whole_call():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(201, json={"id": "late"})
+
+    gateway = _gateway(handler, deadline_seconds=0.05, timeout_seconds=5)
+
+    with pytest.raises(PaymentProviderUnavailable):
+        await gateway.create_payment(1, Decimal("1"))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited_by_semaphore():
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(201, json={"id": request.headers["Idempotency-Key"]})
+
+    gateway = _gateway(handler, concurrency=3)
+
+    ids = await asyncio.gather(*(gateway.create_payment(i, Decimal("1")) for i in range(10)))
+
+    assert len(set(ids)) == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_timeout_waiting_for_a_slot_does_not_trip_the_breaker():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(201, json={"id": "ok"})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    gateway = _gateway(handler, concurrency=1, deadline_seconds=0.05, breaker=breaker)
+
+    async with gateway._semaphore:  # every slot busy
+        with pytest.raises(PaymentProviderUnavailable):
+            await gateway.create_payment(1, Decimal("1"))
+
+    assert calls == 0
+    assert not breaker.is_open
+    assert await gateway.create_payment(1, Decimal("1")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_and_recovers_after_trial_call():
+    now = 0.0
+    calls = 0
+    healthy = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(201, json={"id": "ok"}) if healthy else httpx.Response(500)
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=lambda: now)
+    gateway = _gateway(handler, max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(PaymentProviderUnavailable):
+            await gateway.create_payment(1, Decimal("1"))
+    with pytest.raises(PaymentProviderUnavailable):
+        await gateway.create_payment(1, Decimal("1"))
+    assert calls == 2
+
+    now = 11.0
+    healthy = True
+    assert await gateway.create_payment(1, Decimal("1")) == "ok"
+    assert not breaker.is_open
+
+
+def test_failed_trial_call_reopens_circuit():
+    now = 0.0
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5, clock=lambda: now)
+    breaker.record_failure()
+
+    now = 6.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+
+    assert not breaker.allow()
+    now = 12.0
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [asyncio.CancelledError(), httpx.TooManyRedirects("loop")])
+async def test_trial_call_ending_without_a_verdict_does_not_wedge_the_circuit(error):
+    now = 0.0
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise error
+        return httpx.Response(201, json={"id": "ok"})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5, clock=lambda: now)
+    breaker.record_failure()
+    gateway = _gateway(handler, max_retries=0, breaker=breaker)
+
+    now = 6.0
+    with pytest.raises(type(error)):
+        await gateway.create_payment(1, Decimal("1"))
+
+    assert await gateway.create_payment(1, Decimal("1")) == "ok"
+    assert not breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_fake_gateway_keeps_payments_only_when_asked():
+    gateway = FakePaymentGateway()
+
+    assert await gateway.create_payment(1, Decimal("1"))
+    assert gateway.payments is None
+
+
+@pytest.mark.asyncio
+async def test_create_payment_stores_provider_id(db_session, faker, monkeypatch):
+    gateway = FakePaymentGateway(record=True)
+    monkeypatch.setattr(payment_gateway, "_gateway", gateway)
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    booking = await create_booking(db_session, user=user, room=room, timeslot=slot)
+    await db_session.commit()
+
+    payment = await PaymentBusinessService(
+        token_data=SAccessToken(sub=str(user.id), admin=False)
+    ).create_payment(booking.id)
+
+    assert payment.status == PaymentStatus.CREATED
+    assert gateway.payments[payment.external_id] == (booking.id, booking.total_price)
+
+
+@pytest.mark.asyncio
+async def test_provider_outage_leaves_no_payment_row(db_session, faker, monkeypatch):
+    class DownGateway(FakePaymentGateway):
+        async def create_payment(self, booking_id, amount):
+            raise PaymentProviderUnavailable()
+
+    monkeypatch.setattr(payment_gateway, "_gateway", DownGateway())
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    booking = await create_booking(db_session, user=user, room=room, timeslot=slot)
+    await db_session.commit()
+    booking_id, user_id = booking.id, user.id
+
+    with pytest.raises(PaymentProviderUnavailable) as exc:
+        await PaymentBusinessService(token_data=SAccessToken(sub=str(user_id), admin=False)).create_payment(booking_id)
+
+    assert exc.value.status_code == 503
+    count = (await db_session.execute(
+        select(func.count()).select_from(Payment).where(Payment.booking_id == booking_id)
+    )).scalar_one()
+    assert count == 0
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.celery_app import tasks
+from app.models import Booking, NotificationLog, Payment, PaymentWebhookEvent
+from app.models.booking import BookingStatus
+from app.models.notificationlog import NotificationLogType
+from app.models.payment import PaymentStatus
+from app.schemas.payment import SPaymentWebhook
+from app.services.payment_webhook import PaymentWebhookService
+from tests.fixtures.factories import (
+    create_booking,
+    create_room_with_slots,
+    create_user,
+)
+
+
+async def _pending_payment(session, faker, external_id: str, expires_delta: timedelta = timedelta(minutes=30)):
+    user = await create_user(session, faker)
+    room, (slot,) = await create_room_with_slots(session, faker)
+    booking = await create_booking(session, user=user, room=room, timeslot=slot, expires_delta=expires_delta)
+    session.add(Payment(booking_id=booking.id, external_id=external_id))
+    await session.flush()
+    return booking.id
+
+
+async def _deliver(session, *events: tuple[str, str, PaymentStatus]) -> None:
+    service = PaymentWebhookService(session)
+    for event_id, external_id, status in events:
+        await service.enqueue(SPaymentWebhook(event_id=event_id, external_id=external_id, status=status))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_apply_webhooks_updates_payments_and_bookings_set_wise(db_session, faker):
+    paid_id = await _pending_payment(db_session, faker, "ext-paid")
+    failed_id = await _pending_payment(db_session, faker, "ext-failed")
+    expired_id = await _pending_payment(db_session, faker, "ext-late", expires_delta=timedelta(minutes=-1))
+    await _deliver(
+        db_session,
+        ("evt-1", "ext-paid", PaymentStatus.SUCCESS),
+        ("evt-2", "ext-failed", PaymentStatus.FAILED),
+        ("evt-3", "ext-late", PaymentStatus.SUCCESS),
+        ("evt-4", "ext-unknown", PaymentStatus.SUCCESS),
+    )
+
+    result = await tasks._apply_payment_webhooks(batch_size=10)
+
+    assert result == {"status": "ok", "processed": 3, "deferred": 1, "payments": 3, "paid": 1, "late": 1}
+    db_session.expire_all()
+    bookings = dict((await db_session.execute(select(Booking.id, Booking.status))).all())
+    assert bookings == {
+        paid_id: BookingStatus.PAID,
+        failed_id: BookingStatus.PENDING_PAYMENTS,
+        expired_id: BookingStatus.PENDING_PAYMENTS,
+    }
+    payments = dict((await db_session.execute(select(Payment.external_id, Payment.status))).all())
+    assert payments == {
+        "ext-paid": PaymentStatus.SUCCESS,
+        "ext-failed": PaymentStatus.FAILED,
+        "ext-late": PaymentStatus.SUCCESS,
+    }
+    notifications = (await db_session.execute(select(NotificationLog.type, NotificationLog.booking_id))).all()
+    assert notifications == [(NotificationLogType.BOOKING_PAID, paid_id)]
+    unprocessed = (await db_session.execute(
+        select(PaymentWebhookEvent.event_id).where(PaymentWebhookEvent.processed_at.is_(None))
+    )).scalars().all()
+    assert unprocessed == ["evt-4"]
+
+
+@pytest.mark.asyncio
+async def test_apply_webhooks_dedupes_by_external_id_and_ignores_replays(db_session, faker):
+    booking_id = await _pending_payment(db_session, faker, "ext-1")
+    await _deliver(
+        db_session,
+        ("evt-a", "ext-1", PaymentStatus.FAILED),
+        ("evt-b", "ext-1", PaymentStatus.SUCCESS),
+    )
+
+    first = await tasks._apply_payment_webhooks(batch_size=10)
+    await _deliver(db_session, ("evt-c", "ext-1", PaymentStatus.FAILED))
+    replay = await tasks._apply_payment_webhooks(batch_size=10)
+
+    assert first["payments"] == 1 and first["paid"] == 1
+    assert replay == {"status": "ok", "processed": 1, "deferred": 0, "payments": 0, "paid": 0, "late": 0}
+    db_session.expire_all()
+    assert (await db_session.get(Booking, booking_id)).status == BookingStatus.PAID
+    status = (await db_session.execute(select(Payment.status).where(Payment.external_id == "ext-1"))).scalar_one()
+    assert status == PaymentStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_apply_webhooks_keeps_callbacks_that_overtake_their_payment(db_session, faker):
+    await _deliver(db_session, ("evt-early", "ext-early", PaymentStatus.SUCCESS))
+
+    early = await tasks._apply_payment_webhooks(batch_size=10)
+    booking_id = await _pending_payment(db_session, faker, "ext-early")
+    await db_session.commit()
+    later = await tasks._apply_payment_webhooks(batch_size=10)
+
+    assert (early["processed"], early["deferred"]) == (0, 1)
+    assert (later["processed"], later["deferred"], later["paid"]) == (1, 0, 1)
+    db_session.expire_all()
+    assert (await db_session.get(Booking, booking_id)).status == BookingStatus.PAID
+
+
+@pytest.mark.asyncio
+async def test_apply_webhooks_drops_unmatched_callbacks_past_the_age_cutoff(db_session, monkeypatch):
+    await _deliver(
+        db_session,
+        ("evt-x", "ext-missing", PaymentStatus.SUCCESS),
+        ("evt-y", "ext-new", PaymentStatus.FAILED),
+    )
+    await db_session.execute(
+        update(PaymentWebhookEvent)
+        .where(PaymentWebhookEvent.event_id == "evt-x")
+        .values(created_at=datetime.now(timezone.utc) - timedelta(hours=2))
+    )
+    await db_session.commit()
+    monkeypatch.setattr(tasks.settings, "PAYMENT_WEBHOOK_UNMATCHED_MAX_AGE_SECONDS", 3600)
+
+    result = await tasks._apply_payment_webhooks(batch_size=1)
+
+    assert (result["status"], result["processed"], result["deferred"]) == ("ok", 1, 1)
+    unprocessed = (await db_session.execute(
+        select(PaymentWebhookEvent.event_id).where(PaymentWebhookEvent.processed_at.is_(None))
+    )).scalars().all()
+    assert unprocessed == ["evt-y"]
@@ -0,0 +1,152 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.celery_app import tasks
+from app.models import RoomDayAvailability
+from app.models.booking import BookingStatus
+from app.models.timeslot import TimeSlotStatus
+from app.schemas.auth import SAccessToken
+from app.schemas.booking import SBookingCreate
+from app.schemas.timeslot import STimeSlotUpdate
+from app.services.business.bookings import BookingsBusinessService
+from app.services.business.timeslots import TimeSlotBusinessService
+from app.services.room_availability import RoomAvailabilityService
+from tests.fixtures.factories import (
+    create_booking,
+    create_location,
+    create_room,
+    create_room_with_slots,
+    create_timeslot,
+    create_user,
+)
+
+DAY = datetime(2031, 3, 10, 9, tzinfo=timezone.utc)
+
+
+async def _summary(session, room_id: int) -> dict[date, tuple[int, int, Decimal | None]]:
+    session.expire_all()
+    res = await session.execute(
+        select(RoomDayAvailability).where(RoomDayAvailability.room_id == room_id)
+    )
+    return {row.day: (row.total_slots, row.free_slots, row.min_price) for row in res.scalars().all()}
+
+
+async def _room_with_slots(session, faker, *prices: str):
+    return await create_room_with_slots(
+        session, faker, len(prices), start=DAY, base_prices=[Decimal(price) for price in prices]
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_days_counts_free_slots_and_min_price(db_session, faker):
+    user = await create_user(db_session, faker)
+    room, (cheap, mid, blocked) = await _room_with_slots(db_session, faker, "50", "80", "10")
+    blocked.status = TimeSlotStatus.BLOCKED
+    await create_booking(db_session, user=user, room=room, timeslot=cheap, status=BookingStatus.PAID)
+    await db_session.flush()
+
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([cheap.id])
+    await db_session.commit()
+
+    assert await _summary(db_session, room.id) == {DAY.date(): (3, 1, Decimal("80"))}
+
+
+@pytest.mark.asyncio
+async def test_booking_create_and_cancel_update_summary(db_session, faker):
+    user = await create_user(db_session, faker)
+    room, (first, second) = await _room_with_slots(db_session, faker, "100", "120")
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([first.id])
+    await db_session.commit()
+    service = BookingsBusinessService(token_data=SAccessToken(sub=str(user.id), admin=False))
+
+    room_id = room.id
+
+    booking = await service.create_booking(SBookingCreate(timeslot_id=first.id))
+    assert await _summary(db_session, room_id) == {DAY.date(): (2, 1, Decimal("120"))}
+
+    await service.cancel_booking(booking.id)
+    assert await _summary(db_session, room_id) == {DAY.date(): (2, 2, Decimal("100"))}
+
+
+@pytest.mark.asyncio
+async def test_expire_task_frees_slot_in_summary(db_session, faker):
+    user = await create_user(db_session, faker)
+    room, (slot,) = await _room_with_slots(db_session, faker, "100")
+    booking = await create_booking(
+        db_session, user=user, room=room, timeslot=slot, expires_delta=timedelta(minutes=-1)
+    )
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([slot.id])
+    await db_session.commit()
+    room_id, booking_id = room.id, booking.id
+    assert await _summary(db_session, room_id) == {DAY.date(): (1, 0, None)}
+
+    result = await tasks._expire_booking(booking_id)
+
+    assert result["status"] == BookingStatus.EXPIRED
+    assert await _summary(db_session, room_id) == {DAY.date(): (1, 1, Decimal("100"))}
+
+
+@pytest.mark.asyncio
+async def test_timeslot_move_and_delete_update_both_days(db_session, faker):
+    room, (slot,) = await _room_with_slots(db_session, faker, "100")
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([slot.id])
+    await db_session.commit()
+    room_id, slot_id = room.id, slot.id
+    service = TimeSlotBusinessService()
+    next_day = DAY + timedelta(days=1)
+
+    await service.update_timeslot_by_id(
+        slot_id,
+        STimeSlotUpdate(start_datetime=next_day, end_datetime=next_day + timedelta(minutes=50)),
+    )
+    assert await _summary(db_session, room_id) == {next_day.date(): (1, 1, Decimal("100"))}
+
+    await service.delete_timeslot_by_id(slot_id)
+    assert await _summary(db_session, room_id) == {}
+
+
+@pytest.mark.asyncio
+async def test_with_outbox_the_refresh_is_an_event_relayed_after_commit(db_session, faker, monkeypatch):
+    monkeypatch.setattr("app.services.room_availability.settings.OUTBOX_ENABLED", True)
+    monkeypatch.setattr("app.services.business.bookings.settings.OUTBOX_ENABLED", True)
+    monkeypatch.setattr(tasks.expire_booking, "apply_async", lambda *args, **kwargs: None)
+    user = await create_user(db_session, faker)
+    room, (slot,) = await _room_with_slots(db_session, faker, "100")
+    await RoomAvailabilityService(db_session).refresh_for_timeslots([slot.id])
+    await db_session.commit()
+    room_id = room.id
+
+    await BookingsBusinessService(
+        token_data=SAccessToken(sub=str(user.id), admin=False)
+    ).create_booking(SBookingCreate(timeslot_id=slot.id))
+    # committed with the booking, not applied yet
+    assert await _summary(db_session, room_id) == {DAY.date(): (1, 1, Decimal("100"))}
+
+    result = await tasks._relay_outbox(batch_size=10)
+
+    assert result == {"status": "ok", "published": 2, "failed": 0}
+    assert await _summary(db_session, room_id) == {DAY.date(): (1, 0, None)}
+
+
+@pytest.mark.asyncio
+async def test_reconcile_recomputes_stale_upcoming_days(db_session, faker):
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=2)
+    await create_timeslot(
+        db_session, room=room, start_datetime=start, end_datetime=start + timedelta(minutes=50), base_price=Decimal("70")
+    )
+    # a refresh that never happened, and a summary row whose timeslots are gone
+    db_session.add(RoomDayAvailability(room_id=room.id, day=start.date(), total_slots=3, free_slots=0))
+    gone = start.date() + timedelta(days=1)
+    db_session.add(RoomDayAvailability(room_id=room.id, day=gone, total_slots=1, free_slots=1))
+    await db_session.commit()
+    room_id = room.id
+
+    result = await tasks._reconcile_room_availability(days_ahead=7, batch_size=1)
+
+    assert result == {"status": "ok", "days": 2}
+    assert await _summary(db_session, room_id) == {start.date(): (1, 1, Decimal("70"))}
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from app.models.booking import BookingStatus
+from app.services.booking import BookingService
 from app.services.timeslot import TimeSlotService
 from app.utils.err.booking import SlotAlreadyTaken, TimeSlotNotFound
 from tests.fixtures.factories import (
@@ -104,3 +105,58 @@ async def test__lock_time_slot_for_booking__ignores_canceled_booking(db_session,
 
     # Then
     assert locked_slot.id == slot.id
+
+
+@pytest.mark.asyncio
+async def test__acquire_time_slot_for_booking__advisory_fails_fast_while_slot_is_held(session_maker, faker):
+    # Given
+    async with session_maker() as setup:
+        location = await create_location(setup, faker)
+        room = await create_room(setup, faker, location=location)
+        start = datetime.now(timezone.utc)
+        slot = await create_timeslot(setup, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+        await setup.commit()
+        slot_id = slot.id
+
+    async with session_maker() as holder, session_maker() as contender:
+        # When
+        held = await TimeSlotService(holder).acquire_time_slot_for_booking(slot_id, "advisory")
+
+        # Then
+        assert held.id == slot_id
+        with pytest.raises(SlotAlreadyTaken):
+            await TimeSlotService(contender).acquire_time_slot_for_booking(slot_id, "advisory")
+
+        await holder.rollback()
+        await contender.rollback()
+        freed = await TimeSlotService(contender).acquire_time_slot_for_booking(slot_id, "advisory")
+        assert freed.id == slot_id
+        await contender.rollback()
+
+
+@pytest.mark.asyncio
+async def test__create_if_timeslot_free__raises_conflict_on_active_booking(db_session, faker):
+    # Given
+    user = await create_user(db_session, faker)
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    slot = await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    await create_booking(db_session, user=user, room=room, timeslot=slot, status=BookingStatus.CANCELED)
+    await db_session.commit()
+    service = BookingService(db_session)
+    values = dict(
+        user_id=user.id,
+        room_id=room.id,
+        timeslot_id=slot.id,
+        total_price=slot.base_price,
+        expires_at=start + timedelta(minutes=5),
+    )
+
+    # When
+    booking = await service.create_if_timeslot_free(**values)
+
+    # Then
+    assert booking.status == BookingStatus.PENDING_PAYMENTS
+    with pytest.raises(SlotAlreadyTaken):
+        await service.create_if_timeslot_free(**values)
@@ -228,3 +228,6 @@ def test_cache_keys_formats():
     assert keys.locations_all() == "locations:all"
     assert "2020-01-01T12:00:00" in keys.timeslots_by_room_and_range(1, dt_from, dt_to)
     assert keys.timeslots_room_prefix(5) == "timeslots:5:*"
+    assert keys.timeslots_search(None, dt_from, dt_to, None, None, None).startswith("timeslots:search:all:")
+    assert keys.timeslots_search(None, dt_from, dt_to, None, None, None, generation=3).endswith(":g3")
+    assert keys.timeslots_search_generation() == "generation:timeslots:search"
@@ -22,6 +22,42 @@ async def test_base_repository_get_all_supports_limit_offset_and_order(db_sessio
     assert [loc.id for loc in results] == [created[1].id, created[2].id]
 
 
+@pytest.mark.asyncio
+async def test_base_repository_create_many_returns_rows_in_input_order(db_session, faker):
+    repo = LocationRepository(db_session)
+    names = [f"loc-{i:02d}" for i in reversed(range(25))]
+
+    created = await repo.create_many([
+        {"name": name, "address": faker.address(), "description": "desc"} for name in names
+    ])
+
+    assert [loc.name for loc in created] == names
+    assert all(loc.id is not None and loc.created_at is not None for loc in created)
+
+
+@pytest.mark.asyncio
+async def test_base_repository_get_version_moves_on_update_and_delete(db_session, faker):
+    repo = LocationRepository(db_session)
+    first = await repo.create(name="loc-a", address=faker.address(), description="desc")
+    second = await repo.create(name="loc-b", address=faker.address(), description="desc")
+    await db_session.commit()
+    created = await repo.get_version()
+
+    updated = await repo.update_by_id(first.id, name="loc-a2")
+    await db_session.commit()
+    after_update = await repo.get_version()
+    await repo.delete(id=second.id)
+    await db_session.commit()
+    after_delete = await repo.get_version()
+
+    assert created.count == after_update.count == 2
+    assert updated.updated_at > first.created_at  # maintained by the updated_at trigger
+    assert after_update.last_modified == updated.updated_at
+    assert after_update.checksum != created.checksum
+    assert after_delete.count == 1
+    assert (await repo.get_version(id=second.id)).count == 0
+
+
 def test_notificationlog_repository_module_imports():
     from app.repositories.notificationlog import NotificationLogRepository
 
@@ -7,7 +7,10 @@ from fakeredis.aioredis import FakeRedis
 from httpx import ASGITransport, AsyncClient
 
 from app.api import routers
-from app.utils.cache import cache_service as cache_module
+from app.utils.cache import cache_service as cache_module, invalidate_room_timeslots
+from app.schemas.room import SRoomUpdate
+from app.services.business.rooms import RoomBusinessService
+from app.services.room import RoomService
 from app.services.timeslot import TimeSlotService
 from tests.fixtures.factories import create_location, create_room, create_timeslot
 
@@ -38,13 +41,13 @@ async def test_timeslot_list_is_cached(async_client, db_session, faker, monkeypa
     monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
 
     call_counter = {"count": 0}
-    original_get_all = TimeSlotService.get_all_by_room_id_and_date_range
+    original_get_all = TimeSlotService.list_by_room_id_and_date_range
 
     async def _wrapped(self, room_id, date_from, date_to):
         call_counter["count"] += 1
         return await original_get_all(self, room_id=room_id, date_from=date_from, date_to=date_to)
 
-    monkeypatch.setattr(TimeSlotService, "get_all_by_room_id_and_date_range", _wrapped)
+    monkeypatch.setattr(TimeSlotService, "list_by_room_id_and_date_range", _wrapped)
 
     location = await create_location(db_session, faker)
     room = await create_room(db_session, faker, location=location)
@@ -67,3 +70,142 @@ async def test_timeslot_list_is_cached(async_client, db_session, faker, monkeypa
     assert response_second.status_code == 200
     assert call_counter["count"] == 1
     assert response_second.json() == response_first.json()
+
+
+@pytest.mark.asyncio
+async def test_timeslot_search_shares_canonical_window_cache(async_client, db_session, faker, monkeypatch):
+    fake_redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+
+    call_counter = {"count": 0}
+    original_search = TimeSlotService.search_free
+
+    async def _wrapped(self, **kwargs):
+        call_counter["count"] += 1
+        return await original_search(self, **kwargs)
+
+    monkeypatch.setattr(TimeSlotService, "search_free", _wrapped)
+
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    hour = datetime(2031, 4, 2, 10, tzinfo=timezone.utc)
+    early = await create_timeslot(
+        db_session, room=room, start_datetime=hour, end_datetime=hour + timedelta(minutes=20)
+    )
+    late = await create_timeslot(
+        db_session,
+        room=room,
+        start_datetime=hour + timedelta(minutes=30),
+        end_datetime=hour + timedelta(minutes=50),
+    )
+    await db_session.commit()
+
+    wide = await async_client.get(
+        "/timeslots/search",
+        params={"date_from": hour.isoformat(), "date_to": (hour + timedelta(hours=1)).isoformat()},
+    )
+    narrow = await async_client.get(
+        "/timeslots/search",
+        params={
+            "date_from": (hour + timedelta(minutes=25)).isoformat(),
+            "date_to": (hour + timedelta(minutes=55)).isoformat(),
+        },
+    )
+
+    assert [item["id"] for item in wide.json()] == [early.id, late.id]
+    assert [item["id"] for item in narrow.json()] == [late.id]
+    assert call_counter["count"] == 1
+
+    # a mutation in any room retires cached search results (a generation bump, no SCAN/DEL)
+    cached = await fake_redis.keys("*timeslots:search:*")
+    await invalidate_room_timeslots(room.id)
+    await async_client.get(
+        "/timeslots/search",
+        params={"date_from": hour.isoformat(), "date_to": (hour + timedelta(hours=1)).isoformat()},
+    )
+    assert call_counter["count"] == 2
+    assert len(await fake_redis.keys("*timeslots:search:*")) == len(cached) + 1
+
+
+@pytest.mark.asyncio
+async def test_batch_room_timeslots_reuse_per_room_cache(async_client, db_session, faker, monkeypatch):
+    fake_redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+
+    queried: list[list[int]] = []
+    original_batch = TimeSlotService.list_by_room_ids_and_date_range
+
+    async def _wrapped(self, room_ids, date_from, date_to):
+        queried.append(list(room_ids))
+        return await original_batch(self, room_ids=room_ids, date_from=date_from, date_to=date_to)
+
+    monkeypatch.setattr(TimeSlotService, "list_by_room_ids_and_date_range", _wrapped)
+
+    location = await create_location(db_session, faker)
+    warm_room = await create_room(db_session, faker, location=location)
+    cold_room = await create_room(db_session, faker, location=location)
+    empty_room = await create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc)
+    end = start + timedelta(hours=1)
+    for room in (warm_room, cold_room):
+        await create_timeslot(db_session, room=room, start_datetime=start, end_datetime=end)
+    await db_session.commit()
+
+    params = {"date_from": start.isoformat(), "date_to": end.isoformat()}
+    single = await async_client.get(f"/rooms/{warm_room.id}/timeslots", params=params)
+
+    room_ids = [cold_room.id, warm_room.id, empty_room.id]
+    first = await async_client.get("/rooms/timeslots", params={**params, "room_ids": room_ids})
+    second = await async_client.get("/rooms/timeslots", params={**params, "room_ids": room_ids})
+
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert [item["room_id"] for item in body] == room_ids
+    assert body[1]["timeslots"] == single.json()
+    assert len(body[0]["timeslots"]) == 1
+    assert body[2]["timeslots"] == []
+    assert second.json() == body
+    assert queried == [[cold_room.id, empty_room.id]]
+
+
+@pytest.mark.asyncio
+async def test_room_search_is_cached_until_room_changes(async_client, db_session, faker, monkeypatch):
+    fake_redis = FakeRedis(decode_responses=True)
+
+    async def _fake_get_redis():
+        return fake_redis
+
+    monkeypatch.setattr(cache_module, "get_redis", _fake_get_redis)
+
+    call_counter = {"count": 0}
+    original_search = RoomService.search
+
+    async def _wrapped(self, query, offset, limit):
+        call_counter["count"] += 1
+        return await original_search(self, query=query, offset=offset, limit=limit)
+
+    monkeypatch.setattr(RoomService, "search", _wrapped)
+
+    location = await create_location(db_session, faker)
+    room = await create_room(db_session, faker, location=location)
+    room.name = "Rooftop terrace"
+    await db_session.commit()
+
+    first = await async_client.get("/rooms/search", params={"q": "rooftop"})
+    second = await async_client.get("/rooms/search", params={"q": "  ROOFTOP "})
+    assert second.json() == first.json()
+    assert call_counter["count"] == 1
+
+    await RoomBusinessService().update_by_id(room.id, SRoomUpdate(name="Basement"))
+    third = await async_client.get("/rooms/search", params={"q": "rooftop"})
+
+    assert call_counter["count"] == 2
+    assert third.json()["items"] == []
@@ -30,3 +30,15 @@ async def test_cache_service_ttl_expires():
     await asyncio.sleep(1.1)
 
     assert await cache.get("ttl-key") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_service_set_many_get_many():
+    redis = FakeRedis(decode_responses=True)
+    cache = CacheService(redis_client=redis, prefix="test:cache:")
+
+    await cache.set_many({"a": [1], "b": {"x": 2}}, ttl=30)
+
+    assert await cache.get_many(["a", "missing", "b"]) == [[1], None, {"x": 2}]
+    assert 0 < await redis.ttl("test:cache:a") <= 30
+    assert await cache.get_many([]) == []
@@ -104,3 +104,23 @@ async def test_cache_service_delete_pattern_handles_exceptions(monkeypatch):
 
     cache = CacheService(redis_client=ScanErrorClient(), prefix="scan:")
     assert await cache.delete_pattern("anything:*") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_service_set_raw_many_writes_in_one_transaction(monkeypatch):
+    redis = FakeRedis(decode_responses=True)
+    pipelines = []
+    make_pipeline = redis.pipeline
+
+    def _pipeline(transaction=True, **kwargs):
+        pipelines.append(transaction)
+        return make_pipeline(transaction=transaction, **kwargs)
+
+    monkeypatch.setattr(redis, "pipeline", _pipeline)
+    cache = CacheService(redis_client=redis, prefix="cache:")
+
+    await cache.set_raw_many({"body": "[1]", "body:gzip": "H4sI"}, ttl=30)
+
+    assert pipelines == [True]
+    assert await redis.mget("cache:body", "cache:body:gzip") == ["[1]", "H4sI"]
+    assert 0 < await redis.ttl("cache:body:gzip") <= 30
@@ -58,4 +58,62 @@ def test_ping_task_executes_in_eager(monkeypatch, eager):
 
     task = celery.tasks["app.celery_app.tasks.ping"]
     result = task.apply_async()
-    assert result.get(timeout=3) == "pong"
\ No newline at end of file
+    assert result.get(timeout=3) == "pong"
+
+def test_beat_schedule_registers_maintenance_tasks():
+    from app.celery_app.app import create_celery_app
+
+    celery = create_celery_app()
+
+    assert "summarize-brin-indexes" not in celery.conf.beat_schedule
+    for name, task in [
+        ("archive-old-rows", "app.maintenance.archive_old_rows"),
+        ("reconcile-room-availability", "app.maintenance.reconcile_room_availability"),
+    ]:
+        assert celery.conf.beat_schedule[name]["task"] == task
+        assert task in celery.tasks
+
+
+def test_beat_schedule_registers_expiry_sweeper_only_for_sweeper_engine(monkeypatch):
+    from app.celery_app import app as celery_app_module
+
+    monkeypatch.setattr(celery_app_module.settings, "BOOKING_EXPIRY_ENGINE", "eta")
+    assert "sweep-expired-bookings" not in celery_app_module.create_celery_app().conf.beat_schedule
+
+    monkeypatch.setattr(celery_app_module.settings, "BOOKING_EXPIRY_ENGINE", "sweeper")
+    celery = celery_app_module.create_celery_app()
+    entry = celery.conf.beat_schedule["sweep-expired-bookings"]
+    assert entry["task"] == "app.bookings.sweep_expired_bookings"
+    assert entry["task"] in celery.tasks
+
+
+def test_beat_schedule_registers_outbox_relay_only_when_enabled(monkeypatch):
+    from app.celery_app import app as celery_app_module
+
+    monkeypatch.setattr(celery_app_module.settings, "OUTBOX_ENABLED", False)
+    assert "relay-outbox" not in celery_app_module.create_celery_app().conf.beat_schedule
+
+    monkeypatch.setattr(celery_app_module.settings, "OUTBOX_ENABLED", True)
+    celery = celery_app_module.create_celery_app()
+    assert celery.conf.beat_schedule["relay-outbox"]["task"] == "app.outbox.relay"
+    assert "app.outbox.relay" in celery.tasks
+
+
+def test_beat_schedule_registers_notification_dispatcher_only_when_enabled(monkeypatch):
+    from app.celery_app import app as celery_app_module
+
+    monkeypatch.setattr(celery_app_module.settings, "NOTIFICATIONS_ENABLED", False)
+    assert "dispatch-notifications" not in celery_app_module.create_celery_app().conf.beat_schedule
+
+    monkeypatch.setattr(celery_app_module.settings, "NOTIFICATIONS_ENABLED", True)
+    celery = celery_app_module.create_celery_app()
+    assert celery.conf.beat_schedule["dispatch-notifications"]["task"] == "app.notifications.dispatch"
+    assert "app.notifications.dispatch" in celery.tasks
+
+
+def test_beat_schedule_registers_payment_webhook_applier():
+    from app.celery_app import app as celery_app_module
+
+    celery = celery_app_module.create_celery_app()
+    assert celery.conf.beat_schedule["apply-payment-webhooks"]["task"] == "app.payments.apply_webhooks"
+    assert "app.payments.apply_webhooks" in celery.tasks
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from app.celery_app import publisher as publisher_module
+from app.celery_app.publisher import PublishQueueFull, TaskPublisher
+
+
+class _FakeTask:
+    name = "fake.task"
+
+    def __init__(self):
+        self.calls: list[dict] = []
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        self.calls.append({"args": args, "thread": threading.get_ident(), **options})
+
+
+@pytest.fixture
+def producer(monkeypatch):
+    acquired: list[object] = []
+
+    @contextmanager
+    def _producer_or_acquire():
+        token = object()
+        acquired.append(token)
+        yield token
+
+    monkeypatch.setattr(publisher_module.celery_app, "producer_or_acquire", _producer_or_acquire)
+    return acquired
+
+
+@pytest.mark.asyncio
+async def test_publish_without_thread_applies_inline():
+    task = _FakeTask()
+    publisher = TaskPublisher()
+
+    await publisher.publish(task, args=[1], eta="soon")
+
+    assert task.calls == [{"args": [1], "thread": threading.get_ident(), "eta": "soon"}]
+
+
+@pytest.mark.asyncio
+async def test_publish_hands_messages_to_publisher_thread(producer):
+    task = _FakeTask()
+    publisher = TaskPublisher()
+    publisher.start()
+
+    for booking_id in range(3):
+        await publisher.publish(task, args=[booking_id], countdown=5)
+    publisher.stop()
+
+    assert [call["args"] for call in task.calls] == [[0], [1], [2]]
+    assert {call["thread"] for call in task.calls} != {threading.get_ident()}
+    assert all(call["producer"] in producer and call["countdown"] == 5 for call in task.calls)
+    stats = publisher.stats()
+    assert (stats["enqueued"], stats["published"], stats["failed"], stats["depth"]) == (3, 3, 0, 0)
+    assert stats["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_publish_applies_backpressure_when_queue_is_full(producer, monkeypatch):
+    task = _FakeTask()
+    release = threading.Event()
+    publisher = TaskPublisher(maxsize=1, enqueue_timeout=0.05)
+    original_publish_batch = publisher._publish_batch
+
+    def _slow_publish_batch(batch):
+        release.wait(5)
+        original_publish_batch(batch)
+
+    monkeypatch.setattr(publisher, "_publish_batch", _slow_publish_batch)
+    publisher.start()
+
+    await publisher.publish(task, args=[1])
+    while publisher.stats()["depth"]:  # wait until the thread holds the first message
+        await asyncio.sleep(0.01)
+    await publisher.publish(task, args=[2])
+    with pytest.raises(PublishQueueFull):
+        await publisher.publish(task, args=[3])
+
+    release.set()
+    publisher.stop()
+
+    assert [call["args"] for call in task.calls] == [[1], [2]]
+    assert publisher.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_publisher_thread_counts_failures_and_keeps_going(producer, monkeypatch):
+    dropped: list[str] = []
+    monkeypatch.setattr(publisher_module.logger, "error", lambda msg, *args, **kw: dropped.append(msg % args))
+
+    class _FlakyTask(_FakeTask):
+        def apply_async(self, args=None, kwargs=None, **options):
+            if args == ["boom"]:
+                raise RuntimeError("broker down")
+            super().apply_async(args=args, kwargs=kwargs, **options)
+
+    task = _FlakyTask()
+    publisher = TaskPublisher(publish_retries=2, retry_backoff=0)
+    publisher.start()
+
+    await publisher.publish(task, args=["boom"])
+    await publisher.publish(task, args=["ok"])
+    publisher.stop()
+
+    assert [call["args"] for call in task.calls] == [["ok"]]
+    stats = publisher.stats()
+    assert (stats["published"], stats["retried"], stats["failed"]) == (1, 2, 1)
+    assert dropped[-1:] == ["dropped fake.task after 3 attempts: args=['boom'] kwargs=None options={}"]
+
+
+@pytest.mark.asyncio
+async def test_publisher_retries_a_failed_message_on_a_fresh_connection(producer):
+    class _TransientTask(_FakeTask):
+        failures = 2
+
+        def apply_async(self, args=None, kwargs=None, **options):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection reset")
+            super().apply_async(args=args, kwargs=kwargs, **options)
+
+    task = _TransientTask()
+    publisher = TaskPublisher(publish_retries=3, retry_backoff=0)
+    publisher.start()
+
+    await publisher.publish(task, args=[1])
+    await publisher.publish(task, args=[2])
+    publisher.stop()
+
+    assert [call["args"] for call in task.calls] == [[1], [2]]
+    assert [call["producer"] for call in task.calls] == [None, None]
+    stats = publisher.stats()
+    assert (stats["published"], stats["retried"], stats["failed"]) == (2, 1, 0)
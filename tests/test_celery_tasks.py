@@ -3,6 +3,9 @@ from datetime import datetime, timedelta, timezone
 import pytest
 
 from app.celery_app import tasks
+from app.models import Booking
+from app.models.booking import BookingStatus
+from app.utils.cache.cache_service import CacheService
 from tests.fixtures import factories
 
 
@@ -38,7 +41,7 @@ async def test_expire_booking_expires_and_invalidates_cache(db_session, session_
     async def fake_delete_pattern(self, pattern: str):
         deleted_patterns.append(pattern)
 
-    monkeypatch.setattr(tasks.CacheService, "delete_pattern", fake_delete_pattern, raising=False)
+    monkeypatch.setattr(CacheService, "delete_pattern", fake_delete_pattern)
     monkeypatch.setattr(tasks, "async_session_maker", session_maker, raising=False)
 
     user = await factories.create_user(db_session, faker)
@@ -64,3 +67,57 @@ async def test_expire_booking_expires_and_invalidates_cache(db_session, session_
     status_value = result["status"]
     assert str(status_value).endswith("EXPIRED")
     assert any("timeslots" in pattern for pattern in deleted_patterns)
+
+
+@pytest.mark.asyncio
+async def test_sweep_expired_bookings_batches_and_invalidates_each_room_once(db_session, faker, monkeypatch):
+    deleted_patterns: list[str] = []
+
+    async def fake_delete_pattern(self, pattern: str):
+        deleted_patterns.append(pattern)
+
+    monkeypatch.setattr(CacheService, "delete_pattern", fake_delete_pattern)
+
+    user = await factories.create_user(db_session, faker)
+    location = await factories.create_location(db_session, faker)
+    room = await factories.create_room(db_session, faker, location=location)
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    overdue_ids = []
+    for i in range(3):
+        slot = await factories.create_timeslot(
+            db_session,
+            room=room,
+            start_datetime=start + timedelta(hours=i),
+            end_datetime=start + timedelta(hours=i, minutes=50),
+        )
+        booking = await factories.create_booking(
+            db_session, user=user, room=room, timeslot=slot, expires_delta=timedelta(minutes=-1)
+        )
+        overdue_ids.append(booking.id)
+    pending_slot = await factories.create_timeslot(
+        db_session,
+        room=room,
+        start_datetime=start + timedelta(hours=5),
+        end_datetime=start + timedelta(hours=5, minutes=50),
+    )
+    pending = await factories.create_booking(
+        db_session, user=user, room=room, timeslot=pending_slot, expires_delta=timedelta(minutes=30)
+    )
+    await db_session.commit()
+    room_id, pending_id = room.id, pending.id
+
+    partial = await tasks._sweep_expired_bookings(batch_size=2, max_batches=1)
+    rest = await tasks._sweep_expired_bookings(batch_size=2)
+
+    assert partial == {"status": "partial", "expired": 2, "rooms": [room_id]}
+    assert rest == {"status": "ok", "expired": 1, "rooms": [room_id]}
+    db_session.expire_all()
+    statuses = {
+        booking_id: (await db_session.get(Booking, booking_id)).status
+        for booking_id in overdue_ids + [pending_id]
+    }
+    assert statuses == {
+        **{booking_id: BookingStatus.EXPIRED for booking_id in overdue_ids},
+        pending_id: BookingStatus.PENDING_PAYMENTS,
+    }
+    assert deleted_patterns.count(f"timeslots:{room_id}:*") == 2
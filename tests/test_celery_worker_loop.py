@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.celery_app import worker_loop as worker_loop_module
+from app.celery_app.worker_loop import WorkerLoop
+
+
+@pytest.fixture
+def resources(monkeypatch):
+    events: list[tuple[str, int]] = []
+
+    async def _open():
+        events.append(("open", threading.get_ident()))
+
+    async def _close():
+        events.append(("close", threading.get_ident()))
+
+    monkeypatch.setattr(WorkerLoop, "_open_resources", staticmethod(_open))
+    monkeypatch.setattr(WorkerLoop, "_close_resources", staticmethod(_close))
+    return events
+
+
+async def _current_loop():
+    return asyncio.get_running_loop(), threading.get_ident()
+
+
+def test_worker_loop_reuses_one_loop_across_runs(resources):
+    loop = WorkerLoop()
+    loop.start()
+    try:
+        first_loop, first_thread = loop.run(_current_loop())
+        second_loop, second_thread = loop.run(_current_loop())
+    finally:
+        loop.stop()
+
+    assert first_loop is second_loop
+    assert first_thread == second_thread != threading.get_ident()
+    assert [event for event, _ in resources] == ["open", "close"]
+    assert {thread for _, thread in resources} == {first_thread}
+    assert not loop.running
+
+
+def test_worker_loop_falls_back_to_asyncio_run_when_not_started(resources):
+    loop = WorkerLoop()
+
+    first_loop, first_thread = loop.run(_current_loop())
+    second_loop, _ = loop.run(_current_loop())
+
+    assert first_thread == threading.get_ident()
+    assert first_loop is not second_loop
+    assert resources == []
+
+
+def test_worker_loop_is_not_reused_after_fork(resources, monkeypatch):
+    real_getpid = worker_loop_module.os.getpid
+    loop = WorkerLoop()
+    loop.start()
+    try:
+        monkeypatch.setattr(worker_loop_module.os, "getpid", lambda: -1)
+        assert not loop.running
+    finally:
+        monkeypatch.setattr(worker_loop_module.os, "getpid", real_getpid)
+        loop.stop()
+
+
+def test_worker_process_signals_start_and_stop_global_loop(resources, monkeypatch):
+    monkeypatch.setattr(worker_loop_module, "worker_loop", WorkerLoop())
+
+    worker_loop_module._start_worker_loop()
+    assert worker_loop_module.worker_loop.running
+    worker_loop_module._stop_worker_loop()
+
+    assert not worker_loop_module.worker_loop.running
+    assert [event for event, _ in resources] == ["open", "close"]
@@ -42,3 +42,78 @@ async def test_new_session_without_engine_raises(monkeypatch):
 
     with pytest.raises(RuntimeError):
         await service.do()
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_run_after_commit_once_per_key(db_session, faker):
+    from sqlalchemy import select
+
+    from app.models import Location
+
+    calls: list[tuple[str, bool]] = []
+
+    async def visible_outside(name: str) -> None:
+        res = await db_session.execute(select(Location.id).where(Location.name == name))
+        calls.append((name, res.first() is not None))
+
+    async with db_base.get_session() as session:
+        session.add(Location(name="after-commit", address="a", description="d"))
+        await session.flush()
+        db_base.run_after_commit(session, visible_outside, "after-commit")
+        db_base.run_after_commit(session, visible_outside, "after-commit")
+        assert calls == []
+
+    assert calls == [("after-commit", True)]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_dropped_on_rollback():
+    calls: list[str] = []
+
+    async def record() -> None:
+        calls.append("called")
+
+    with pytest.raises(ValueError):
+        async with db_base.get_session() as session:
+            db_base.run_after_commit(session, record)
+            raise ValueError("boom")
+
+    async with db_base.get_session():
+        pass
+
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callback_errors_do_not_propagate():
+    calls: list[str] = []
+
+    async def failing() -> None:
+        raise RuntimeError("redis down")
+
+    async def record() -> None:
+        calls.append("called")
+
+    async with db_base.get_session() as session:
+        db_base.run_after_commit(session, failing)
+        db_base.run_after_commit(session, record)
+
+    assert calls == ["called"]
+
+
+@pytest.mark.asyncio
+async def test_before_commit_callback_failure_rolls_back():
+    from sqlalchemy import text
+
+    async def failing(session) -> None:
+        raise RuntimeError("flush failed")
+
+    with pytest.raises(RuntimeError):
+        async with db_base.get_session() as session:
+            await session.execute(text("CREATE TEMP TABLE before_commit_probe (id int)"))
+            db_base.run_before_commit(session, failing, session)
+            db_base.run_before_commit(session, failing, session)
+
+    async with db_base.get_session() as session:
+        exists = await session.execute(text("SELECT to_regclass('pg_temp.before_commit_probe') IS NOT NULL"))
+        assert exists.scalar_one() is False
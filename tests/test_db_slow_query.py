@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.slow_query import SlowQueryLogger
+from app.models import Booking, Location
+from app.models.booking import BookingStatus
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logger_captures_plan_for_select(async_engine):
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(async_engine, threshold_ms=0, sink=records.append)
+    slow_log.install()
+    try:
+        maker = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+        async with maker() as session:
+            await session.execute(select(Location).where(Location.id == 1))
+        await slow_log.drain()
+    finally:
+        slow_log.uninstall()
+
+    select_records = [r for r in records if "FROM locations" in r["statement"]]
+    assert len(select_records) == 1
+    record = select_records[0]
+    assert record["duration_ms"] >= 0
+    assert "1" in record["parameters"]
+    assert record["plan"][0]["Plan"]["Relation Name"] == "locations"
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logger_explains_update_without_running_it(async_engine):
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(async_engine, threshold_ms=0, sink=records.append)
+    slow_log.install()
+    try:
+        maker = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+        async with maker() as session:
+            stmt = (
+                update(Booking)
+                .where(Booking.id == 1)
+                .where(Booking.status == BookingStatus.PENDING_PAYMENTS)
+                .where(Booking.expires_at <= datetime.now(timezone.utc))
+                .values(status=BookingStatus.EXPIRED)
+                .returning(Booking.id)
+            )
+            await session.execute(stmt)
+            await session.rollback()
+        await slow_log.drain()
+    finally:
+        slow_log.uninstall()
+
+    update_records = [r for r in records if r["statement"].startswith("UPDATE bookings")]
+    assert len(update_records) == 1
+    assert update_records[0]["plan"][0]["Plan"]["Node Type"] == "ModifyTable"
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logger_rate_limits_explain(async_engine):
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(
+        async_engine,
+        threshold_ms=0,
+        max_explains_per_minute=1,
+        sink=records.append,
+    )
+    slow_log.install()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+            await conn.execute(text("SELECT 1"))
+        await slow_log.drain()
+    finally:
+        slow_log.uninstall()
+
+    selects = [r for r in records if r["statement"] in ("SELECT 1", "SELECT 2")]
+    assert len(selects) == 3
+    assert sum(1 for r in selects if r["plan"] is not None) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logger_ignores_fast_queries(async_engine):
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(async_engine, threshold_ms=60_000, sink=records.append)
+    slow_log.install()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await slow_log.drain()
+    finally:
+        slow_log.uninstall()
+
+    assert records == []
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logger_drops_start_time_of_failed_statement(async_engine):
+    records: list[dict] = []
+    slow_log = SlowQueryLogger(async_engine, threshold_ms=60_000, sink=records.append)
+    slow_log.install()
+    try:
+        async with async_engine.connect() as conn:
+            with pytest.raises(Exception):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.rollback()
+            raw = await conn.get_raw_connection()
+            assert raw.info.get("slow_query_started_at") == []
+    finally:
+        slow_log.uninstall()
+
+    assert records == []
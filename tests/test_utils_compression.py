@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+
+from app.utils.compression import ENCODINGS, compress, negotiate_encoding, precompress, stream_compressor
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate, gzip;q=0.1", "gzip"),
+        ("*", ENCODINGS[0]),
+        ("*, gzip;q=0", ENCODINGS[0] if ENCODINGS[0] != "gzip" else None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_prefers_higher_q_then_server_order():
+    encodings = ("br", "zstd", "gzip")
+
+    assert negotiate_encoding("gzip, zstd, br", encodings) == "br"
+    assert negotiate_encoding("gzip, br;q=0.5", encodings) == "gzip"
+    assert negotiate_encoding("gzip;q=0.8, zstd;q=0.8", encodings) == "zstd"
+
+
+def test_compress_and_precompress_gzip_round_trip():
+    body = b'{"id": 1, "is_available": true}' * 200
+
+    assert gzip.decompress(compress(body, "gzip")) == body
+    variants = precompress(body)
+    assert set(variants) == set(ENCODINGS)
+    assert gzip.decompress(variants["gzip"]) == body
+    assert len(variants["gzip"]) < len(body) // 10
+    with pytest.raises(ValueError):
+        compress(body, "deflate")
+
+
+def test_stream_compressor_chunks_decode_as_one_body():
+    chunks = [b"id,status\n", b"1,PAID\n" * 50, b"2,CANCELED\n" * 50]
+    compressor = stream_compressor("gzip")
+
+    encoded = b"".join(compressor.compress(chunk) for chunk in chunks) + compressor.finish()
+
+    assert gzip.decompress(encoded) == b"".join(chunks)